@@ -8,6 +8,8 @@ from setuptools import setup, Extension
 if platform.python_implementation() == "CPython":
     if platform.system() != 'Windows':
         ext_modules = [Extension('sevent.cbuffer', sources=['sevent/cbuffer.c'])]
+        if platform.system() == 'Linux' and os.path.exists("/usr/include/linux/io_uring.h"):
+            ext_modules.append(Extension('sevent.curing', sources=['sevent/curing.c']))
     else:
         if sys.version_info[0] >= 3:
             ext_modules = [Extension('sevent.cbuffer', sources=['sevent/cbuffer.c'], libraries=["ws2_32"])]
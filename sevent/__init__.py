@@ -9,6 +9,7 @@ from .event import EventEmitter
 from . import tcp
 from . import udp
 from . import pipe
+from . import cluster
 from .buffer import Buffer
 from .dns import DNSResolver
 from . import sslsocket as ssl
@@ -17,6 +18,8 @@ from . import errors
 if is_py3:
     from .coroutines.future import Future
     from .coroutines.chain import Chain
+    from .coroutines.tasks import Task, CancelScope, ensure_future, create_task, gather, wait_for, wait_any
+    from . import pool
     from . import loop
 
 
@@ -34,3 +37,9 @@ if is_py3:
         if not loop._mul_ioloop:
             return loop._ioloop.sleep(seconds)
         return loop._thread_local._sevent_ioloop.sleep(seconds)
+
+
+    def run_in_executor(executor, callback, *args, **kwargs):
+        if not loop._mul_ioloop:
+            return loop._ioloop.run_in_executor(executor, callback, *args, **kwargs)
+        return loop._thread_local._sevent_ioloop.run_in_executor(executor, callback, *args, **kwargs)
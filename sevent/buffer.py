@@ -3,11 +3,13 @@
 # create by: snower
 
 import os
-import time
+import struct
+import threading
+import weakref
 from collections import deque
-from .event import EventEmitter
+from .event import SlotsEventEmitter
 from .loop import current
-from .utils import get_logger
+from .utils import get_logger, monotonic
 
 try:
     RECV_BUFFER_SIZE = int(os.environ.get("SEVENT_RECV_BUFFER_SIZE", 0))
@@ -33,7 +35,27 @@ try:
     SEND_COUNT = int(os.environ.get("SEVENT_SEND_COUNT", 0))
 except:
     SEND_COUNT = 0
+
+try:
+    RECV_MAX_CHUNKS = min(max(int(os.environ.get("SEVENT_RECV_MAX_CHUNKS", 16)), 1), 32)
+except:
+    RECV_MAX_CHUNKS = 16
+
+try:
+    RECV_POOL_SIZE = int(os.environ.get("SEVENT_RECV_POOL_SIZE", -1))
+except:
+    RECV_POOL_SIZE = -1
     
+try:
+    BUFFER_MEMORY_LIMIT = int(os.environ.get("SEVENT_BUFFER_MEMORY_LIMIT", 0))
+except:
+    BUFFER_MEMORY_LIMIT = 0
+
+try:
+    BUFFER_MEMORY_CHECK_INTERVAL = max(float(os.environ.get("SEVENT_BUFFER_MEMORY_CHECK_INTERVAL", 0.5)), 0.01)
+except:
+    BUFFER_MEMORY_CHECK_INTERVAL = 0.5
+
 try:
     if not os.environ.get("SEVENT_NOUSE_CBUFFER", False):
         from . import cbuffer
@@ -50,6 +72,10 @@ try:
             try:
                 cbuffer.socket_set_send_count(SEND_COUNT)
             except: pass
+        if RECV_POOL_SIZE >= 0:
+            try:
+                cbuffer.socket_set_recv_pool_size(RECV_POOL_SIZE)
+            except: pass
     else:
         cbuffer = None
 except ImportError:
@@ -58,14 +84,183 @@ except ImportError:
 
 RECV_BUFFER_SIZE = RECV_BUFFER_SIZE or 8 * 1024 - 64
 
+
+class BufferMemory(object):
+    ''' process wide Buffer bytes limit, the largest buffers are drained while over the limit '''
+
+    def __init__(self, limit=0, check_interval=0.5):
+        self._lock = threading.Lock()
+        self._buffers = {}
+        self._prune_size = 1024
+        self._throttled_buffers = {}
+        self._check_loop = None
+        self._check_handler = None
+        self.limit = limit
+        self.check_interval = check_interval
+        self.usage = 0
+        self.peak = 0
+
+    def add(self, buffer):
+        # every Buffer registers, so plain refs without callbacks, dead ones are pruned by collect
+        with self._lock:
+            self._buffers[id(buffer)] = weakref.ref(buffer)
+            prune = len(self._buffers) >= self._prune_size
+        if prune:
+            self.collect()
+        if self.limit > 0 and self._check_loop is None and buffer._loop is not None:
+            self.start(buffer._loop)
+
+    def collect(self):
+        buffers = []
+        with self._lock:
+            for key, buffer_ref in list(self._buffers.items()):
+                buffer = buffer_ref()
+                if buffer is None:
+                    del self._buffers[key]
+                else:
+                    buffers.append(buffer)
+            self._prune_size = max(len(buffers) * 2, 1024)
+        self.usage = sum([len(buffer) for buffer in buffers])
+        if self.usage > self.peak:
+            self.peak = self.usage
+        return buffers
+
+    def get_usage(self):
+        self.collect()
+        return self.usage
+
+    def set_limit(self, limit, check_interval=None):
+        self.limit = max(int(limit), 0)
+        if check_interval is not None:
+            self.check_interval = max(float(check_interval), 0.01)
+        if self.limit <= 0:
+            self.stop()
+            self.release()
+        elif self._check_loop is None:
+            loop = current()
+            if loop is None:
+                # set outside of any loop, check in the loop of the buffers already alive
+                for buffer in self.collect():
+                    if buffer._loop is not None:
+                        loop = buffer._loop
+                        break
+            if loop is not None:
+                self.start(loop)
+
+    def start(self, loop):
+        with self._lock:
+            if self._check_loop is not None:
+                return
+            self._check_loop = loop
+
+        def on_check():
+            if self._check_loop is not loop:
+                return
+            self._check_handler = loop.add_timeout(self.check_interval, on_check)
+            try:
+                self.check()
+            except Exception as e:
+                get_logger().exception("buffer memory check error:%s", e)
+
+        if loop is current():
+            self._check_handler = loop.add_timeout(self.check_interval, on_check)
+        else:
+            loop.add_async_safe(on_check)
+
+    def stop(self):
+        loop, handler = self._check_loop, self._check_handler
+        self._check_loop, self._check_handler = None, None
+        if handler is not None:
+            if loop is current():
+                loop.cancel_timeout(handler)
+            else:
+                loop.add_async_safe(loop.cancel_timeout, handler)
+
+    def check(self):
+        buffers = self.collect()
+        if self.limit <= 0:
+            return self.release()
+        if self.usage <= self.limit:
+            if self._throttled_buffers and self.usage < self.limit * BUFFER_DRAIN_RATE:
+                self.release()
+            return
+
+        over_size = self.usage - int(self.limit * BUFFER_DRAIN_RATE)
+        drain_size = max(self.limit // max(len(buffers), 1), RECV_BUFFER_SIZE)
+        buffers.sort(key=len, reverse=True)
+        for buffer in buffers:
+            buffer_len = len(buffer)
+            if over_size <= 0 or buffer_len <= 0:
+                break
+            over_size -= buffer_len
+            throttled = self._throttled_buffers.get(id(buffer))
+            if throttled is None or throttled[0]() is not buffer:
+                self._throttled_buffers[id(buffer)] = (weakref.ref(buffer), buffer._drain_size, buffer._regain_size)
+            elif buffer._full:
+                continue
+            self.run_in_loop(buffer, self.drain_buffer, buffer, drain_size)
+        if over_size > 0:
+            get_logger().warning("buffer memory usage %d over limit %d", self.usage, self.limit)
+
+    def release(self):
+        throttled_buffers, self._throttled_buffers = self._throttled_buffers, {}
+        for buffer_ref, drain_size, regain_size in throttled_buffers.values():
+            buffer = buffer_ref()
+            if buffer is not None:
+                self.run_in_loop(buffer, self.regain_buffer, buffer, drain_size, regain_size)
+
+    def run_in_loop(self, buffer, callback, *args):
+        if buffer._loop is None or buffer._loop is current():
+            return callback(*args)
+        buffer._loop.add_async_safe(callback, *args)
+
+    def drain_buffer(self, buffer, drain_size):
+        buffer._drain_size = min(buffer._drain_size, drain_size)
+        buffer._regain_size = 1
+        if not buffer._full and buffer._len > 0:
+            buffer.do_drain()
+
+    def regain_buffer(self, buffer, drain_size, regain_size):
+        buffer._drain_size = drain_size
+        buffer._regain_size = regain_size
+        if buffer._full and buffer._len < buffer._regain_size:
+            buffer.do_regain()
+
+    def snapshot(self):
+        self.collect()
+        return {
+            "usage": self.usage,
+            "peak": self.peak,
+            "limit": self.limit,
+            "buffers": len(self._buffers),
+            "throttled": len(self._throttled_buffers),
+        }
+
+
+buffer_memory = BufferMemory(BUFFER_MEMORY_LIMIT, BUFFER_MEMORY_CHECK_INTERVAL)
+
+FRAME_FORMATS = {}
+
+
+def frame_format(fmt):
+    ''' one integer code with an optional byte order, standard sizes like the cbuffer read_frame '''
+    byte_order = fmt[:1] if fmt[:1] in ("<", ">", "!", "=", "@") else ""
+    code = fmt[len(byte_order):]
+    if len(code) != 1 or code not in "bBhHiIlLqQ":
+        raise ValueError("frame format must be one integer code")
+    return (byte_order if byte_order not in ("", "@") else "=") + code
+
+
 if cbuffer is None:
     class BaseBuffer(object):
+        __slots__ = ("_buffer", "_buffer_odata", "_buffer_len", "_buffers", "_buffers_odata", "_len", "_buffer_index")
+
         def __init__(self):
             self._buffer = b''
             self._buffer_odata = None
             self._buffer_len = 0
             self._buffers = deque()
-            self._buffers_odata = deque()
+            self._buffers_odata = None
             self._len = 0
             self._buffer_index = 0
 
@@ -89,7 +284,11 @@ if cbuffer is None:
         def write(self, data, odata = None):
             if self._buffer_len > 0:
                 self._buffers.append(data)
-                self._buffers_odata.append(odata)
+                if self._buffers_odata is not None:
+                    self._buffers_odata.append(odata)
+                elif odata is not None:
+                    self._buffers_odata = deque([None] * (len(self._buffers) - 1))
+                    self._buffers_odata.append(odata)
                 self._len += len(data)
             else:
                 self._buffer = data
@@ -127,7 +326,7 @@ if cbuffer is None:
             if self._buffer_index >= self._buffer_len:
                 if self._len > 0:
                     self._buffer = self._buffers.popleft()
-                    self._buffer_odata = self._buffers_odata.popleft()
+                    self._buffer_odata = self._buffers_odata.popleft() if self._buffers_odata else None
                     self._buffer_index, self._buffer_len = 0, len(self._buffer)
                 else:
                     self._buffer_index, self._buffer_len, self._buffer, self._buffer_odata = 0, 0, b'', None
@@ -144,12 +343,113 @@ if cbuffer is None:
 
             if self._len > 0:
                 self._buffer = self._buffers.popleft()
-                self._buffer_odata = self._buffers_odata.popleft()
+                self._buffer_odata = self._buffers_odata.popleft() if self._buffers_odata else None
                 self._buffer_index, self._buffer_len = 0, len(self._buffer)
             else:
                 self._buffer_index, self._buffer_len, self._buffer, self._buffer_odata = 0, 0, b'', None
             return (data, buffer_odata) if buffer_odata else data
 
+        def peek(self, size=-1):
+            if size < 0:
+                size = self._len
+            if size == 0 or self._len < size:
+                return memoryview(b"")
+
+            if self._buffer_len - self._buffer_index >= size:
+                return memoryview(self._buffer)[self._buffer_index: self._buffer_index + size]
+
+            # copy only the peeked range across chunks, the queued chunks stay as they are
+            datas = [memoryview(self._buffer)[self._buffer_index:]]
+            size -= self._buffer_len - self._buffer_index
+            for buffer in self._buffers:
+                if len(buffer) >= size:
+                    datas.append(memoryview(buffer)[:size])
+                    break
+                datas.append(buffer)
+                size -= len(buffer)
+            return memoryview(b"".join(datas))
+
+        def readview(self, size=-1):
+            data = self.peek(size)
+            if data:
+                self.discard(len(data))
+            return data
+
+        def discard(self, size=-1):
+            if size < 0 or size >= self._len:
+                size = self._len
+                self._buffers.clear()
+                if self._buffers_odata:
+                    self._buffers_odata.clear()
+                self._buffer_index, self._buffer_len, self._buffer, self._buffer_odata, self._len = 0, 0, b'', None, 0
+                return size
+
+            self._len -= size
+            discard_size = size
+            while discard_size >= self._buffer_len - self._buffer_index:
+                discard_size -= self._buffer_len - self._buffer_index
+                self._buffer = self._buffers.popleft()
+                self._buffer_odata = self._buffers_odata.popleft() if self._buffers_odata else None
+                self._buffer_index, self._buffer_len = 0, len(self._buffer)
+            self._buffer_index += discard_size
+            return size
+
+        def iter_chunks(self):
+            chunks = [memoryview(self._buffer)[self._buffer_index:]] if self._buffer_len > self._buffer_index else []
+            chunks.extend(memoryview(buffer) for buffer in self._buffers if buffer)
+            return iter(chunks)
+
+        def find(self, sep, start=0):
+            start = max(start, 0)
+            if not sep:
+                return start if start <= self._len else -1
+            if self._len - start < len(sep):
+                return -1
+
+            sep_len, position, tail = len(sep), 0, b''
+            chunks = [(self._buffer, self._buffer_index)]
+            chunks.extend((buffer, 0) for buffer in self._buffers)
+            for buffer, index in chunks:
+                buffer_len = len(buffer) - index
+                if position + buffer_len > start:
+                    if tail:
+                        tail_position = position - len(tail)
+                        tail_index = (tail + buffer[index: index + sep_len - 1]).find(sep, max(start - tail_position, 0))
+                        if tail_index >= 0:
+                            return tail_position + tail_index
+                    find_index = buffer.find(sep, index + max(start - position, 0))
+                    if find_index >= 0:
+                        return position + find_index - index
+                if sep_len > 1:
+                    tail = (tail + buffer[max(index, len(buffer) - sep_len + 1):])[1 - sep_len:]
+                position += buffer_len
+            return -1
+
+        def readuntil(self, sep, start=0):
+            index = self.find(sep, start)
+            if index < 0 or index + len(sep) == 0:
+                return b''
+            return self.read(index + len(sep))
+
+        def readline(self, start=0):
+            return self.readuntil(b'\n', start)
+
+        def read_frame(self, fmt=">H"):
+            try:
+                fmt = FRAME_FORMATS[fmt]
+            except KeyError:
+                fmt = FRAME_FORMATS[fmt] = frame_format(fmt)
+            header_size = struct.calcsize(fmt)
+            if self._len < header_size:
+                return None
+            frame_size = struct.unpack(fmt, self.peek(header_size))[0]
+            if frame_size < 0:
+                raise ValueError("frame size must not be negative")
+            if self._len - header_size < frame_size:
+                return None
+            self.discard(header_size)
+            return self.read(frame_size) if frame_size else b''
+
         def extend(self, o):
             if not isinstance(o, BaseBuffer):
                 raise TypeError('not Buffer')
@@ -185,7 +485,7 @@ if cbuffer is None:
             self._buffer_odata = None
             self._buffer_len = 0
             self._buffers = deque()
-            self._buffers_odata = deque()
+            self._buffers_odata = None
             self._len = 0
             self._buffer_index = 0
 
@@ -201,14 +501,14 @@ if cbuffer is None:
             if not self._buffers:
                 return self.head()
 
-            if not self._buffers_odata[-1]:
+            if not self._buffers_odata or not self._buffers_odata[-1]:
                 return self._buffers[-1]
             return (self._buffers[-1], self._buffers_odata[-1])
 
         def last_data(self):
-            if not self._buffers_odata:
+            if not self._buffers:
                 return self.head_data()
-            return self._buffers_odata[-1]
+            return self._buffers_odata[-1] if self._buffers_odata else None
 
         def __len__(self):
             return self._len
@@ -229,17 +529,22 @@ if cbuffer is None:
             return buffer.__hash__()
 
 
-class Buffer(EventEmitter, BaseBuffer):
+class Buffer(SlotsEventEmitter, BaseBuffer):
+    __slots__ = ("_events", "_events_once", "emit_drain", "emit_regain", "_loop", "_full", "_drain_size",
+                 "_regain_size", "_drain_time", "_regain_time", "_link_do_drain", "_link_do_regain", "__weakref__")
+
     def __init__(self, max_buffer_size=None):
-        EventEmitter.__init__(self)
+        SlotsEventEmitter.__init__(self)
         BaseBuffer.__init__(self)
 
+        self._link_do_drain = None
+        self._link_do_regain = None
         self._loop = current()
         self._full = False
         self._drain_size = int(max_buffer_size or MAX_BUFFER_SIZE)
         self._regain_size = int(self._drain_size * BUFFER_DRAIN_RATE)
-        self._drain_time = time.time()
-        self._regain_time = time.time()
+        self._drain_time = self._regain_time = self._loop.time() if self._loop is not None else monotonic()
+        buffer_memory.add(self)
 
     @property
     def full(self):
@@ -259,21 +564,29 @@ class Buffer(EventEmitter, BaseBuffer):
 
     def _do_drain(self):
         self._full = True
-        self._drain_time = time.time()
+        self._drain_time = self._loop.time() if self._loop is not None else monotonic()
         try:
             self.emit_drain(self)
         except Exception as e:
             get_logger().exception("buffer emit drain error:%s", e)
-    do_drain = _do_drain
+
+    def do_drain(self):
+        if self._link_do_drain is None:
+            return self._do_drain()
+        return self._link_do_drain()
 
     def _do_regain(self):
         self._full = False
-        self._regain_time = time.time()
+        self._regain_time = self._loop.time() if self._loop is not None else monotonic()
         try:
             self.emit_regain(self)
         except Exception as e:
             get_logger().exception("buffer emit regain error:%s", e)
-    do_regain = _do_regain
+
+    def do_regain(self):
+        if self._link_do_regain is None:
+            return self._do_regain()
+        return self._link_do_regain()
 
     def write(self, data, odata=None):
         if odata is None:
@@ -326,6 +639,41 @@ class Buffer(EventEmitter, BaseBuffer):
             self.do_regain()
         return data
 
+    def readview(self, size=-1):
+        data = BaseBuffer.readview(self, size)
+
+        if self._full and self._len < self._regain_size:
+            self.do_regain()
+        return data
+
+    def readuntil(self, sep, start=0):
+        data = BaseBuffer.readuntil(self, sep, start)
+
+        if self._full and self._len < self._regain_size:
+            self.do_regain()
+        return data
+
+    def readline(self, start=0):
+        data = BaseBuffer.readline(self, start)
+
+        if self._full and self._len < self._regain_size:
+            self.do_regain()
+        return data
+
+    def read_frame(self, fmt=">H"):
+        data = BaseBuffer.read_frame(self, fmt)
+
+        if self._full and self._len < self._regain_size:
+            self.do_regain()
+        return data
+
+    def discard(self, size=-1):
+        size = BaseBuffer.discard(self, size)
+
+        if self._full and self._len < self._regain_size:
+            self.do_regain()
+        return size
+
     def clear(self):
         BaseBuffer.clear(self)
 
@@ -333,8 +681,10 @@ class Buffer(EventEmitter, BaseBuffer):
             self.do_regain()
 
     def link(self, o):
-        self_do_drain, self_do_regain = self.do_drain, self.do_regain
-        o_do_drain, o_do_regain = o.do_drain, o.do_regain
+        self_do_drain = self._link_do_drain or self._do_drain
+        self_do_regain = self._link_do_regain or self._do_regain
+        o_do_drain = o._link_do_drain or o._do_drain
+        o_do_regain = o._link_do_regain or o._do_regain
 
         def do_drain():
             self_do_drain()
@@ -346,15 +696,15 @@ class Buffer(EventEmitter, BaseBuffer):
             self_do_regain()
             o_do_regain()
 
-        self.do_drain, self.do_regain = do_drain, do_regain
-        o.do_drain, o.do_regain = do_drain, do_regain
+        self._link_do_drain, self._link_do_regain = do_drain, do_regain
+        o._link_do_drain, o._link_do_regain = do_drain, do_regain
         if (self._full and not o._full) or (not self._full and o._full):
             do_drain()
         return self
 
     def close(self):
-        self.do_drain = self._do_drain
-        self.do_regain = self._do_regain
+        self._link_do_drain = None
+        self._link_do_regain = None
         self.remove_all_listeners()
 
     def decode(self, *args, **kwargs):
@@ -10,6 +10,36 @@
 #include <netinet/in.h>
 #include <arpa/inet.h>
 #endif
+#include <limits.h>
+#include <sys/uio.h>
+#ifndef IOV_MAX
+#define IOV_MAX 1024
+#endif
+#if IOV_MAX > 1024
+#define SOCKET_SEND_IOV_MAX 1024
+#else
+#define SOCKET_SEND_IOV_MAX IOV_MAX
+#endif
+#define SOCKET_RECV_IOV_MAX 32
+#if defined(__linux__) && defined(_GNU_SOURCE)
+#define SOCKET_MMSG_SUPPORTED 1
+#define SOCKET_MMSG_COUNT 64
+#endif
+#ifdef __linux__
+#define SOCKET_UDP_OFFLOAD_SUPPORTED 1
+#ifndef SOL_UDP
+#define SOL_UDP 17
+#endif
+#ifndef UDP_SEGMENT
+#define UDP_SEGMENT 103
+#endif
+#ifndef UDP_GRO
+#define UDP_GRO 104
+#endif
+#define SOCKET_GSO_MAX_SEGMENTS 64
+#define SOCKET_GSO_MAX_SIZE 65000
+#define SOCKET_GRO_BUFFER_SIZE 65536
+#endif
 #else /* MS_WINDOWS */
 #include <winsock2.h>
 #include <ws2ipdef.h>
@@ -71,10 +101,11 @@ typedef struct BufferQueue{
 static BufferQueue* buffer_queue_fast_buffer[BUFFER_QUEUE_FAST_BUFFER_COUNT];
 static short buffer_queue_fast_buffer_index = 0;
 
-#define BYTES_FAST_BUFFER_COUNT 128
+#define BYTES_FAST_BUFFER_MAX_COUNT 8192
 
-static PyBytesObject* bytes_fast_buffer[BYTES_FAST_BUFFER_COUNT];
+static PyBytesObject* bytes_fast_buffer[BYTES_FAST_BUFFER_MAX_COUNT];
 static short bytes_fast_buffer_index = 0;
+static short bytes_fast_buffer_count = 512;
 
 static int socket_recv_size = 8192 - sizeof(PyBytesObject);
 static int socket_recv_count = 8;
@@ -98,7 +129,7 @@ static int socket_send_count = 8;
 }
 
 #define PyBytesObject_malloc(size) (PyBytesObject*)PyBytes_FromStringAndSize(0, size)
-#define PyBytesObject_free(objbytes, buffer_queue) if(buffer_queue->flag == 0x01 && bytes_fast_buffer_index < BYTES_FAST_BUFFER_COUNT){ \
+#define PyBytesObject_free(objbytes, buffer_queue) if(buffer_queue->flag == 0x01 && bytes_fast_buffer_index < bytes_fast_buffer_count){ \
     objbytes->ob_shash = -1; \
     Py_SET_SIZE(objbytes, 0); \
     bytes_fast_buffer[bytes_fast_buffer_index++]=objbytes; \
@@ -953,21 +984,551 @@ Buffer_last_data(register BufferObject *objbuf) {
     Py_RETURN_NONE;
 }
 
+static PyObject *
+chunk_view(BufferQueue* queue, Py_ssize_t offset, Py_ssize_t size)
+{
+    PyObject* view;
+    PyObject* start;
+    PyObject* stop;
+    PyObject* slice;
+    PyObject* result;
+
+    /* the bytes escape to python now, never recycle it into the fast buffer */
+    queue->flag = 0;
+    view = PyMemoryView_FromObject((PyObject*)queue->buffer);
+    if (view == NULL || (offset == 0 && size == Py_SIZE(queue->buffer))) {
+        return view;
+    }
+
+    start = PyLong_FromSsize_t(offset);
+    stop = PyLong_FromSsize_t(offset + size);
+    slice = start != NULL && stop != NULL ? PySlice_New(start, stop, NULL) : NULL;
+    Py_XDECREF(start);
+    Py_XDECREF(stop);
+    if (slice == NULL) {
+        Py_DECREF(view);
+        return NULL;
+    }
+    result = PyObject_GetItem(view, slice);
+    Py_DECREF(slice);
+    Py_DECREF(view);
+    return result;
+}
+
+static PyObject *
+bytes_view(PyObject* buffer)
+{
+    PyObject* view;
+    if (buffer == NULL) {
+        return NULL;
+    }
+    view = PyMemoryView_FromObject(buffer);
+    Py_DECREF(buffer);
+    return view;
+}
+
+static PyObject *
+copy_range(register BufferObject *objbuf, Py_ssize_t size)
+{
+    PyBytesObject* buffer;
+    BufferQueue* queue = objbuf->buffer_head;
+    Py_ssize_t buffer_size = 0;
+    Py_ssize_t offset = objbuf->buffer_offset;
+    Py_ssize_t buf_len;
+
+    buffer = (PyBytesObject*)PyBytes_FromStringAndSize(0, size);
+    if (buffer == NULL) {
+        return PyErr_NoMemory();
+    }
+
+    while (queue != NULL && buffer_size < size) {
+        buf_len = Py_SIZE(queue->buffer) - offset;
+        buf_len = buf_len > size - buffer_size ? size - buffer_size : buf_len;
+        memcpy(buffer->ob_sval + buffer_size, queue->buffer->ob_sval + offset, buf_len);
+        buffer_size += buf_len;
+        offset = 0;
+        queue = queue->next;
+    }
+    return (PyObject*)buffer;
+}
+
+static void
+discard_impl(register BufferObject *objbuf, Py_ssize_t size)
+{
+    BufferQueue* last_queue;
+    Py_ssize_t buf_len;
+
+    while (size > 0 && objbuf->buffer_head != NULL) {
+        buf_len = Py_SIZE(objbuf->buffer_head->buffer) - objbuf->buffer_offset;
+        if (size < buf_len) {
+            objbuf->buffer_offset += size;
+            Py_SET_SIZE(objbuf, Py_SIZE(objbuf) - size);
+            return;
+        }
+
+        size -= buf_len;
+        Py_SET_SIZE(objbuf, Py_SIZE(objbuf) - buf_len);
+        objbuf->buffer_offset = 0;
+        last_queue = objbuf->buffer_head;
+        objbuf->buffer_head = objbuf->buffer_head->next;
+        PyBytesObject_free(last_queue->buffer, last_queue);
+        BufferQueue_free(last_queue);
+    }
+    if (objbuf->buffer_head == NULL) {
+        objbuf->buffer_tail = NULL;
+        objbuf->buffer_offset = 0;
+    }
+}
+
+static PyObject *
+Buffer_peek(register BufferObject *objbuf, PyObject *args)
+{
+    Py_ssize_t size = -1;
+    if (!PyArg_ParseTuple(args, "|n", &size)) {
+        return NULL;
+    }
+
+    if (size < 0) {
+        size = Py_SIZE(objbuf);
+    }
+    if (size == 0 || Py_SIZE(objbuf) < size) {
+        return bytes_view(PyBytes_FromStringAndSize(0, 0));
+    }
+
+    if (Py_SIZE(objbuf->buffer_head->buffer) - objbuf->buffer_offset >= size) {
+        return chunk_view(objbuf->buffer_head, objbuf->buffer_offset, size);
+    }
+    return bytes_view(copy_range(objbuf, size));
+}
+
+static PyObject *
+Buffer_readview(register BufferObject *objbuf, PyObject *args)
+{
+    PyObject* view;
+    Py_ssize_t size = -1;
+    if (!PyArg_ParseTuple(args, "|n", &size)) {
+        return NULL;
+    }
+
+    if (size < 0) {
+        size = Py_SIZE(objbuf);
+    }
+    if (size == 0 || Py_SIZE(objbuf) < size) {
+        return bytes_view(PyBytes_FromStringAndSize(0, 0));
+    }
+
+    if (Py_SIZE(objbuf->buffer_head->buffer) - objbuf->buffer_offset >= size) {
+        view = chunk_view(objbuf->buffer_head, objbuf->buffer_offset, size);
+    } else {
+        view = bytes_view(copy_range(objbuf, size));
+    }
+    if (view != NULL) {
+        discard_impl(objbuf, size);
+    }
+    return view;
+}
+
+static PyObject *
+Buffer_discard(register BufferObject *objbuf, PyObject *args)
+{
+    Py_ssize_t size = -1;
+    if (!PyArg_ParseTuple(args, "|n", &size)) {
+        return NULL;
+    }
+
+    if (size < 0 || size > Py_SIZE(objbuf)) {
+        size = Py_SIZE(objbuf);
+    }
+    discard_impl(objbuf, size);
+    return PyLong_FromSsize_t(size);
+}
+
+static PyObject *
+Buffer_iter_chunks(register BufferObject *objbuf)
+{
+    PyObject* chunks;
+    PyObject* view;
+    PyObject* iter;
+    BufferQueue* queue = objbuf->buffer_head;
+    Py_ssize_t offset = objbuf->buffer_offset;
+
+    chunks = PyList_New(0);
+    if (chunks == NULL) {
+        return NULL;
+    }
+
+    while (queue != NULL) {
+        if (Py_SIZE(queue->buffer) > offset) {
+            view = chunk_view(queue, offset, Py_SIZE(queue->buffer) - offset);
+            if (view == NULL || PyList_Append(chunks, view) != 0) {
+                Py_XDECREF(view);
+                Py_DECREF(chunks);
+                return NULL;
+            }
+            Py_DECREF(view);
+        }
+        offset = 0;
+        queue = queue->next;
+    }
+
+    iter = PyObject_GetIter(chunks);
+    Py_DECREF(chunks);
+    return iter;
+}
+
+static int
+match_at(BufferQueue* queue, Py_ssize_t offset, const char* sep, Py_ssize_t sep_len)
+{
+    Py_ssize_t buf_len;
+    while (queue != NULL && sep_len > 0) {
+        buf_len = Py_SIZE(queue->buffer) - offset;
+        buf_len = buf_len > sep_len ? sep_len : buf_len;
+        if (memcmp(queue->buffer->ob_sval + offset, sep, buf_len) != 0) {
+            return 0;
+        }
+        sep += buf_len;
+        sep_len -= buf_len;
+        offset = 0;
+        queue = queue->next;
+    }
+    return sep_len == 0;
+}
+
+static Py_ssize_t
+find_impl(register BufferObject *objbuf, const char* sep, Py_ssize_t sep_len, Py_ssize_t start)
+{
+    BufferQueue* queue = objbuf->buffer_head;
+    Py_ssize_t offset = objbuf->buffer_offset;
+    Py_ssize_t position = 0;
+    Py_ssize_t buf_len, index;
+    char* data;
+    char* found;
+
+    if (start < 0) {
+        start = 0;
+    }
+    if (sep_len == 0) {
+        return start <= Py_SIZE(objbuf) ? start : -1;
+    }
+    if (Py_SIZE(objbuf) - start < sep_len) {
+        return -1;
+    }
+
+    while (queue != NULL) {
+        data = queue->buffer->ob_sval + offset;
+        buf_len = Py_SIZE(queue->buffer) - offset;
+        index = start > position ? start - position : 0;
+        while (index < buf_len) {
+            found = memchr(data + index, sep[0], buf_len - index);
+            if (found == NULL) {
+                break;
+            }
+            index = found - data;
+            if (buf_len - index >= sep_len) {
+                if (memcmp(found, sep, sep_len) == 0) {
+                    return position + index;
+                }
+            } else if (match_at(queue, offset + index, sep, sep_len)) {
+                return position + index;
+            }
+            index++;
+        }
+        position += buf_len;
+        offset = 0;
+        queue = queue->next;
+    }
+    return -1;
+}
+
+static PyObject *
+Buffer_find(register BufferObject *objbuf, PyObject *args)
+{
+    PyObject* sep;
+    Py_ssize_t start = 0;
+    if (!PyArg_ParseTuple(args, "O|n", &sep, &start)) {
+        return NULL;
+    }
+
+    if (!PyBytes_Check(sep)) {
+        PyErr_SetString(PyExc_TypeError, "The sep must be a bytes");
+        return NULL;
+    }
+    return PyLong_FromSsize_t(find_impl(objbuf, PyBytes_AS_STRING(sep), PyBytes_GET_SIZE(sep), start));
+}
+
+static PyObject *
+readsize_impl(register BufferObject *objbuf, Py_ssize_t size)
+{
+    PyObject* args;
+    PyObject* result;
+
+    args = Py_BuildValue("(n)", size);
+    if (args == NULL) {
+        return NULL;
+    }
+    result = Buffer_read(objbuf, args);
+    Py_DECREF(args);
+    return result;
+}
+
+static PyObject *
+Buffer_readuntil(register BufferObject *objbuf, PyObject *args)
+{
+    PyObject* sep;
+    Py_ssize_t start = 0;
+    Py_ssize_t index;
+    if (!PyArg_ParseTuple(args, "O|n", &sep, &start)) {
+        return NULL;
+    }
+
+    if (!PyBytes_Check(sep)) {
+        PyErr_SetString(PyExc_TypeError, "The sep must be a bytes");
+        return NULL;
+    }
+
+    index = find_impl(objbuf, PyBytes_AS_STRING(sep), PyBytes_GET_SIZE(sep), start);
+    if (index < 0 || index + PyBytes_GET_SIZE(sep) == 0) {
+        return PyBytes_FromStringAndSize(0, 0);
+    }
+    return readsize_impl(objbuf, index + PyBytes_GET_SIZE(sep));
+}
+
+static PyObject *
+Buffer_readline(register BufferObject *objbuf, PyObject *args)
+{
+    Py_ssize_t start = 0;
+    Py_ssize_t index;
+    if (!PyArg_ParseTuple(args, "|n", &start)) {
+        return NULL;
+    }
+
+    index = find_impl(objbuf, "\n", 1, start);
+    if (index < 0) {
+        return PyBytes_FromStringAndSize(0, 0);
+    }
+    return readsize_impl(objbuf, index + 1);
+}
+
+static PyObject *
+Buffer_read_frame(register BufferObject *objbuf, PyObject *args)
+{
+    const char* fmt;
+    unsigned char header[8];
+    int little_endian = 1;
+    int is_signed = 0;
+    Py_ssize_t header_size, buf_len, copy_size = 0;
+    Py_ssize_t offset = objbuf->buffer_offset;
+    unsigned long long frame_size = 0;
+    BufferQueue* queue = objbuf->buffer_head;
+    int i;
+
+    if (!PyArg_ParseTuple(args, "|s", &fmt)) {
+        return NULL;
+    }
+    if (PyTuple_GET_SIZE(args) == 0) {
+        fmt = ">H";
+    }
+
+    little_endian = *((unsigned char *)&little_endian) == 1;
+    switch (*fmt) {
+        case '<':
+            little_endian = 1;
+            fmt++;
+            break;
+        case '>':
+        case '!':
+            little_endian = 0;
+            fmt++;
+            break;
+        case '=':
+        case '@':
+            fmt++;
+            break;
+    }
+    switch (*fmt) {
+        case 'b': is_signed = 1;
+        case 'B': header_size = 1; break;
+        case 'h': is_signed = 1;
+        case 'H': header_size = 2; break;
+        case 'i': case 'l': is_signed = 1;
+        case 'I': case 'L': header_size = 4; break;
+        case 'q': is_signed = 1;
+        case 'Q': header_size = 8; break;
+        default:
+            PyErr_SetString(PyExc_ValueError, "frame format must be one integer code");
+            return NULL;
+    }
+    if (*(fmt + 1) != '\0') {
+        PyErr_SetString(PyExc_ValueError, "frame format must be one integer code");
+        return NULL;
+    }
+
+    if (Py_SIZE(objbuf) < header_size) {
+        Py_RETURN_NONE;
+    }
+
+    while (queue != NULL && copy_size < header_size) {
+        buf_len = Py_SIZE(queue->buffer) - offset;
+        buf_len = buf_len > header_size - copy_size ? header_size - copy_size : buf_len;
+        memcpy(header + copy_size, queue->buffer->ob_sval + offset, buf_len);
+        copy_size += buf_len;
+        offset = 0;
+        queue = queue->next;
+    }
+
+    for (i = 0; i < header_size; i++) {
+        frame_size = (frame_size << 8) | header[little_endian ? header_size - 1 - i : i];
+    }
+    if (is_signed && (header[little_endian ? header_size - 1 : 0] & 0x80)) {
+        PyErr_SetString(PyExc_ValueError, "frame size must not be negative");
+        return NULL;
+    }
+
+    if ((unsigned long long) (Py_SIZE(objbuf) - header_size) < frame_size) {
+        Py_RETURN_NONE;
+    }
+    discard_impl(objbuf, header_size);
+    if (frame_size == 0) {
+        return PyBytes_FromStringAndSize(0, 0);
+    }
+    return readsize_impl(objbuf, (Py_ssize_t) frame_size);
+}
+
 static Py_ssize_t
 Buffer_length(register BufferObject *objbuf)
 {
     return Py_SIZE(objbuf);
 }
 
+#ifndef MS_WINDOWS
+static PyObject *
+socket_recvv(register BufferObject *objbuf, int sock_fd, int max_len, int edge, int chunks)
+{
+    struct iovec iov[SOCKET_RECV_IOV_MAX + 1];
+    PyBytesObject* bufs[SOCKET_RECV_IOV_MAX];
+    PyBytesObject* tail_buf = NULL;
+    BufferQueue* queue;
+    int max_count = socket_recv_count;
+    int tail_iov, buf_count, i;
+    Py_ssize_t result = 0;
+    Py_ssize_t recv_len = 0;
+    Py_ssize_t chunk_len;
+
+    if (chunks > SOCKET_RECV_IOV_MAX) {
+        chunks = SOCKET_RECV_IOV_MAX;
+    }
+
+    while (max_count--) {
+        tail_iov = 0;
+        if(objbuf->buffer_tail != NULL && objbuf->buffer_tail->flag == 0x01 && socket_recv_size - Py_SIZE(objbuf->buffer_tail->buffer) >= 256) {
+            tail_buf = objbuf->buffer_tail->buffer;
+            iov[0].iov_base = tail_buf->ob_sval + Py_SIZE(tail_buf);
+            iov[0].iov_len = socket_recv_size - Py_SIZE(tail_buf);
+            tail_iov = 1;
+        }
+
+        for (buf_count = 0; buf_count < chunks; buf_count++) {
+            if(bytes_fast_buffer_index > 0) {
+                bufs[buf_count] = bytes_fast_buffer[--bytes_fast_buffer_index];
+            } else {
+                bufs[buf_count] = (PyBytesObject*)PyBytes_FromStringAndSize(0, socket_recv_size);
+                if(bufs[buf_count] == NULL) {
+                    PyErr_Clear();
+                    break;
+                }
+            }
+            iov[tail_iov + buf_count].iov_base = bufs[buf_count]->ob_sval;
+            iov[tail_iov + buf_count].iov_len = socket_recv_size;
+        }
+        if(buf_count == 0) {
+            return PyErr_NoMemory();
+        }
+
+        result = readv(sock_fd, iov, tail_iov + buf_count);
+        if(result <= 0) {
+            for (i = 0; i < buf_count; i++) {
+                if(bytes_fast_buffer_index < bytes_fast_buffer_count) {
+                    bytes_fast_buffer[bytes_fast_buffer_index++]=bufs[i];
+                } else {
+                    Py_DECREF(bufs[i]);
+                }
+            }
+            if(result == 0) {
+                return PyInt_FromLong((long) recv_len);
+            }
+            if(CHECK_ERRNO(EWOULDBLOCK) || CHECK_ERRNO(EAGAIN)) {
+                return PyInt_FromLong(edge ? (long) ~recv_len : (long) recv_len);
+            }
+            return set_error();
+        }
+
+        Py_SET_SIZE(objbuf, Py_SIZE(objbuf) + result);
+        recv_len += result;
+        if(tail_iov) {
+            chunk_len = result > (Py_ssize_t) iov[0].iov_len ? (Py_ssize_t) iov[0].iov_len : result;
+            Py_SET_SIZE(tail_buf, Py_SIZE(tail_buf) + chunk_len);
+            result -= chunk_len;
+        }
+
+        for (i = 0; i < buf_count; i++) {
+            if(result <= 0) {
+                if(bytes_fast_buffer_index < bytes_fast_buffer_count) {
+                    bytes_fast_buffer[bytes_fast_buffer_index++]=bufs[i];
+                } else {
+                    Py_DECREF(bufs[i]);
+                }
+                continue;
+            }
+
+            queue = BufferQueue_malloc();
+            if(queue == NULL) {
+                Py_SET_SIZE(objbuf, Py_SIZE(objbuf) - result);
+                for (; i < buf_count; i++) {
+                    Py_DECREF(bufs[i]);
+                }
+                return PyErr_NoMemory();
+            }
+            chunk_len = result > socket_recv_size ? socket_recv_size : result;
+            Py_SET_SIZE(bufs[i], chunk_len);
+            result -= chunk_len;
+            queue->flag = 0x01;
+            queue->next = NULL;
+            queue->odata = NULL;
+            queue->buffer = bufs[i];
+
+            if(objbuf->buffer_tail == NULL) {
+                objbuf->buffer_head = queue;
+                objbuf->buffer_tail = queue;
+            } else {
+                objbuf->buffer_tail->next = queue;
+                objbuf->buffer_tail = queue;
+            }
+        }
+
+        if(recv_len > max_len) {
+            return PyInt_FromLong((long) recv_len);
+        }
+    }
+    return PyInt_FromLong((long) recv_len);
+}
+#endif
+
 static PyObject *
 Buffer_socket_recv(register BufferObject *objbuf, PyObject *args)
 {
     int sock_fd;
     int max_len = 0x7fffffff;
-    if (!PyArg_ParseTuple(args, "i|i", &sock_fd, &max_len)) {
+    int edge = 0;
+    int chunks = 1;
+    if (!PyArg_ParseTuple(args, "i|iii", &sock_fd, &max_len, &edge, &chunks)) {
         return NULL;
     }
     max_len -= (int) Py_SIZE(objbuf);
+#ifndef MS_WINDOWS
+    if (chunks > 1) {
+        return socket_recvv(objbuf, sock_fd, max_len, edge, chunks);
+    }
+#endif
 
     int max_count = socket_recv_count;
     PyBytesObject* buf;
@@ -980,7 +1541,7 @@ Buffer_socket_recv(register BufferObject *objbuf, PyObject *args)
             result = recv(sock_fd, buf->ob_sval + Py_SIZE(buf), socket_recv_size - (int) Py_SIZE(buf), 0);
             if(result < 0) {
                 if(CHECK_ERRNO(EWOULDBLOCK) || CHECK_ERRNO(EAGAIN)) {
-                    return PyInt_FromLong((long) recv_len);
+                    return PyInt_FromLong(edge ? (long) ~recv_len : (long) recv_len);
                 }
                 return set_error();
             }
@@ -1009,19 +1570,19 @@ Buffer_socket_recv(register BufferObject *objbuf, PyObject *args)
 
         result = recv(sock_fd, buf->ob_sval, socket_recv_size, 0);
         if(result < 0) {
-            if(bytes_fast_buffer_index < BYTES_FAST_BUFFER_COUNT) {
+            if(bytes_fast_buffer_index < bytes_fast_buffer_count) {
                 bytes_fast_buffer[bytes_fast_buffer_index++]=buf;
             } else {
                 Py_DECREF(buf);
             }
             if(CHECK_ERRNO(EWOULDBLOCK) || CHECK_ERRNO(EAGAIN)) {
-                return PyInt_FromLong((long) recv_len);
+                return PyInt_FromLong(edge ? (long) ~recv_len : (long) recv_len);
             }
             return set_error();
         }
 
         if(result == 0) {
-            if(bytes_fast_buffer_index < BYTES_FAST_BUFFER_COUNT) {
+            if(bytes_fast_buffer_index < bytes_fast_buffer_count) {
                 bytes_fast_buffer[bytes_fast_buffer_index++]=buf;
             } else {
                 Py_DECREF(buf);
@@ -1038,7 +1599,7 @@ Buffer_socket_recv(register BufferObject *objbuf, PyObject *args)
         } else {
             queue = (BufferQueue*)PyMem_Malloc(sizeof(BufferQueue));
             if(queue == NULL) {
-                if(bytes_fast_buffer_index < BYTES_FAST_BUFFER_COUNT) {
+                if(bytes_fast_buffer_index < bytes_fast_buffer_count) {
                     bytes_fast_buffer[bytes_fast_buffer_index++]=buf;
                 } else {
                     Py_DECREF(buf);
@@ -1080,8 +1641,35 @@ Buffer_socket_send(register BufferObject *objbuf, PyObject *args)
     Py_ssize_t send_len = 0;
     BufferQueue* last_queue;
 
+#ifndef MS_WINDOWS
+    struct iovec iov[SOCKET_SEND_IOV_MAX];
+    int iov_count;
+    Py_ssize_t iov_len;
+    Py_ssize_t chunk_len;
+    BufferQueue* queue;
+
     while (max_count-- && objbuf->buffer_head != NULL) {
-        result = send(sock_fd, objbuf->buffer_head->buffer->ob_sval + objbuf->buffer_offset, Py_SIZE(objbuf->buffer_head->buffer) - objbuf->buffer_offset, 0);
+        iov_count = 0;
+        iov_len = 0;
+        queue = objbuf->buffer_head;
+        iov[0].iov_base = queue->buffer->ob_sval + objbuf->buffer_offset;
+        iov[0].iov_len = Py_SIZE(queue->buffer) - objbuf->buffer_offset;
+        iov_len += iov[0].iov_len;
+        iov_count++;
+        queue = queue->next;
+        while (queue != NULL && iov_count < SOCKET_SEND_IOV_MAX) {
+            iov[iov_count].iov_base = queue->buffer->ob_sval;
+            iov[iov_count].iov_len = Py_SIZE(queue->buffer);
+            iov_len += iov[iov_count].iov_len;
+            iov_count++;
+            queue = queue->next;
+        }
+
+        if(iov_count == 1) {
+            result = send(sock_fd, iov[0].iov_base, iov[0].iov_len, 0);
+        } else {
+            result = writev(sock_fd, iov, iov_count);
+        }
         if(result < 0) {
             if(CHECK_ERRNO(EWOULDBLOCK) || CHECK_ERRNO(EAGAIN)) {
                 return PyInt_FromLong((long) send_len);
@@ -1093,10 +1681,48 @@ Buffer_socket_send(register BufferObject *objbuf, PyObject *args)
             return PyInt_FromLong((long) send_len);
         }
 
-        objbuf->buffer_offset += result;
         Py_SET_SIZE(objbuf, Py_SIZE(objbuf) - result);
         send_len += result;
-        if(objbuf->buffer_offset >= Py_SIZE(objbuf->buffer_head->buffer)) {
+        iov_len -= result;
+        while (result > 0) {
+            chunk_len = Py_SIZE(objbuf->buffer_head->buffer) - objbuf->buffer_offset;
+            if(result < chunk_len) {
+                objbuf->buffer_offset += result;
+                break;
+            }
+            result -= chunk_len;
+            objbuf->buffer_offset = 0;
+            last_queue = objbuf->buffer_head;
+            objbuf->buffer_head = objbuf->buffer_head->next;
+            PyBytesObject_free(last_queue->buffer, last_queue);
+            BufferQueue_free(last_queue);
+            if(objbuf->buffer_head == NULL) {
+                objbuf->buffer_tail = NULL;
+            }
+        }
+
+        if(iov_len > 0) {
+            return PyInt_FromLong((long) send_len);
+        }
+    }
+#else
+    while (max_count-- && objbuf->buffer_head != NULL) {
+        result = send(sock_fd, objbuf->buffer_head->buffer->ob_sval + objbuf->buffer_offset, Py_SIZE(objbuf->buffer_head->buffer) - objbuf->buffer_offset, 0);
+        if(result < 0) {
+            if(CHECK_ERRNO(EWOULDBLOCK) || CHECK_ERRNO(EAGAIN)) {
+                return PyInt_FromLong((long) send_len);
+            }
+            return set_error();
+        }
+
+        if(result == 0) {
+            return PyInt_FromLong((long) send_len);
+        }
+
+        objbuf->buffer_offset += result;
+        Py_SET_SIZE(objbuf, Py_SIZE(objbuf) - result);
+        send_len += result;
+        if(objbuf->buffer_offset >= Py_SIZE(objbuf->buffer_head->buffer)) {
             objbuf->buffer_offset = 0;
             last_queue = objbuf->buffer_head;
             objbuf->buffer_head = objbuf->buffer_head->next;
@@ -1109,9 +1735,124 @@ Buffer_socket_send(register BufferObject *objbuf, PyObject *args)
             return PyInt_FromLong((long) send_len);
         }
     }
+#endif
     return PyInt_FromLong((long) send_len);
 }
 
+static PyObject *
+sock_address_build(struct sockaddr_in6* addr, int sa_family)
+{
+    if (inet_ntop(sa_family, sa_family == AF_INET ? (void*)&((struct sockaddr_in*)addr)->sin_addr : (void*)&addr->sin6_addr,
+                  sock_addr_host, 64) == NULL) {
+        PyErr_SetString(PyExc_OSError, "host inet_ntop error");
+        return NULL;
+    }
+    if (sa_family == AF_INET) {
+        return Py_BuildValue("(si)", sock_addr_host, (int)ntohs(((struct sockaddr_in*)addr)->sin_port));
+    }
+    return Py_BuildValue("(siII)", sock_addr_host, (int)ntohs(addr->sin6_port),
+                         (unsigned int)ntohl(addr->sin6_flowinfo), (unsigned int)addr->sin6_scope_id);
+}
+
+static int
+sock_address_parse(PyObject* odata, int sa_family, struct sockaddr_in6* addr)
+{
+    PyObject* host;
+    PyObject* port;
+    PyObject* flowinfo;
+    PyObject* scope_id;
+    const char *host_chars;
+
+    if (odata == NULL || !PyTuple_CheckExact(odata)) {
+        PyErr_SetString(PyExc_OSError, "buffer data must be sock address");
+        return -1;
+    }
+
+    if(PyTuple_GET_SIZE(odata) < 2) {
+        PyErr_SetString(PyExc_OSError, "sock address must be has host and port");
+        return -1;
+    }
+
+    memset(addr, 0, sizeof(struct sockaddr_in6));
+    addr->sin6_family = sa_family;
+
+    host = PyTuple_GET_ITEM(odata, 0);
+    if (!PyString_CheckExact(host)) {
+        if(!PyStringB_CheckExact(host)) {
+            PyErr_SetString(PyExc_OSError, "sock host must be string");
+            return -1;
+        }
+#if PY_MAJOR_VERSION >= 3
+        host_chars = PyBytes_AS_STRING(host);
+#else
+        PyObject* host_string_obj = PyUnicode_AsUTF8String(host);
+        if (host_string_obj == NULL) {
+            return -1;
+        }
+        host_chars = PyString_AS_STRING(host_string_obj);
+#endif
+        if(inet_pton(sa_family, host_chars, sa_family == AF_INET ? (void *)&((struct sockaddr_in*)addr)->sin_addr : (void *)&addr->sin6_addr) != 1) {
+#if PY_MAJOR_VERSION < 3
+            Py_DECREF(host_string_obj);
+#endif
+            PyErr_SetString(PyExc_OSError, "host inet_pton error");
+            return -1;
+        }
+#if PY_MAJOR_VERSION < 3
+        Py_DECREF(host_string_obj);
+#endif
+    } else {
+#if PY_MAJOR_VERSION >= 3
+        host_chars = PyUnicode_AsUTF8(host);
+        if (host_chars == NULL) {
+            return -1;
+        }
+#else
+        host_chars = PyString_AS_STRING(host);
+#endif
+        if(inet_pton(sa_family, host_chars, sa_family == AF_INET ? (void *)&((struct sockaddr_in*)addr)->sin_addr : (void *)&addr->sin6_addr) != 1) {
+            PyErr_SetString(PyExc_OSError, "host inet_pton error");
+            return -1;
+        }
+    }
+
+    port = PyTuple_GET_ITEM(odata, 1);
+    if (!PyInt_CheckExact(port)) {
+        PyErr_SetString(PyExc_OSError, "sock host must be number");
+        return -1;
+    }
+    if (PyInt_AS_LONG(port) < 0 || PyInt_AS_LONG(port) > 0xffff) {
+        PyErr_SetString(PyExc_OverflowError, "sock port must be 0-65535.");
+        return -1;
+    }
+    ((struct sockaddr_in*)addr)->sin_port = htons((unsigned short)PyInt_AS_LONG(port));
+
+    if (sa_family == AF_INET6) {
+        if (PyTuple_GET_SIZE(odata) >= 3) {
+            flowinfo = PyTuple_GET_ITEM(odata, 2);
+            if (!PyInt_CheckExact(flowinfo)) {
+                PyErr_SetString(PyExc_OSError, "sock flowinfo must be number");
+                return -1;
+            }
+            if (PyInt_AS_LONG(flowinfo) > 0xfffff) {
+                PyErr_SetString(PyExc_OverflowError, "flowinfo must be 0-1048575.");
+                return -1;
+            }
+            addr->sin6_flowinfo = htonl((unsigned int)PyInt_AS_LONG(flowinfo));
+        }
+
+        if (PyTuple_GET_SIZE(odata) >= 4) {
+            scope_id = PyTuple_GET_ITEM(odata, 3);
+            if (!PyInt_CheckExact(scope_id)) {
+                PyErr_SetString(PyExc_OSError, "sock scope_id must be number");
+                return -1;
+            }
+            addr->sin6_scope_id = (unsigned int)PyInt_AS_LONG(scope_id);
+        }
+    }
+    return 0;
+}
+
 static PyObject *
 Buffer_socket_recvfrom(register BufferObject *objbuf, PyObject *args)
 {
@@ -1148,7 +1889,7 @@ Buffer_socket_recvfrom(register BufferObject *objbuf, PyObject *args)
         memset(&addr, 0, sizeof(struct sockaddr_in6));
         result = recvfrom(sock_fd, buf->ob_sval, socket_recv_size, 0, (struct sockaddr*)&addr, &addr_len);
         if(result < 0) {
-            if(bytes_fast_buffer_index < BYTES_FAST_BUFFER_COUNT) {
+            if(bytes_fast_buffer_index < bytes_fast_buffer_count) {
                 bytes_fast_buffer[bytes_fast_buffer_index++]=buf;
             } else {
                 Py_DECREF(buf);
@@ -1160,7 +1901,7 @@ Buffer_socket_recvfrom(register BufferObject *objbuf, PyObject *args)
         }
 
         if(result == 0) {
-            if(bytes_fast_buffer_index < BYTES_FAST_BUFFER_COUNT) {
+            if(bytes_fast_buffer_index < bytes_fast_buffer_count) {
                 bytes_fast_buffer[bytes_fast_buffer_index++]=buf;
             } else {
                 Py_DECREF(buf);
@@ -1169,22 +1910,15 @@ Buffer_socket_recvfrom(register BufferObject *objbuf, PyObject *args)
         }
 
         Py_SET_SIZE(buf, result);
-        if (inet_ntop(sa_family, sa_family == AF_INET ? (void*)&((struct sockaddr_in*)&addr)->sin_addr : (void*)&((struct sockaddr_in6*)&addr)->sin6_addr,
-                               sock_addr_host, 64) == NULL) {
-            if(bytes_fast_buffer_index < BYTES_FAST_BUFFER_COUNT) {
+        addr_data = sock_address_build(&addr, sa_family);
+        if (addr_data == NULL) {
+            if(bytes_fast_buffer_index < bytes_fast_buffer_count) {
                 bytes_fast_buffer[bytes_fast_buffer_index++]=buf;
             } else {
                 Py_DECREF(buf);
             }
-            PyErr_SetString(PyExc_OSError, "host inet_ntop error");
             return NULL;
         }
-        if (sa_family == AF_INET) {
-            addr_data = PyTuple_Pack(2, PyString_FromString(sock_addr_host), PyInt_FromLong(ntohs(((struct sockaddr_in*)&addr)->sin_port)));
-        } else {
-            addr_data = PyTuple_Pack(4, PyString_FromString(sock_addr_host), PyInt_FromLong(ntohs(((struct sockaddr_in6*)&addr)->sin6_port)),
-                                     PyInt_FromLong(ntohl(((struct sockaddr_in6*)&addr)->sin6_flowinfo)), PyInt_FromLong(((struct sockaddr_in6*)&addr)->sin6_scope_id));
-        }
 
         BufferQueue* queue;
         if(buffer_queue_fast_buffer_index > 0) {
@@ -1193,7 +1927,7 @@ Buffer_socket_recvfrom(register BufferObject *objbuf, PyObject *args)
         } else {
             queue = (BufferQueue*)PyMem_Malloc(sizeof(BufferQueue));
             if(queue == NULL) {
-                if(bytes_fast_buffer_index < BYTES_FAST_BUFFER_COUNT) {
+                if(bytes_fast_buffer_index < bytes_fast_buffer_count) {
                     bytes_fast_buffer[bytes_fast_buffer_index++]=buf;
                 } else {
                     Py_DECREF(buf);
@@ -1238,104 +1972,219 @@ Buffer_socket_sendto(register BufferObject *objbuf, PyObject *args)
     if (sa_family == AF_INET6) {
         addr_len = sizeof(struct sockaddr_in6);
     }
-    memset(&addr, 0, sizeof(struct sockaddr_in6));
-    ((struct sockaddr_in6*)&addr)->sin6_family = sa_family;
 
     Py_ssize_t result = 0;
     Py_ssize_t send_len = 0;
     BufferQueue* last_queue;
 
-    PyObject* host;
-    PyObject* port;
-    PyObject* flowinfo;
-    PyObject* scope_id;
-
     while (max_count-- && objbuf->buffer_head != NULL) {
-        if (objbuf->buffer_head->odata == NULL || !PyTuple_CheckExact(objbuf->buffer_head->odata)) {
-            PyErr_SetString(PyExc_OSError, "buffer data must be sock address");
+        if (sock_address_parse(objbuf->buffer_head->odata, sa_family, &addr) != 0) {
             return NULL;
         }
 
-        if(PyTuple_GET_SIZE(objbuf->buffer_head->odata) < 2) {
-            PyErr_SetString(PyExc_OSError, "sock address must be has host and port");
-            return NULL;
+        result = sendto(sock_fd, objbuf->buffer_head->buffer->ob_sval + objbuf->buffer_offset, Py_SIZE(objbuf->buffer_head->buffer) - objbuf->buffer_offset, 0, (struct sockaddr*)&addr, addr_len);
+        if(result < 0) {
+            if(CHECK_ERRNO(EWOULDBLOCK) || CHECK_ERRNO(EAGAIN)) {
+                return PyInt_FromLong((long) send_len);
+            }
+            return set_error();
         }
 
-        host = PyTuple_GET_ITEM(objbuf->buffer_head->odata, 0);
-        if (!PyString_CheckExact(host)) {
-            if(!PyStringB_CheckExact(host)) {
-                PyErr_SetString(PyExc_OSError, "sock host must be string");
-                return NULL;
-            } else {
-#if PY_MAJOR_VERSION >= 3
-                const char *host_chars = PyBytes_AS_STRING(host);
-#else
-                PyObject* host_string_obj = PyUnicode_AsUTF8String(host);
-                const char *host_chars = PyString_AS_STRING(host_string_obj);
-#endif
-                if(inet_pton(sa_family, host_chars, sa_family == AF_INET ? (void *)&((struct sockaddr_in*)&addr)->sin_addr : (void *)&((struct sockaddr_in6*)&addr)->sin6_addr) != 1) {
-#if PY_MAJOR_VERSION < 3
-                    Py_DECREF(host_string_obj);
-#endif
-                    PyErr_SetString(PyExc_OSError, "host inet_pton error");
-                    return NULL;
-                }
-#if PY_MAJOR_VERSION < 3
-                Py_DECREF(host_string_obj);
-#endif
+        if(result == 0) {
+            return PyInt_FromLong((long) send_len);
+        }
+
+        objbuf->buffer_offset += result;
+        Py_SET_SIZE(objbuf, Py_SIZE(objbuf) - result);
+        send_len += result;
+        if(objbuf->buffer_offset >= Py_SIZE(objbuf->buffer_head->buffer)) {
+            objbuf->buffer_offset = 0;
+            last_queue = objbuf->buffer_head;
+            objbuf->buffer_head = objbuf->buffer_head->next;
+            PyBytesObject_free(last_queue->buffer, last_queue);
+            BufferQueue_free(last_queue);
+            if(objbuf->buffer_head == NULL) {
+                objbuf->buffer_tail = NULL;
             }
         } else {
-#if PY_MAJOR_VERSION >= 3
-            const char *host_chars = PyUnicode_AsUTF8(host);
-#else
-            const char *host_chars = PyString_AS_STRING(host);
-#endif
-            if(inet_pton(sa_family, host_chars, sa_family == AF_INET ? (void *)&((struct sockaddr_in*)&addr)->sin_addr : (void *)&((struct sockaddr_in6*)&addr)->sin6_addr) != 1) {
-                PyErr_SetString(PyExc_OSError, "host inet_pton error");
-                return NULL;
-            }
+            return PyInt_FromLong((long) send_len);
         }
+    }
+    return PyInt_FromLong((long) send_len);
+}
 
-        port = PyTuple_GET_ITEM(objbuf->buffer_head->odata, 1);
-        if (!PyInt_CheckExact(port)) {
-            PyErr_SetString(PyExc_OSError, "sock host must be number");
-            return NULL;
+#ifdef SOCKET_MMSG_SUPPORTED
+static struct mmsghdr socket_mmsg_hdrs[SOCKET_MMSG_COUNT];
+static struct iovec socket_mmsg_iovs[SOCKET_MMSG_COUNT];
+static struct sockaddr_in6 socket_mmsg_addrs[SOCKET_MMSG_COUNT];
+static PyBytesObject* socket_mmsg_bufs[SOCKET_MMSG_COUNT];
+
+static PyObject *
+Buffer_socket_recvmmsg(register BufferObject *objbuf, PyObject *args)
+{
+    int sock_fd;
+    int sa_family = AF_INET;
+    int max_len = 0x7fffffff;
+    if (!PyArg_ParseTuple(args, "i|ii", &sock_fd, &sa_family, &max_len)) {
+        return NULL;
+    }
+    max_len -= (int) Py_SIZE(objbuf);
+
+    int max_count = socket_recv_count;
+    socklen_t addr_len = sizeof(struct sockaddr_in);
+    if (sa_family == AF_INET6) {
+        addr_len = sizeof(struct sockaddr_in6);
+    }
+
+    PyBytesObject* buf;
+    PyObject* addr_data;
+    BufferQueue* queue;
+    int result = 0;
+    int i, count;
+    Py_ssize_t recv_len = 0;
+
+    while (max_count--) {
+        for (count = 0; count < SOCKET_MMSG_COUNT; count++) {
+            if(bytes_fast_buffer_index > 0) {
+                buf = bytes_fast_buffer[--bytes_fast_buffer_index];
+            } else {
+                buf = (PyBytesObject*)PyBytes_FromStringAndSize(0, socket_recv_size);
+                if(buf == NULL) {
+                    break;
+                }
+            }
+            socket_mmsg_bufs[count] = buf;
+            socket_mmsg_iovs[count].iov_base = buf->ob_sval;
+            socket_mmsg_iovs[count].iov_len = socket_recv_size;
+            memset(&socket_mmsg_hdrs[count], 0, sizeof(struct mmsghdr));
+            socket_mmsg_hdrs[count].msg_hdr.msg_name = &socket_mmsg_addrs[count];
+            socket_mmsg_hdrs[count].msg_hdr.msg_namelen = addr_len;
+            socket_mmsg_hdrs[count].msg_hdr.msg_iov = &socket_mmsg_iovs[count];
+            socket_mmsg_hdrs[count].msg_hdr.msg_iovlen = 1;
         }
-        if (PyInt_AS_LONG(port) < 0 || PyInt_AS_LONG(port) > 0xffff) {
-            PyErr_SetString(PyExc_OverflowError, "sock port must be 0-65535.");
-            return NULL;
+        if (count == 0) {
+            return PyErr_NoMemory();
         }
-        ((struct sockaddr_in*)&addr)->sin_port = htons((short)PyInt_AS_LONG(port));
 
-        if (sa_family == AF_INET6) {
-            if (PyTuple_GET_SIZE(objbuf->buffer_head->odata) >= 3) {
-                flowinfo = PyTuple_GET_ITEM(objbuf->buffer_head->odata, 2);
-                if (!PyInt_CheckExact(flowinfo)) {
-                    PyErr_SetString(PyExc_OSError, "sock flowinfo must be number");
-                    return NULL;
+        result = recvmmsg(sock_fd, socket_mmsg_hdrs, count, 0, NULL);
+        if (result < 0) {
+            for (i = 0; i < count; i++) {
+                buf = socket_mmsg_bufs[i];
+                if(bytes_fast_buffer_index < bytes_fast_buffer_count) {
+                    bytes_fast_buffer[bytes_fast_buffer_index++]=buf;
+                } else {
+                    Py_DECREF(buf);
                 }
-                if (PyInt_AS_LONG(flowinfo) > 0xfffff) {
-                    PyErr_SetString(PyExc_OverflowError, "flowinfo must be 0-1048575.");
-                    return NULL;
+            }
+            if(CHECK_ERRNO(EWOULDBLOCK) || CHECK_ERRNO(EAGAIN)) {
+                return PyInt_FromLong((long) recv_len);
+            }
+            return set_error();
+        }
+
+        for (i = 0; i < result; i++) {
+            buf = socket_mmsg_bufs[i];
+            if (socket_mmsg_hdrs[i].msg_len == 0) {
+                if(bytes_fast_buffer_index < bytes_fast_buffer_count) {
+                    bytes_fast_buffer[bytes_fast_buffer_index++]=buf;
+                } else {
+                    Py_DECREF(buf);
                 }
-                ((struct sockaddr_in6*)&addr)->sin6_flowinfo = htonl((unsigned int)PyInt_AS_LONG(flowinfo));
-            } else {
-                ((struct sockaddr_in6*)&addr)->sin6_flowinfo = htonl(0);
+                continue;
+            }
+            Py_SET_SIZE(buf, socket_mmsg_hdrs[i].msg_len);
+            addr_data = sock_address_build(&socket_mmsg_addrs[i], sa_family);
+            if (addr_data == NULL) {
+                break;
             }
 
-            if (PyTuple_GET_SIZE(objbuf->buffer_head->odata) >= 4) {
-                scope_id = PyTuple_GET_ITEM(objbuf->buffer_head->odata, 3);
-                if (!PyInt_CheckExact(scope_id)) {
-                    PyErr_SetString(PyExc_OSError, "sock flowinfo must be number");
-                    return NULL;
+            if(buffer_queue_fast_buffer_index > 0) {
+                queue = buffer_queue_fast_buffer[--buffer_queue_fast_buffer_index];
+            } else {
+                queue = (BufferQueue*)PyMem_Malloc(sizeof(BufferQueue));
+                if(queue == NULL) {
+                    Py_DECREF(addr_data);
+                    PyErr_NoMemory();
+                    break;
                 }
-                ((struct sockaddr_in6*)&addr)->sin6_flowinfo = (unsigned int)PyInt_AS_LONG(scope_id);
+                queue->next = NULL;
+            }
+            queue->flag = 0x01;
+            queue->odata = addr_data;
+            queue->buffer = buf;
+
+            if(objbuf->buffer_tail == NULL) {
+                objbuf->buffer_head = queue;
+                objbuf->buffer_tail = queue;
             } else {
-                ((struct sockaddr_in6*)&addr)->sin6_flowinfo = 0;
+                objbuf->buffer_tail->next = queue;
+                objbuf->buffer_tail = queue;
             }
+            Py_SET_SIZE(objbuf, Py_SIZE(objbuf) + socket_mmsg_hdrs[i].msg_len);
+            recv_len += socket_mmsg_hdrs[i].msg_len;
         }
 
-        result = sendto(sock_fd, objbuf->buffer_head->buffer->ob_sval + objbuf->buffer_offset, Py_SIZE(objbuf->buffer_head->buffer) - objbuf->buffer_offset, 0, (struct sockaddr*)&addr, addr_len);
+        for (; i < count; i++) {
+            buf = socket_mmsg_bufs[i];
+            if(bytes_fast_buffer_index < bytes_fast_buffer_count) {
+                bytes_fast_buffer[bytes_fast_buffer_index++]=buf;
+            } else {
+                Py_DECREF(buf);
+            }
+        }
+
+        if (PyErr_Occurred()) {
+            return NULL;
+        }
+        if (result < count || recv_len > max_len) {
+            return PyInt_FromLong((long) recv_len);
+        }
+    }
+    return PyInt_FromLong((long) recv_len);
+}
+
+static PyObject *
+Buffer_socket_sendmmsg(register BufferObject *objbuf, PyObject *args)
+{
+    int sock_fd;
+    int sa_family = AF_INET;
+    if (!PyArg_ParseTuple(args, "i|i", &sock_fd, &sa_family)) {
+        return NULL;
+    }
+
+    int max_count = socket_send_count;
+    socklen_t addr_len = sizeof(struct sockaddr_in);
+    if (sa_family == AF_INET6) {
+        addr_len = sizeof(struct sockaddr_in6);
+    }
+
+    int result = 0;
+    int i, count;
+    Py_ssize_t send_len = 0;
+    BufferQueue* queue;
+    BufferQueue* last_queue;
+
+    while (max_count-- && objbuf->buffer_head != NULL) {
+        queue = objbuf->buffer_head;
+        for (count = 0; count < SOCKET_MMSG_COUNT && queue != NULL; count++) {
+            if (sock_address_parse(queue->odata, sa_family, &socket_mmsg_addrs[count]) != 0) {
+                break;
+            }
+            socket_mmsg_iovs[count].iov_base = queue->buffer->ob_sval + (count == 0 ? objbuf->buffer_offset : 0);
+            socket_mmsg_iovs[count].iov_len = Py_SIZE(queue->buffer) - (count == 0 ? objbuf->buffer_offset : 0);
+            memset(&socket_mmsg_hdrs[count], 0, sizeof(struct mmsghdr));
+            socket_mmsg_hdrs[count].msg_hdr.msg_name = &socket_mmsg_addrs[count];
+            socket_mmsg_hdrs[count].msg_hdr.msg_namelen = addr_len;
+            socket_mmsg_hdrs[count].msg_hdr.msg_iov = &socket_mmsg_iovs[count];
+            socket_mmsg_hdrs[count].msg_hdr.msg_iovlen = 1;
+            queue = queue->next;
+        }
+        if (count == 0) {
+            return NULL;
+        }
+        PyErr_Clear();
+
+        result = sendmmsg(sock_fd, socket_mmsg_hdrs, count, 0);
         if(result < 0) {
             if(CHECK_ERRNO(EWOULDBLOCK) || CHECK_ERRNO(EAGAIN)) {
                 return PyInt_FromLong((long) send_len);
@@ -1343,15 +2192,121 @@ Buffer_socket_sendto(register BufferObject *objbuf, PyObject *args)
             return set_error();
         }
 
-        if(result == 0) {
+        for (i = 0; i < result; i++) {
+            objbuf->buffer_offset = 0;
+            Py_SET_SIZE(objbuf, Py_SIZE(objbuf) - (Py_ssize_t) socket_mmsg_iovs[i].iov_len);
+            send_len += socket_mmsg_hdrs[i].msg_len;
+            last_queue = objbuf->buffer_head;
+            objbuf->buffer_head = objbuf->buffer_head->next;
+            PyBytesObject_free(last_queue->buffer, last_queue);
+            BufferQueue_free(last_queue);
+            if(objbuf->buffer_head == NULL) {
+                objbuf->buffer_tail = NULL;
+            }
+        }
+
+        if(result < count) {
             return PyInt_FromLong((long) send_len);
         }
+    }
+    return PyInt_FromLong((long) send_len);
+}
+#endif
 
-        objbuf->buffer_offset += result;
-        Py_SET_SIZE(objbuf, Py_SIZE(objbuf) - result);
-        send_len += result;
-        if(objbuf->buffer_offset >= Py_SIZE(objbuf->buffer_head->buffer)) {
+#ifdef SOCKET_UDP_OFFLOAD_SUPPORTED
+static struct iovec socket_gso_iovs[SOCKET_GSO_MAX_SEGMENTS];
+static char socket_gro_buffer[SOCKET_GRO_BUFFER_SIZE];
+
+static PyObject *
+Buffer_socket_sendgso(register BufferObject *objbuf, PyObject *args)
+{
+    int sock_fd;
+    int sa_family = AF_INET;
+    if (!PyArg_ParseTuple(args, "i|i", &sock_fd, &sa_family)) {
+        return NULL;
+    }
+
+    int max_count = socket_send_count;
+    struct sockaddr_in6 addr;
+    socklen_t addr_len = sizeof(struct sockaddr_in);
+    if (sa_family == AF_INET6) {
+        addr_len = sizeof(struct sockaddr_in6);
+    }
+
+    union {
+        char buf[CMSG_SPACE(sizeof(uint16_t))];
+        struct cmsghdr align;
+    } control;
+    struct msghdr msg;
+    struct cmsghdr *cmsg;
+    Py_ssize_t result = 0;
+    Py_ssize_t send_len = 0;
+    Py_ssize_t segment_size, chunk_len, total_len;
+    int i, count, equal;
+    BufferQueue* queue;
+    BufferQueue* last_queue;
+
+    while (max_count-- && objbuf->buffer_head != NULL) {
+        queue = objbuf->buffer_head;
+        if (sock_address_parse(queue->odata, sa_family, &addr) != 0) {
+            return NULL;
+        }
+
+        segment_size = Py_SIZE(queue->buffer) - objbuf->buffer_offset;
+        socket_gso_iovs[0].iov_base = queue->buffer->ob_sval + objbuf->buffer_offset;
+        socket_gso_iovs[0].iov_len = segment_size;
+        total_len = segment_size;
+        count = 1;
+        queue = queue->next;
+        while (queue != NULL && count < SOCKET_GSO_MAX_SEGMENTS && segment_size > 0) {
+            chunk_len = Py_SIZE(queue->buffer);
+            if (chunk_len == 0 || chunk_len > segment_size || total_len + chunk_len > SOCKET_GSO_MAX_SIZE) {
+                break;
+            }
+            equal = queue->odata == NULL ? 0 : PyObject_RichCompareBool(queue->odata, objbuf->buffer_head->odata, Py_EQ);
+            if (equal != 1) {
+                if (equal < 0) {
+                    PyErr_Clear();
+                }
+                break;
+            }
+            socket_gso_iovs[count].iov_base = queue->buffer->ob_sval;
+            socket_gso_iovs[count].iov_len = chunk_len;
+            total_len += chunk_len;
+            count++;
+            if (chunk_len < segment_size) {
+                break;
+            }
+            queue = queue->next;
+        }
+
+        memset(&msg, 0, sizeof(struct msghdr));
+        msg.msg_name = &addr;
+        msg.msg_namelen = addr_len;
+        msg.msg_iov = socket_gso_iovs;
+        msg.msg_iovlen = count;
+        if (count > 1) {
+            memset(&control, 0, sizeof(control));
+            msg.msg_control = control.buf;
+            msg.msg_controllen = sizeof(control.buf);
+            cmsg = CMSG_FIRSTHDR(&msg);
+            cmsg->cmsg_level = SOL_UDP;
+            cmsg->cmsg_type = UDP_SEGMENT;
+            cmsg->cmsg_len = CMSG_LEN(sizeof(uint16_t));
+            *((uint16_t *) CMSG_DATA(cmsg)) = (uint16_t) segment_size;
+        }
+
+        result = sendmsg(sock_fd, &msg, 0);
+        if(result < 0) {
+            if(CHECK_ERRNO(EWOULDBLOCK) || CHECK_ERRNO(EAGAIN)) {
+                return PyInt_FromLong((long) send_len);
+            }
+            return set_error();
+        }
+
+        for (i = 0; i < count; i++) {
             objbuf->buffer_offset = 0;
+            Py_SET_SIZE(objbuf, Py_SIZE(objbuf) - (Py_ssize_t) socket_gso_iovs[i].iov_len);
             last_queue = objbuf->buffer_head;
             objbuf->buffer_head = objbuf->buffer_head->next;
             PyBytesObject_free(last_queue->buffer, last_queue);
@@ -1359,13 +2314,138 @@ Buffer_socket_sendto(register BufferObject *objbuf, PyObject *args)
             if(objbuf->buffer_head == NULL) {
                 objbuf->buffer_tail = NULL;
             }
-        } else {
-            return PyInt_FromLong((long) send_len);
         }
+        send_len += result;
     }
     return PyInt_FromLong((long) send_len);
 }
 
+static PyObject *
+Buffer_socket_recvgro(register BufferObject *objbuf, PyObject *args)
+{
+    int sock_fd;
+    int sa_family = AF_INET;
+    int max_len = 0x7fffffff;
+    if (!PyArg_ParseTuple(args, "i|ii", &sock_fd, &sa_family, &max_len)) {
+        return NULL;
+    }
+    max_len -= (int) Py_SIZE(objbuf);
+
+    int max_count = socket_recv_count;
+    struct sockaddr_in6 addr;
+    socklen_t addr_len = sizeof(struct sockaddr_in);
+    if (sa_family == AF_INET6) {
+        addr_len = sizeof(struct sockaddr_in6);
+    }
+
+    union {
+        char buf[CMSG_SPACE(sizeof(int))];
+        struct cmsghdr align;
+    } control;
+    struct msghdr msg;
+    struct cmsghdr *cmsg;
+    struct iovec iov;
+    PyBytesObject* buf;
+    PyObject* addr_data;
+    BufferQueue* queue;
+    Py_ssize_t result = 0;
+    Py_ssize_t recv_len = 0;
+    Py_ssize_t offset, segment_len;
+    int segment_size;
+
+    while (max_count--) {
+        memset(&addr, 0, sizeof(struct sockaddr_in6));
+        memset(&msg, 0, sizeof(struct msghdr));
+        iov.iov_base = socket_gro_buffer;
+        iov.iov_len = SOCKET_GRO_BUFFER_SIZE;
+        msg.msg_name = &addr;
+        msg.msg_namelen = addr_len;
+        msg.msg_iov = &iov;
+        msg.msg_iovlen = 1;
+        msg.msg_control = control.buf;
+        msg.msg_controllen = sizeof(control.buf);
+
+        result = recvmsg(sock_fd, &msg, 0);
+        if(result < 0) {
+            if(CHECK_ERRNO(EWOULDBLOCK) || CHECK_ERRNO(EAGAIN)) {
+                return PyInt_FromLong((long) recv_len);
+            }
+            return set_error();
+        }
+
+        if(result == 0) {
+            return PyInt_FromLong((long) recv_len);
+        }
+
+        segment_size = 0;
+        for (cmsg = CMSG_FIRSTHDR(&msg); cmsg != NULL; cmsg = CMSG_NXTHDR(&msg, cmsg)) {
+            if (cmsg->cmsg_level == SOL_UDP && cmsg->cmsg_type == UDP_GRO) {
+                memcpy(&segment_size, CMSG_DATA(cmsg), sizeof(int));
+                break;
+            }
+        }
+        if (segment_size <= 0 || segment_size > result) {
+            segment_size = (int) result;
+        }
+
+        addr_data = sock_address_build(&addr, sa_family);
+        if (addr_data == NULL) {
+            return NULL;
+        }
+
+        for (offset = 0; offset < result; offset += segment_len) {
+            segment_len = result - offset < segment_size ? result - offset : segment_size;
+            if(buffer_queue_fast_buffer_index > 0) {
+                queue = buffer_queue_fast_buffer[--buffer_queue_fast_buffer_index];
+            } else {
+                queue = (BufferQueue*)PyMem_Malloc(sizeof(BufferQueue));
+                if(queue == NULL) {
+                    Py_DECREF(addr_data);
+                    return PyErr_NoMemory();
+                }
+                queue->next = NULL;
+            }
+
+            if(segment_len <= socket_recv_size && bytes_fast_buffer_index > 0) {
+                buf = bytes_fast_buffer[--bytes_fast_buffer_index];
+                memcpy(buf->ob_sval, socket_gro_buffer + offset, segment_len);
+                Py_SET_SIZE(buf, segment_len);
+                queue->flag = 0x01;
+            } else {
+                buf = (PyBytesObject*)PyBytes_FromStringAndSize(socket_gro_buffer + offset, segment_len);
+                if(buf == NULL) {
+                    queue->odata = NULL;
+                    queue->flag = 0;
+                    BufferQueue_free(queue);
+                    Py_DECREF(addr_data);
+                    return PyErr_NoMemory();
+                }
+                queue->flag = 0;
+            }
+            Py_INCREF(addr_data);
+            queue->odata = addr_data;
+            queue->buffer = buf;
+
+            if(objbuf->buffer_tail == NULL) {
+                objbuf->buffer_head = queue;
+                objbuf->buffer_tail = queue;
+            } else {
+                objbuf->buffer_tail->next = queue;
+                objbuf->buffer_tail = queue;
+            }
+            Py_SET_SIZE(objbuf, Py_SIZE(objbuf) + segment_len);
+        }
+        Py_DECREF(addr_data);
+
+        recv_len += result;
+        if(recv_len > max_len) {
+            return PyInt_FromLong((long) recv_len);
+        }
+    }
+    return PyInt_FromLong((long) recv_len);
+}
+#endif
+
 static PyObject*
 Buffer_buffer_getter(register BufferObject *objbuf, void *args) {
     if(Py_SIZE(objbuf) == 0) {
@@ -1439,10 +2519,26 @@ static PyMethodDef Buffer_methods[] = {
         {"head_data", (PyCFunction)Buffer_head_data, METH_NOARGS, "buffer head_data"},
         {"last", (PyCFunction)Buffer_last, METH_NOARGS, "buffer last"},
         {"last_data", (PyCFunction)Buffer_last_data, METH_NOARGS, "buffer last_data"},
+        {"peek", (PyCFunction)Buffer_peek, METH_VARARGS, "buffer peek"},
+        {"readview", (PyCFunction)Buffer_readview, METH_VARARGS, "buffer readview"},
+        {"discard", (PyCFunction)Buffer_discard, METH_VARARGS, "buffer discard"},
+        {"iter_chunks", (PyCFunction)Buffer_iter_chunks, METH_NOARGS, "buffer iter_chunks"},
+        {"find", (PyCFunction)Buffer_find, METH_VARARGS, "buffer find"},
+        {"readuntil", (PyCFunction)Buffer_readuntil, METH_VARARGS, "buffer readuntil"},
+        {"readline", (PyCFunction)Buffer_readline, METH_VARARGS, "buffer readline"},
+        {"read_frame", (PyCFunction)Buffer_read_frame, METH_VARARGS, "buffer read_frame"},
         {"socket_send", (PyCFunction)Buffer_socket_send, METH_VARARGS, "buffer socket_send"},
         {"socket_recv", (PyCFunction)Buffer_socket_recv, METH_VARARGS, "buffer socket_recv"},
         {"socket_sendto", (PyCFunction)Buffer_socket_sendto, METH_VARARGS, "buffer socket_sendto"},
         {"socket_recvfrom", (PyCFunction)Buffer_socket_recvfrom, METH_VARARGS, "buffer socket_recvfrom"},
+#ifdef SOCKET_MMSG_SUPPORTED
+        {"socket_sendmmsg", (PyCFunction)Buffer_socket_sendmmsg, METH_VARARGS, "buffer socket_sendmmsg"},
+        {"socket_recvmmsg", (PyCFunction)Buffer_socket_recvmmsg, METH_VARARGS, "buffer socket_recvmmsg"},
+#endif
+#ifdef SOCKET_UDP_OFFLOAD_SUPPORTED
+        {"socket_sendgso", (PyCFunction)Buffer_socket_sendgso, METH_VARARGS, "buffer socket_sendgso"},
+        {"socket_recvgro", (PyCFunction)Buffer_socket_recvgro, METH_VARARGS, "buffer socket_recvgro"},
+#endif
         {NULL}  /* Sentinel */
 };
 
@@ -1555,7 +2651,7 @@ cbuffer_socket_recv(PyObject *self, PyObject *args) {
 
     Py_ssize_t result = recv(sock_fd, buf->ob_sval, socket_recv_size, 0);
     if(result < 0) {
-        if(bytes_fast_buffer_index < BYTES_FAST_BUFFER_COUNT) {
+        if(bytes_fast_buffer_index < bytes_fast_buffer_count) {
             bytes_fast_buffer[bytes_fast_buffer_index++]=buf;
         } else {
             Py_DECREF(buf);
@@ -1609,6 +2705,36 @@ cbuffer_socket_get_recv_size(PyObject *self, PyObject *args) {
     return PyInt_FromLong(socket_recv_size);
 }
 
+static PyObject *
+cbuffer_socket_set_recv_pool_size(PyObject *self, PyObject *args) {
+    int pool_size;
+    if (!PyArg_ParseTuple(args, "i", &pool_size)) {
+        return NULL;
+    }
+
+    if(pool_size < 0) {
+        pool_size = 0;
+    } else if(pool_size > BYTES_FAST_BUFFER_MAX_COUNT) {
+        pool_size = BYTES_FAST_BUFFER_MAX_COUNT;
+    }
+
+    while (bytes_fast_buffer_index > pool_size) {
+        Py_DECREF(bytes_fast_buffer[--bytes_fast_buffer_index]);
+    }
+    bytes_fast_buffer_count = (short) pool_size;
+    Py_RETURN_NONE;
+}
+
+static PyObject *
+cbuffer_socket_get_recv_pool_size(PyObject *self, PyObject *args) {
+    return PyInt_FromLong(bytes_fast_buffer_count);
+}
+
+static PyObject *
+cbuffer_socket_get_recv_pool_count(PyObject *self, PyObject *args) {
+    return PyInt_FromLong(bytes_fast_buffer_index);
+}
+
 static PyObject *
 cbuffer_socket_set_recv_count(PyObject *self, PyObject *args) {
     int recv_count;
@@ -1647,6 +2773,9 @@ static PyMethodDef module_methods[] =
         {"socket_recv", (PyCFunction)cbuffer_socket_recv, METH_VARARGS, "socket_recv"},
         {"socket_set_recv_size", (PyCFunction)cbuffer_socket_set_recv_size, METH_VARARGS, "socket_set_recv_size"},
         {"socket_get_recv_size", (PyCFunction)cbuffer_socket_get_recv_size, METH_VARARGS, "socket_get_recv_size"},
+        {"socket_set_recv_pool_size", (PyCFunction)cbuffer_socket_set_recv_pool_size, METH_VARARGS, "socket_set_recv_pool_size"},
+        {"socket_get_recv_pool_size", (PyCFunction)cbuffer_socket_get_recv_pool_size, METH_VARARGS, "socket_get_recv_pool_size"},
+        {"socket_get_recv_pool_count", (PyCFunction)cbuffer_socket_get_recv_pool_count, METH_VARARGS, "socket_get_recv_pool_count"},
         {"socket_set_recv_count", (PyCFunction)cbuffer_socket_set_recv_count, METH_VARARGS, "socket_set_recv_count"},
         {"socket_get_recv_count", (PyCFunction)cbuffer_socket_get_recv_count, METH_VARARGS, "socket_get_recv_count"},
         {"socket_set_send_count", (PyCFunction)cbuffer_socket_set_send_count, METH_VARARGS, "socket_set_send_count"},
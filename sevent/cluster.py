@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+# 2026/10/17
+# create by: snower
+
+import os
+import time
+import signal
+import multiprocessing
+from .utils import is_py3, get_logger
+
+try:
+    CLUSTER_WORKERS = int(os.environ.get("SEVENT_CLUSTER_WORKERS", 0))
+except:
+    CLUSTER_WORKERS = 0
+
+try:
+    CLUSTER_RESTART_DELAY = float(os.environ.get("SEVENT_CLUSTER_RESTART_DELAY", 1))
+except:
+    CLUSTER_RESTART_DELAY = 1
+
+_worker_index = None
+
+
+def worker_index():
+    return _worker_index
+
+
+def is_worker():
+    return _worker_index is not None
+
+
+def _run_worker(index, target, args, kwargs):
+    global _worker_index
+    _worker_index = index
+
+    from . import loop as _loop
+    from .dns import DNSResolver
+    _loop._thread_local._sevent_ioloop = None
+    _loop._ioloop = None
+    _loop._mul_ioloop = False
+    DNSResolver._instance = None
+
+    loop = _loop.instance()
+    signal.signal(signal.SIGINT, lambda signum, frame: loop.stop())
+    signal.signal(signal.SIGTERM, lambda signum, frame: loop.stop())
+    if is_py3:
+        loop.call_async(target, *args, **kwargs)
+    else:
+        loop.add_async(target, *args, **kwargs)
+    try:
+        loop.start()
+    except KeyboardInterrupt:
+        pass
+
+
+class Cluster(object):
+    ''' Run target in worker processes with their own IOLoop, servers should enable_reuseport() '''
+
+    def __init__(self, target, args=(), kwargs=None, workers=None, restart_delay=None):
+        self._target = target
+        self._args = args
+        self._kwargs = kwargs or {}
+        self._workers = workers or CLUSTER_WORKERS or multiprocessing.cpu_count()
+        self._restart_delay = CLUSTER_RESTART_DELAY if restart_delay is None else restart_delay
+        self._processes = {}
+        self._stopped = False
+
+    @property
+    def workers(self):
+        return self._workers
+
+    @property
+    def processes(self):
+        return self._processes
+
+    def _spawn(self, index):
+        process = multiprocessing.Process(target=_run_worker, args=(index, self._target, self._args, self._kwargs))
+        process.start()
+        self._processes[index] = process
+        get_logger().debug("cluster worker %s started pid %s", index, process.pid)
+        return process
+
+    def _wait(self, timeout):
+        if is_py3:
+            from multiprocessing.connection import wait
+            wait([process.sentinel for process in self._processes.values()], timeout)
+        else:
+            time.sleep(timeout)
+
+    def start(self):
+        signal.signal(signal.SIGINT, lambda signum, frame: self.stop())
+        signal.signal(signal.SIGTERM, lambda signum, frame: self.stop())
+
+        for index in range(self._workers):
+            self._spawn(index)
+
+        while not self._stopped:
+            self._wait(1)
+            if self._stopped:
+                break
+
+            for index, process in list(self._processes.items()):
+                if process.is_alive():
+                    continue
+                get_logger().error("cluster worker %s pid %s exited with code %s, restart after %ss",
+                                   index, process.pid, process.exitcode, self._restart_delay)
+                del self._processes[index]
+
+            if len(self._processes) < self._workers:
+                if self._restart_delay > 0:
+                    time.sleep(self._restart_delay)
+                if self._stopped:
+                    break
+                for index in range(self._workers):
+                    if index not in self._processes:
+                        self._spawn(index)
+
+        self.join()
+
+    def stop(self):
+        self._stopped = True
+        for process in list(self._processes.values()):
+            if process.is_alive():
+                try:
+                    process.terminate()
+                except Exception as e:
+                    get_logger().error("cluster worker terminate error: %s", e)
+
+    def join(self, timeout=5):
+        deadline = time.time() + timeout
+        for process in self._processes.values():
+            process.join(max(deadline - time.time(), 0))
+            if process.is_alive():
+                try:
+                    os.kill(process.pid, signal.SIGKILL)
+                except Exception as e:
+                    get_logger().error("cluster worker kill error: %s", e)
+        self._processes.clear()
+
+
+def run(target, *args, **kwargs):
+    workers = kwargs.pop("workers", None)
+    return Cluster(target, args, kwargs, workers=workers).start()
@@ -11,7 +11,14 @@ def warp_coroutine(BaseDNSResolver):
             child_gr = greenlet.getcurrent()
             main = child_gr.parent
             assert main is not None, "must be running in async func"
-            self.resolve(hostname, lambda hostname, ip: child_gr.switch(ip), timeout)
-            return main.switch()
+            def on_resolve(hostname, ip):
+                if child_gr is not None:
+                    child_gr.switch(ip)
+
+            self.resolve(hostname, on_resolve, timeout)
+            try:
+                return main.switch()
+            finally:
+                child_gr = None
 
     return DNSResolver
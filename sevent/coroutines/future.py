@@ -110,8 +110,13 @@ class Future(object):
             child_gr = greenlet.getcurrent()
             main = child_gr.parent
             assert main is not None, "must be running in async func"
-            self._callbacks.append(lambda future: child_gr.switch())
-            main.switch()
+            callback = lambda future: child_gr.switch()
+            self._callbacks.append(callback)
+            try:
+                main.switch()
+            except BaseException:
+                self.remove_done_callback(callback)
+                raise
 
         result = self.result()
         e = StopIteration()
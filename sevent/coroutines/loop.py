@@ -2,60 +2,173 @@
 # 2020/5/8
 # create by: snower
 
+import os
 import types
+import functools
+import threading
 import greenlet
 from ..utils import get_logger
+from .future import Future
+
+try:
+    EXECUTOR_WORKERS = int(os.environ.get("SEVENT_EXECUTOR_WORKERS", 0))
+except:
+    EXECUTOR_WORKERS = 0
+
+try:
+    PROCESS_EXECUTOR_WORKERS = int(os.environ.get("SEVENT_PROCESS_EXECUTOR_WORKERS", 0))
+except:
+    PROCESS_EXECUTOR_WORKERS = 0
+
+try:
+    GREENLET_POOL_SIZE = int(os.environ.get("SEVENT_GREENLET_POOL_SIZE", 256))
+except:
+    GREENLET_POOL_SIZE = 256
+
+_thread_local = threading.local()
+_RESUME = object()
+
+
+class PooledGreenlet(greenlet.greenlet):
+    ''' runs async callbacks one after another, a greenlet that spawned others is not reused because its
+    children still switch back to it as their parent when they finish '''
+    reusable = True
+
+
+def _run_pooled(callback, args, kwargs):
+    child_gr = greenlet.getcurrent()
+    while True:
+        try:
+            g = callback if args is None else callback(*args, **kwargs)
+            g.send(None)
+            while True:
+                g.send(None)
+        except StopIteration:
+            pass
+        except Exception as e:
+            if isinstance(e, (KeyboardInterrupt, SystemError)):
+                raise e
+            get_logger().exception("loop callback error:%s", e)
+        callback = args = kwargs = g = None
+
+        if not child_gr.reusable:
+            return
+        try:
+            pool = _thread_local.greenlets
+        except AttributeError:
+            pool = _thread_local.greenlets = []
+        if len(pool) >= GREENLET_POOL_SIZE:
+            return
+        pool.append(child_gr)
+        try:
+            task = child_gr.parent.switch()
+            while task.__class__ is not tuple or len(task) != 4 or task[0] is not _RESUME:
+                task = child_gr.parent.switch(*task) if task.__class__ is tuple else child_gr.parent.switch(task)
+        except BaseException:
+            if child_gr in pool:
+                pool.remove(child_gr)
+            raise
+        _, callback, args, kwargs = task
+
+
+def _spawn(callback, args, kwargs):
+    current = greenlet.getcurrent()
+    if current.__class__ is PooledGreenlet:
+        current.reusable = False
+    try:
+        pool = _thread_local.greenlets
+    except AttributeError:
+        pool = _thread_local.greenlets = []
+    while pool:
+        child_gr = pool.pop()
+        try:
+            child_gr.parent = current
+        except ValueError:
+            continue
+        return child_gr.switch(_RESUME, callback, args, kwargs)
+    return PooledGreenlet(_run_pooled).switch(callback, args, kwargs)
+
+
+def spawn(callback, *args, **kwargs):
+    return _spawn(callback, args, kwargs)
 
 
 def warp_coroutine(BaseIOLoop):
     class IOLoop(BaseIOLoop):
         def call_async(self, callback, *args, **kwargs):
             if isinstance(callback, types.CoroutineType):
-                def run_coroutine_fuc(*args, **kwargs):
-                    def run_coroutine():
-                        try:
-                            callback.send(None)
-                            while True:
-                                callback.send(None)
-                        except StopIteration:
-                            return
-                        except Exception as e:
-                            if isinstance(e, (KeyboardInterrupt, SystemError)):
-                                raise e
-                            get_logger().exception("loop callback error:%s", e)
-
-                    child_gr = greenlet.greenlet(run_coroutine)
-                    return child_gr.switch()
-                return self._handlers.append((run_coroutine_fuc, args, kwargs))
+                return self.add_async(_spawn, callback, None, None)
 
             if callback.__code__.co_flags & 0x80 == 0:
-                return self._handlers.append((callback, args, kwargs))
-
-            def run_async_fuc(*args, **kwargs):
-                def run_async():
-                    try:
-                        g = callback(*args, **kwargs)
-                        g.send(None)
-                        while True:
-                            g.send(None)
-                    except StopIteration:
-                        return
-                    except Exception as e:
-                        if isinstance(e, (KeyboardInterrupt, SystemError)):
-                            raise e
-                        get_logger().exception("loop callback error:%s", e)
-                child_gr = greenlet.greenlet(run_async)
-                return child_gr.switch()
-            return self._handlers.append((run_async_fuc, args, kwargs))
+                return self.add_async(callback, *args, **kwargs)
+            return self.add_async(_spawn, callback, args, kwargs)
 
         go = call_async
 
+        _default_executor = None
+        _process_executor = None
+
+        def get_default_executor(self, process=False):
+            if process:
+                if self._process_executor is None:
+                    from concurrent.futures import ProcessPoolExecutor
+                    self._process_executor = ProcessPoolExecutor(PROCESS_EXECUTOR_WORKERS or None)
+                return self._process_executor
+
+            if self._default_executor is None:
+                from concurrent.futures import ThreadPoolExecutor
+                self._default_executor = ThreadPoolExecutor(EXECUTOR_WORKERS or min(32, (os.cpu_count() or 1) + 4),
+                                                            thread_name_prefix="sevent-executor")
+            return self._default_executor
+
+        def set_default_executor(self, executor, process=False):
+            if process:
+                self._process_executor = executor
+            else:
+                self._default_executor = executor
+
+        def shutdown_default_executor(self, wait=True):
+            executors, self._default_executor, self._process_executor = \
+                (self._default_executor, self._process_executor), None, None
+            for executor in executors:
+                if executor is not None:
+                    executor.shutdown(wait)
+
+        def run_in_executor(self, executor, callback, *args, **kwargs):
+            if executor is None:
+                executor = self.get_default_executor()
+            if kwargs:
+                callback, args = functools.partial(callback, *args, **kwargs), ()
+
+            future = Future()
+
+            def on_done(executor_future):
+                if future.done():
+                    return
+                if executor_future.cancelled():
+                    future.cancel()
+                    return
+                exception = executor_future.exception()
+                if exception is not None:
+                    future.set_exception(exception)
+                else:
+                    future.set_result(executor_future.result())
+
+            executor_future = executor.submit(callback, *args)
+            future.add_done_callback(lambda f: f.cancelled() and executor_future.cancel())
+            executor_future.add_done_callback(lambda f: self.add_async_safe(on_done, f))
+            return future
+
         async def sleep(self, seconds):
             child_gr = greenlet.getcurrent()
             main = child_gr.parent
             assert main is not None, "must be running in async func"
-            self.add_timeout(seconds, child_gr.switch)
-            return main.switch()
+            handler = self.add_timeout(seconds, child_gr.switch)
+            try:
+                return main.switch()
+            except BaseException:
+                self.cancel_timeout(handler)
+                raise
 
         def run(self, callback, *args, **kwargs):
             if isinstance(callback, types.CoroutineType):
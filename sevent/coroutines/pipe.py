@@ -93,7 +93,12 @@ def warp_coroutine(BaseSocket, BaseServer):
 
             self.on("connect", self._on_connect_handle)
             self.connect(address, timeout)
-            return main.switch()
+            try:
+                return main.switch()
+            finally:
+                if self._connect_greenlet is not None:
+                    self.off("connect", self._on_connect_handle)
+                    self._connect_greenlet = None
 
         async def send(self, data):
             assert self._send_greenlet is None, "already sending"
@@ -111,7 +116,12 @@ def warp_coroutine(BaseSocket, BaseServer):
             main = self._send_greenlet.parent
             assert main is not None, "must be running in async func"
             self.on("drain", self._on_send_handle)
-            return main.switch()
+            try:
+                return main.switch()
+            finally:
+                if self._send_greenlet is not None:
+                    self.off("drain", self._on_send_handle)
+                    self._send_greenlet = None
 
         async def recv(self, size=0):
             assert self._recv_greenlet is None, "already recving"
@@ -142,12 +152,18 @@ def warp_coroutine(BaseSocket, BaseServer):
                     if self._rbuffers._len > self._rbuffers._drain_size and not self._rbuffers._full:
                         self._rbuffers.do_drain()
                     self._recv_size = 0
+                    if self._recv_greenlet is not None:
+                        self.off("data", self._on_recv_handle)
+                        self._recv_greenlet = None
             try:
                 if self._rbuffers._full:
                     self._rbuffers.do_regain()
                 return main.switch()
             finally:
                 self._recv_size = 0
+                if self._recv_greenlet is not None:
+                    self.off("data", self._on_recv_handle)
+                    self._recv_greenlet = None
 
         async def closeof(self):
             if self._state == STATE_CLOSED:
@@ -157,9 +173,14 @@ def warp_coroutine(BaseSocket, BaseServer):
             main = child_gr.parent
             assert main is not None, "must be running in async func"
 
-            self.on("close", lambda socket: child_gr.switch())
+            on_close = lambda socket: child_gr.switch()
+            self.on("close", on_close)
             self.end()
-            return main.switch()
+            try:
+                return main.switch()
+            except BaseException:
+                self.off("close", on_close)
+                raise
 
         async def linkof(self, socket):
             assert self._connect_greenlet is None, "already connecting"
@@ -192,7 +213,12 @@ def warp_coroutine(BaseSocket, BaseServer):
             self.on("close", do_closed)
             socket.on("close", do_closed)
             BaseSocket.link(self, socket)
-            return main.switch()
+            try:
+                return main.switch()
+            except BaseException:
+                self.off("close", do_closed)
+                socket.off("close", do_closed)
+                raise
 
         async def join(self):
             if self._state == STATE_CLOSED:
@@ -202,8 +228,13 @@ def warp_coroutine(BaseSocket, BaseServer):
             main = child_gr.parent
             assert main is not None, "must be running in async func"
 
-            self.on("close", lambda socket: child_gr.switch())
-            return main.switch()
+            on_close = lambda socket: child_gr.switch()
+            self.on("close", on_close)
+            try:
+                return main.switch()
+            except BaseException:
+                self.off("close", on_close)
+                raise
 
     class PipeServer(BaseServer):
         _listen_greenlet = None
@@ -261,7 +292,12 @@ def warp_coroutine(BaseSocket, BaseServer):
 
             self.on("listen", self._on_listen_handle)
             self.listen(address, backlog)
-            return main.switch()
+            try:
+                return main.switch()
+            finally:
+                if self._listen_greenlet is not None:
+                    self.off("listen", self._on_listen_handle)
+                    self._listen_greenlet = None
 
         async def accept(self):
             assert self._accept_greenlet is None, "already accepting"
@@ -277,7 +313,12 @@ def warp_coroutine(BaseSocket, BaseServer):
             assert main is not None, "must be running in async func"
 
             self.on("connection", self._on_accept_handle)
-            return main.switch()
+            try:
+                return main.switch()
+            finally:
+                if self._accept_greenlet is not None:
+                    self.off("connection", self._on_accept_handle)
+                    self._accept_greenlet = None
 
         async def closeof(self):
             if self._state == STATE_CLOSED:
@@ -287,9 +328,14 @@ def warp_coroutine(BaseSocket, BaseServer):
             main = child_gr.parent
             assert main is not None, "must be running in async func"
 
-            self.on("close", lambda server: child_gr.switch())
+            on_close = lambda server: child_gr.switch()
+            self.on("close", on_close)
             self.close()
-            return main.switch()
+            try:
+                return main.switch()
+            except BaseException:
+                self.off("close", on_close)
+                raise
 
         async def join(self):
             if self._state == STATE_CLOSED:
@@ -299,7 +345,12 @@ def warp_coroutine(BaseSocket, BaseServer):
             main = child_gr.parent
             assert main is not None, "must be running in async func"
 
-            self.on("close", lambda server: child_gr.switch())
-            return main.switch()
+            on_close = lambda server: child_gr.switch()
+            self.on("close", on_close)
+            try:
+                return main.switch()
+            except BaseException:
+                self.off("close", on_close)
+                raise
 
     return PipeSocket, PipeServer
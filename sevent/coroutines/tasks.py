@@ -0,0 +1,250 @@
+# -*- coding: utf-8 -*-
+# 2026/10/17
+# create by: snower
+
+import types
+import greenlet
+from ..loop import current
+from ..errors import WaitTimeout
+from .future import Future, CancelledError, _PENDING
+from .loop import spawn, PooledGreenlet
+
+
+def _throw_cancel(child_gr):
+    if child_gr is None or child_gr.dead:
+        return
+    if child_gr.__class__ is PooledGreenlet:
+        child_gr.reusable = False
+    child_gr.throw(CancelledError())
+
+
+class Task(Future):
+    ''' runs a coroutine in its own greenlet, cancel throws CancelledError into it from the loop '''
+
+    def __init__(self, coroutine, loop=None):
+        Future.__init__(self)
+        self._loop = loop or current()
+        self._coroutine = coroutine
+        self._greenlet = None
+        self._loop.add_async(spawn, self._run)
+
+    async def _run(self):
+        if self._state != _PENDING:
+            self._coroutine.close()
+            return
+
+        self._greenlet = greenlet.getcurrent()
+        try:
+            result = await self._coroutine
+        except CancelledError:
+            Future.cancel(self)
+        except Exception as e:
+            if self._state == _PENDING:
+                self.set_exception(e)
+        else:
+            if self._state == _PENDING:
+                self.set_result(result)
+        finally:
+            self._greenlet = None
+
+    def _schedule_callbacks(self):
+        if self._callbacks:
+            self._loop.add_async(Future._schedule_callbacks, self)
+
+    def cancel(self):
+        if self._state != _PENDING:
+            return False
+        if self._greenlet is None:
+            return Future.cancel(self)
+        self._loop.add_async(self._do_cancel)
+        return True
+
+    def _do_cancel(self):
+        if self._state == _PENDING:
+            _throw_cancel(self._greenlet)
+
+
+def ensure_future(aw, loop=None):
+    if isinstance(aw, Future):
+        return aw
+    if isinstance(aw, types.CoroutineType):
+        return Task(aw, loop)
+    code = getattr(aw, "__code__", None)
+    if code is not None and code.co_flags & 0x80:
+        return Task(aw(), loop)
+    raise TypeError("a Future, coroutine or async function is required, got %r" % aw)
+
+
+def create_task(callback, *args, **kwargs):
+    if isinstance(callback, types.CoroutineType):
+        return Task(callback)
+    return Task(callback(*args, **kwargs))
+
+
+class _Waiter(object):
+    def __init__(self, futures, check, loop=None):
+        self._loop = loop or current()
+        self._futures = futures
+        self._check = check
+        self._greenlet = None
+
+    def wait(self, timeout=None):
+        if self._check():
+            return True
+
+        self._greenlet = greenlet.getcurrent()
+        main = self._greenlet.parent
+        assert main is not None, "must be running in async func"
+
+        for future in self._futures:
+            future.add_done_callback(self._on_done)
+        handler = self._loop.add_timeout(timeout, self._on_timeout) if timeout is not None else None
+        try:
+            return main.switch()
+        finally:
+            self._greenlet = None
+            if handler is not None:
+                self._loop.cancel_timeout(handler)
+            for future in self._futures:
+                future.remove_done_callback(self._on_done)
+
+    def _on_done(self, future):
+        if self._greenlet is None or not self._check():
+            return
+        child_gr, self._greenlet = self._greenlet, None
+        if greenlet.getcurrent().parent is None:
+            child_gr.switch(True)
+        else:
+            self._loop.add_async(child_gr.switch, True)
+
+    def _on_timeout(self):
+        if self._greenlet is None:
+            return
+        child_gr, self._greenlet = self._greenlet, None
+        child_gr.switch(False)
+
+
+def _cancel_wait(futures):
+    for future in futures:
+        future.cancel()
+    _Waiter(futures, lambda: all(future.done() for future in futures)).wait()
+
+
+async def gather(*aws, return_exceptions=False):
+    futures = [ensure_future(aw) for aw in aws]
+
+    def check():
+        done = True
+        for future in futures:
+            if not future.done():
+                done = False
+            elif not return_exceptions and (future.cancelled() or future.exception() is not None):
+                return True
+        return done
+
+    try:
+        _Waiter(futures, check).wait()
+    except BaseException:
+        for future in futures:
+            future.cancel()
+        raise
+
+    results = []
+    for future in futures:
+        if not future.done():
+            continue
+        if future.cancelled():
+            exception = CancelledError()
+        else:
+            exception = future.exception()
+        if exception is None:
+            results.append(future.result())
+        elif return_exceptions:
+            results.append(exception)
+        else:
+            for pending_future in futures:
+                pending_future.cancel()
+            raise exception
+    return results
+
+
+async def wait_for(aw, timeout):
+    future = ensure_future(aw)
+    try:
+        done = _Waiter([future], future.done).wait(timeout)
+    except BaseException:
+        future.cancel()
+        raise
+    if not done:
+        _cancel_wait([future])
+        raise WaitTimeout()
+    return future.result()
+
+
+async def wait_any(*aws, timeout=None, cancel_pending=False):
+    ''' waits for the first done of aws, returns (done future, pending futures) '''
+    futures = [ensure_future(aw) for aw in aws]
+    if not futures:
+        raise ValueError("aws is empty")
+
+    try:
+        done = _Waiter(futures, lambda: any(future.done() for future in futures)).wait(timeout)
+    except BaseException:
+        for future in futures:
+            future.cancel()
+        raise
+    if not done:
+        if cancel_pending:
+            _cancel_wait(futures)
+        raise WaitTimeout()
+
+    done_future = None
+    pending_futures = []
+    for future in futures:
+        if done_future is None and future.done():
+            done_future = future
+        else:
+            pending_futures.append(future)
+    if cancel_pending:
+        _cancel_wait(pending_futures)
+        return done_future, []
+    return done_future, pending_futures
+
+
+class CancelScope(object):
+    ''' with CancelScope(timeout) as scope: cancel() or the timeout throws CancelledError into the greenlet
+    running the block, it is swallowed on leaving the block and cancelled_caught is set '''
+
+    def __init__(self, timeout=None, loop=None):
+        self._loop = loop or current()
+        self.timeout = timeout
+        self.cancel_called = False
+        self.cancelled_caught = False
+        self._greenlet = None
+        self._handler = None
+
+    def __enter__(self):
+        self._greenlet = greenlet.getcurrent()
+        assert self._greenlet.parent is not None, "must be running in async func"
+        if self.timeout is not None:
+            self._handler = self._loop.add_timeout(self.timeout, self.cancel)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if self._handler is not None:
+            self._loop.cancel_timeout(self._handler)
+            self._handler = None
+        self._greenlet = None
+        if self.cancel_called and exc_type is not None and issubclass(exc_type, CancelledError):
+            self.cancelled_caught = True
+            return True
+        return False
+
+    def cancel(self):
+        if self.cancel_called or self._greenlet is None:
+            return
+        self.cancel_called = True
+        self._loop.add_async(self._do_cancel)
+
+    def _do_cancel(self):
+        _throw_cancel(self._greenlet)
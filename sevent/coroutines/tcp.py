@@ -3,7 +3,7 @@
 # create by: snower
 
 import greenlet
-from ..errors import SocketClosed
+from ..errors import SocketClosed, RecvLimitOverrun
 
 STATE_INITIALIZED = 0x01
 STATE_CONNECTING = 0x02
@@ -93,7 +93,12 @@ def warp_coroutine(BaseSocket, BaseServer, BaseWarpSocket, BaseWarpServer):
 
             self.on("connect", self._on_connect_handle)
             self.connect(address, timeout)
-            return main.switch()
+            try:
+                return main.switch()
+            finally:
+                if self._connect_greenlet is not None:
+                    self.off("connect", self._on_connect_handle)
+                    self._connect_greenlet = None
 
         async def send(self, data):
             assert self._send_greenlet is None, "already sending"
@@ -111,7 +116,12 @@ def warp_coroutine(BaseSocket, BaseServer, BaseWarpSocket, BaseWarpServer):
             main = self._send_greenlet.parent
             assert main is not None, "must be running in async func"
             self.on("drain", self._on_send_handle)
-            return main.switch()
+            try:
+                return main.switch()
+            finally:
+                if self._send_greenlet is not None:
+                    self.off("drain", self._on_send_handle)
+                    self._send_greenlet = None
 
         async def recv(self, size=0):
             assert self._recv_greenlet is None, "already recving"
@@ -143,12 +153,38 @@ def warp_coroutine(BaseSocket, BaseServer, BaseWarpSocket, BaseWarpServer):
                     if self._rbuffers._len > self._rbuffers._drain_size and not self._rbuffers._full:
                         self._rbuffers.do_drain()
                     self._recv_size = 0
+                    if self._recv_greenlet is not None:
+                        self.off("data", self._on_recv_handle)
+                        self._recv_greenlet = None
             try:
                 if self._rbuffers._full:
                     self._rbuffers.do_regain()
                 return main.switch()
             finally:
                 self._recv_size = 0
+                if self._recv_greenlet is not None:
+                    self.off("data", self._on_recv_handle)
+                    self._recv_greenlet = None
+
+        async def recv_until(self, sep, max_size=65536):
+            start = 0
+            while True:
+                index = self._rbuffers.find(sep, start)
+                if index >= 0:
+                    if max_size and index + len(sep) > max_size:
+                        raise RecvLimitOverrun()
+                    return self._rbuffers.read(index + len(sep))
+                buffer_len = len(self._rbuffers)
+                if max_size and buffer_len >= max_size:
+                    raise RecvLimitOverrun()
+                start = max(buffer_len - len(sep) + 1, 0)
+                await self.recv(buffer_len + 1)
+
+        async def recv_exactly(self, size):
+            if size <= 0:
+                return b''
+            buffer = await self.recv(size)
+            return buffer.read(size)
 
         async def closeof(self):
             if self._state == STATE_CLOSED:
@@ -158,9 +194,14 @@ def warp_coroutine(BaseSocket, BaseServer, BaseWarpSocket, BaseWarpServer):
             main = child_gr.parent
             assert main is not None, "must be running in async func"
 
-            self.on("close", lambda socket: child_gr.switch())
+            on_close = lambda socket: child_gr.switch()
+            self.on("close", on_close)
             self.end()
-            return main.switch()
+            try:
+                return main.switch()
+            except BaseException:
+                self.off("close", on_close)
+                raise
 
         async def linkof(self, socket):
             assert self._connect_greenlet is None, "already connecting"
@@ -193,7 +234,12 @@ def warp_coroutine(BaseSocket, BaseServer, BaseWarpSocket, BaseWarpServer):
             self.on("close", do_closed)
             socket.on("close", do_closed)
             self.link(socket)
-            return main.switch()
+            try:
+                return main.switch()
+            except BaseException:
+                self.off("close", do_closed)
+                socket.off("close", do_closed)
+                raise
 
         async def join(self):
             if self._state == STATE_CLOSED:
@@ -203,8 +249,13 @@ def warp_coroutine(BaseSocket, BaseServer, BaseWarpSocket, BaseWarpServer):
             main = child_gr.parent
             assert main is not None, "must be running in async func"
 
-            self.on("close", lambda socket: child_gr.switch())
-            return main.switch()
+            on_close = lambda socket: child_gr.switch()
+            self.on("close", on_close)
+            try:
+                return main.switch()
+            except BaseException:
+                self.off("close", on_close)
+                raise
 
     class Server(BaseServer):
         _listen_greenlet = None
@@ -262,7 +313,12 @@ def warp_coroutine(BaseSocket, BaseServer, BaseWarpSocket, BaseWarpServer):
 
             self.on("listen", self._on_listen_handle)
             self.listen(address, backlog)
-            return main.switch()
+            try:
+                return main.switch()
+            finally:
+                if self._listen_greenlet is not None:
+                    self.off("listen", self._on_listen_handle)
+                    self._listen_greenlet = None
 
         async def accept(self):
             assert self._accept_greenlet is None, "already accepting"
@@ -278,7 +334,12 @@ def warp_coroutine(BaseSocket, BaseServer, BaseWarpSocket, BaseWarpServer):
             assert main is not None, "must be running in async func"
 
             self.on("connection", self._on_accept_handle)
-            return main.switch()
+            try:
+                return main.switch()
+            finally:
+                if self._accept_greenlet is not None:
+                    self.off("connection", self._on_accept_handle)
+                    self._accept_greenlet = None
 
         async def closeof(self):
             if self._state == STATE_CLOSED:
@@ -288,9 +349,14 @@ def warp_coroutine(BaseSocket, BaseServer, BaseWarpSocket, BaseWarpServer):
             main = child_gr.parent
             assert main is not None, "must be running in async func"
 
-            self.on("close", lambda server: child_gr.switch())
+            on_close = lambda server: child_gr.switch()
+            self.on("close", on_close)
             self.close()
-            return main.switch()
+            try:
+                return main.switch()
+            except BaseException:
+                self.off("close", on_close)
+                raise
 
         async def join(self):
             if self._state == STATE_CLOSED:
@@ -300,8 +366,13 @@ def warp_coroutine(BaseSocket, BaseServer, BaseWarpSocket, BaseWarpServer):
             main = child_gr.parent
             assert main is not None, "must be running in async func"
 
-            self.on("close", lambda server: child_gr.switch())
-            return main.switch()
+            on_close = lambda server: child_gr.switch()
+            self.on("close", on_close)
+            try:
+                return main.switch()
+            except BaseException:
+                self.off("close", on_close)
+                raise
 
 
     class WarpSocket(BaseWarpSocket, Socket):
@@ -73,7 +73,12 @@ def warp_coroutine(BaseSocket, BaseServer):
             main = self._send_greenlet.parent
             assert main is not None, "must be running in async func"
             self.on("drain", self._on_send_handle)
-            return main.switch()
+            try:
+                return main.switch()
+            finally:
+                if self._send_greenlet is not None:
+                    self.off("drain", self._on_send_handle)
+                    self._send_greenlet = None
 
         async def recvfrom(self, size=0):
             assert self._recv_greenlet is None, "already recving"
@@ -103,9 +108,17 @@ def warp_coroutine(BaseSocket, BaseServer):
                     self._rbuffers._drain_size = drain_size
                     if self._rbuffers._len > self._rbuffers._drain_size and not self._rbuffers._full:
                         self._rbuffers.do_drain()
-            if self._rbuffers._full:
-                self._rbuffers.do_regain()
-            return main.switch()
+                    if self._recv_greenlet is not None:
+                        self.off("data", self._on_recv_handle)
+                        self._recv_greenlet = None
+            try:
+                if self._rbuffers._full:
+                    self._rbuffers.do_regain()
+                return main.switch()
+            finally:
+                if self._recv_greenlet is not None:
+                    self.off("data", self._on_recv_handle)
+                    self._recv_greenlet = None
 
         async def closeof(self):
             if self._state == STATE_CLOSED:
@@ -115,9 +128,14 @@ def warp_coroutine(BaseSocket, BaseServer):
             main = child_gr.parent
             assert main is not None, "must be running in async func"
 
-            self.on("close", lambda socket: child_gr.switch())
+            on_close = lambda socket: child_gr.switch()
+            self.on("close", on_close)
             self.end()
-            return main.switch()
+            try:
+                return main.switch()
+            except BaseException:
+                self.off("close", on_close)
+                raise
 
         @classmethod
         async def linkof(cls, socket, address, timeout=900):
@@ -143,7 +161,11 @@ def warp_coroutine(BaseSocket, BaseServer):
 
             socket.on("close", do_closed)
             BaseSocket.link(socket, address, timeout)
-            return main.switch()
+            try:
+                return main.switch()
+            except BaseException:
+                socket.off("close", do_closed)
+                raise
 
         async def join(self):
             if self._state == STATE_CLOSED:
@@ -153,8 +175,13 @@ def warp_coroutine(BaseSocket, BaseServer):
             main = child_gr.parent
             assert main is not None, "must be running in async func"
 
-            self.on("close", lambda socket: child_gr.switch())
-            return main.switch()
+            on_close = lambda socket: child_gr.switch()
+            self.on("close", on_close)
+            try:
+                return main.switch()
+            except BaseException:
+                self.off("close", on_close)
+                raise
 
     class Server(BaseServer, Socket):
         _bind_greenlet = None
@@ -197,6 +224,11 @@ def warp_coroutine(BaseSocket, BaseServer):
 
             self.on("bind", self._on_bind_handle)
             self.bind(address)
-            return main.switch()
+            try:
+                return main.switch()
+            finally:
+                if self._bind_greenlet is not None:
+                    self.off("bind", self._on_bind_handle)
+                    self._bind_greenlet = None
 
     return Socket, Server
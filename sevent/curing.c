@@ -0,0 +1,569 @@
+#include <Python.h>
+#include <structmember.h>
+#include <errno.h>
+#include <poll.h>
+#include <signal.h>
+#include <stdint.h>
+#include <string.h>
+#include <time.h>
+#include <unistd.h>
+#include <sys/mman.h>
+#include <sys/syscall.h>
+#include <linux/io_uring.h>
+
+#if PY_MAJOR_VERSION >= 3
+#define PyInt_FromLong PyLong_FromLong
+#endif
+
+#ifndef __NR_io_uring_setup
+#define __NR_io_uring_setup 425
+#endif
+#ifndef __NR_io_uring_enter
+#define __NR_io_uring_enter 426
+#endif
+
+#define RING_REMOVE_USER_DATA ((uint64_t)-1)
+#define RING_MAKE_USER_DATA(fd, gen) (((uint64_t)(gen) << 32) | (uint32_t)(fd))
+
+#define load_acquire(p) __atomic_load_n(p, __ATOMIC_ACQUIRE)
+#define store_release(p, v) __atomic_store_n(p, v, __ATOMIC_RELEASE)
+
+typedef struct {
+    PyObject_HEAD
+    int ring_fd;
+    unsigned int features;
+
+    void *sq_ring;
+    size_t sq_ring_size;
+    void *cq_ring;
+    size_t cq_ring_size;
+    struct io_uring_sqe *sqes;
+    size_t sqes_size;
+
+    unsigned int *sq_head;
+    unsigned int *sq_tail;
+    unsigned int *sq_mask;
+    unsigned int *sq_array;
+    unsigned int sq_entries;
+    unsigned int sq_pending;
+
+    unsigned int *cq_head;
+    unsigned int *cq_tail;
+    unsigned int *cq_mask;
+    struct io_uring_cqe *cqes;
+
+    uint32_t *fd_gens;
+    uint32_t *fd_modes;
+    int fd_size;
+} RingObject;
+
+static int
+io_uring_setup(unsigned int entries, struct io_uring_params *p) {
+    return (int) syscall(__NR_io_uring_setup, entries, p);
+}
+
+static int
+io_uring_enter(int fd, unsigned int to_submit, unsigned int min_complete, unsigned int flags, void *arg, size_t argsz) {
+    return (int) syscall(__NR_io_uring_enter, fd, to_submit, min_complete, flags, arg, argsz);
+}
+
+static void
+Ring_unmap(RingObject *self) {
+    if(self->sqes != NULL && self->sqes != MAP_FAILED) {
+        munmap(self->sqes, self->sqes_size);
+    }
+    if(self->cq_ring != NULL && self->cq_ring != MAP_FAILED && self->cq_ring != self->sq_ring) {
+        munmap(self->cq_ring, self->cq_ring_size);
+    }
+    if(self->sq_ring != NULL && self->sq_ring != MAP_FAILED) {
+        munmap(self->sq_ring, self->sq_ring_size);
+    }
+    self->sqes = NULL;
+    self->cq_ring = NULL;
+    self->sq_ring = NULL;
+}
+
+static void
+Ring_dealloc(RingObject *self) {
+    Ring_unmap(self);
+    if(self->ring_fd >= 0) {
+        close(self->ring_fd);
+        self->ring_fd = -1;
+    }
+    if(self->fd_gens != NULL) {
+        PyMem_Free(self->fd_gens);
+        self->fd_gens = NULL;
+    }
+    if(self->fd_modes != NULL) {
+        PyMem_Free(self->fd_modes);
+        self->fd_modes = NULL;
+    }
+    Py_TYPE(self)->tp_free((PyObject *)self);
+}
+
+static PyObject *
+Ring_new(PyTypeObject *type, PyObject *args, PyObject *kwds) {
+    RingObject *self = (RingObject *)type->tp_alloc(type, 0);
+    if(self == NULL) {
+        return NULL;
+    }
+    self->ring_fd = -1;
+    return (PyObject *)self;
+}
+
+static int
+Ring_init(RingObject *self, PyObject *args, PyObject *kwargs) {
+    unsigned int entries = 1024;
+    if (!PyArg_ParseTuple(args, "|I", &entries)) {
+        return -1;
+    }
+
+    struct io_uring_params params;
+    memset(&params, 0, sizeof(params));
+    params.flags = IORING_SETUP_CQSIZE;
+    params.cq_entries = entries * 4;
+
+    int ring_fd = io_uring_setup(entries, &params);
+    if(ring_fd < 0) {
+        PyErr_SetFromErrno(PyExc_OSError);
+        return -1;
+    }
+    self->ring_fd = ring_fd;
+    self->features = params.features;
+
+    if(!(params.features & IORING_FEAT_EXT_ARG)) {
+        errno = ENOSYS;
+        PyErr_SetFromErrno(PyExc_OSError);
+        return -1;
+    }
+
+    self->sq_ring_size = params.sq_off.array + params.sq_entries * sizeof(unsigned int);
+    self->cq_ring_size = params.cq_off.cqes + params.cq_entries * sizeof(struct io_uring_cqe);
+    if(params.features & IORING_FEAT_SINGLE_MMAP) {
+        if(self->cq_ring_size > self->sq_ring_size) {
+            self->sq_ring_size = self->cq_ring_size;
+        }
+        self->cq_ring_size = self->sq_ring_size;
+    }
+
+    self->sq_ring = mmap(NULL, self->sq_ring_size, PROT_READ | PROT_WRITE, MAP_SHARED | MAP_POPULATE, ring_fd, IORING_OFF_SQ_RING);
+    if(self->sq_ring == MAP_FAILED) {
+        PyErr_SetFromErrno(PyExc_OSError);
+        return -1;
+    }
+    if(params.features & IORING_FEAT_SINGLE_MMAP) {
+        self->cq_ring = self->sq_ring;
+    } else {
+        self->cq_ring = mmap(NULL, self->cq_ring_size, PROT_READ | PROT_WRITE, MAP_SHARED | MAP_POPULATE, ring_fd, IORING_OFF_CQ_RING);
+        if(self->cq_ring == MAP_FAILED) {
+            PyErr_SetFromErrno(PyExc_OSError);
+            return -1;
+        }
+    }
+    self->sqes_size = params.sq_entries * sizeof(struct io_uring_sqe);
+    self->sqes = (struct io_uring_sqe *)mmap(NULL, self->sqes_size, PROT_READ | PROT_WRITE, MAP_SHARED | MAP_POPULATE, ring_fd, IORING_OFF_SQES);
+    if(self->sqes == MAP_FAILED) {
+        PyErr_SetFromErrno(PyExc_OSError);
+        return -1;
+    }
+
+    self->sq_head = (unsigned int *)((char *)self->sq_ring + params.sq_off.head);
+    self->sq_tail = (unsigned int *)((char *)self->sq_ring + params.sq_off.tail);
+    self->sq_mask = (unsigned int *)((char *)self->sq_ring + params.sq_off.ring_mask);
+    self->sq_array = (unsigned int *)((char *)self->sq_ring + params.sq_off.array);
+    self->sq_entries = params.sq_entries;
+    self->sq_pending = 0;
+
+    self->cq_head = (unsigned int *)((char *)self->cq_ring + params.cq_off.head);
+    self->cq_tail = (unsigned int *)((char *)self->cq_ring + params.cq_off.tail);
+    self->cq_mask = (unsigned int *)((char *)self->cq_ring + params.cq_off.ring_mask);
+    self->cqes = (struct io_uring_cqe *)((char *)self->cq_ring + params.cq_off.cqes);
+    return 0;
+}
+
+static int
+Ring_submit(RingObject *self, unsigned int min_complete, unsigned int flags, struct io_uring_getevents_arg *arg) {
+    int result;
+    unsigned int to_submit = self->sq_pending;
+
+    Py_BEGIN_ALLOW_THREADS
+    result = io_uring_enter(self->ring_fd, to_submit, min_complete, flags, arg, arg != NULL ? sizeof(*arg) : 0);
+    Py_END_ALLOW_THREADS
+
+    if(result >= 0) {
+        self->sq_pending -= (unsigned int)result > to_submit ? to_submit : (unsigned int)result;
+    }
+    return result;
+}
+
+static struct io_uring_sqe *
+Ring_get_sqe(RingObject *self) {
+    unsigned int tail = *self->sq_tail;
+    if(tail - load_acquire(self->sq_head) >= self->sq_entries) {
+        if(Ring_submit(self, 0, 0, NULL) < 0 && errno != EBUSY && errno != EAGAIN && errno != EINTR) {
+            PyErr_SetFromErrno(PyExc_OSError);
+            return NULL;
+        }
+        if(tail - load_acquire(self->sq_head) >= self->sq_entries) {
+            errno = EBUSY;
+            PyErr_SetFromErrno(PyExc_OSError);
+            return NULL;
+        }
+    }
+
+    unsigned int index = tail & *self->sq_mask;
+    struct io_uring_sqe *sqe = &self->sqes[index];
+    memset(sqe, 0, sizeof(struct io_uring_sqe));
+    self->sq_array[index] = index;
+    store_release(self->sq_tail, tail + 1);
+    self->sq_pending++;
+    return sqe;
+}
+
+static int
+Ring_queue_poll_add(RingObject *self, int fd) {
+    struct io_uring_sqe *sqe = Ring_get_sqe(self);
+    if(sqe == NULL) {
+        return -1;
+    }
+    sqe->opcode = IORING_OP_POLL_ADD;
+    sqe->fd = fd;
+    sqe->poll32_events = self->fd_modes[fd];
+    sqe->user_data = RING_MAKE_USER_DATA(fd, self->fd_gens[fd]);
+    return 0;
+}
+
+static int
+Ring_queue_poll_remove(RingObject *self, int fd) {
+    struct io_uring_sqe *sqe = Ring_get_sqe(self);
+    if(sqe == NULL) {
+        return -1;
+    }
+    sqe->opcode = IORING_OP_POLL_REMOVE;
+    sqe->fd = -1;
+    sqe->addr = RING_MAKE_USER_DATA(fd, self->fd_gens[fd]);
+    sqe->user_data = RING_REMOVE_USER_DATA;
+    return 0;
+}
+
+static int
+Ring_reserve_fd(RingObject *self, int fd) {
+    if(fd < 0) {
+        errno = EBADF;
+        PyErr_SetFromErrno(PyExc_OSError);
+        return -1;
+    }
+    if(fd < self->fd_size) {
+        return 0;
+    }
+
+    int fd_size = self->fd_size > 0 ? self->fd_size : 1024;
+    while(fd_size <= fd) {
+        if(fd_size > INT_MAX / 2) {
+            fd_size = INT_MAX;
+            break;
+        }
+        fd_size *= 2;
+    }
+
+    uint32_t *fd_gens = (uint32_t *)PyMem_Realloc(self->fd_gens, fd_size * sizeof(uint32_t));
+    if(fd_gens == NULL) {
+        PyErr_NoMemory();
+        return -1;
+    }
+    memset(fd_gens + self->fd_size, 0, (fd_size - self->fd_size) * sizeof(uint32_t));
+    self->fd_gens = fd_gens;
+
+    uint32_t *fd_modes = (uint32_t *)PyMem_Realloc(self->fd_modes, fd_size * sizeof(uint32_t));
+    if(fd_modes == NULL) {
+        PyErr_NoMemory();
+        return -1;
+    }
+    memset(fd_modes + self->fd_size, 0, (fd_size - self->fd_size) * sizeof(uint32_t));
+    self->fd_modes = fd_modes;
+    self->fd_size = fd_size;
+    return 0;
+}
+
+static PyObject *
+Ring_register(RingObject *self, PyObject *args) {
+    int fd;
+    unsigned int mode = POLLIN | POLLOUT;
+    if (!PyArg_ParseTuple(args, "i|I", &fd, &mode)) {
+        return NULL;
+    }
+    if(Ring_reserve_fd(self, fd) != 0) {
+        return NULL;
+    }
+
+    if(self->fd_modes[fd] != 0) {
+        if(Ring_queue_poll_remove(self, fd) != 0) {
+            return NULL;
+        }
+    }
+    self->fd_gens[fd]++;
+    self->fd_modes[fd] = mode | POLLERR | POLLHUP;
+    if(Ring_queue_poll_add(self, fd) != 0) {
+        self->fd_modes[fd] = 0;
+        return NULL;
+    }
+    Py_RETURN_NONE;
+}
+
+static PyObject *
+Ring_unregister(RingObject *self, PyObject *args) {
+    int fd;
+    if (!PyArg_ParseTuple(args, "i", &fd)) {
+        return NULL;
+    }
+    if(fd < 0 || fd >= self->fd_size || self->fd_modes[fd] == 0) {
+        errno = ENOENT;
+        return PyErr_SetFromErrno(PyExc_OSError);
+    }
+
+    if(Ring_queue_poll_remove(self, fd) != 0) {
+        return NULL;
+    }
+    self->fd_gens[fd]++;
+    self->fd_modes[fd] = 0;
+
+    /* an armed poll holds the file open, submit now so a following close releases it like epoll */
+    if(Ring_submit(self, 0, 0, NULL) < 0 && errno != EBUSY && errno != EAGAIN && errno != EINTR) {
+        return PyErr_SetFromErrno(PyExc_OSError);
+    }
+    Py_RETURN_NONE;
+}
+
+static PyObject *
+Ring_modify(RingObject *self, PyObject *args) {
+    int fd;
+    unsigned int mode;
+    if (!PyArg_ParseTuple(args, "iI", &fd, &mode)) {
+        return NULL;
+    }
+    if(fd < 0 || fd >= self->fd_size || self->fd_modes[fd] == 0) {
+        errno = ENOENT;
+        return PyErr_SetFromErrno(PyExc_OSError);
+    }
+    if(self->fd_modes[fd] == (mode | POLLERR | POLLHUP)) {
+        Py_RETURN_NONE;
+    }
+
+    if(Ring_queue_poll_remove(self, fd) != 0) {
+        return NULL;
+    }
+    self->fd_gens[fd]++;
+    self->fd_modes[fd] = mode | POLLERR | POLLHUP;
+    if(Ring_queue_poll_add(self, fd) != 0) {
+        self->fd_modes[fd] = 0;
+        return NULL;
+    }
+    Py_RETURN_NONE;
+}
+
+static PyObject *
+Ring_poll(RingObject *self, PyObject *args) {
+    double timeout = -1;
+    if (!PyArg_ParseTuple(args, "|d", &timeout)) {
+        return NULL;
+    }
+
+    struct __kernel_timespec ts;
+    struct io_uring_getevents_arg arg;
+    memset(&arg, 0, sizeof(arg));
+    unsigned int flags = IORING_ENTER_GETEVENTS | IORING_ENTER_EXT_ARG;
+    unsigned int min_complete = 1;
+    if(timeout >= 0) {
+        ts.tv_sec = (long long) timeout;
+        ts.tv_nsec = (long long) ((timeout - (double) ts.tv_sec) * 1e9);
+        arg.ts = (uint64_t)(uintptr_t)&ts;
+        if(timeout == 0) {
+            min_complete = 0;
+        }
+    }
+
+    if(load_acquire(self->cq_tail) != *self->cq_head) {
+        min_complete = 0;
+    }
+    if(min_complete > 0 || self->sq_pending > 0) {
+        if(Ring_submit(self, min_complete, min_complete > 0 ? flags : 0, min_complete > 0 ? &arg : NULL) < 0) {
+            if(errno == EINTR) {
+                if(PyErr_CheckSignals() != 0) {
+                    return NULL;
+                }
+            } else if(errno != ETIME && errno != EBUSY && errno != EAGAIN) {
+                return PyErr_SetFromErrno(PyExc_OSError);
+            }
+        }
+    }
+
+    PyObject *result = PyList_New(0);
+    if(result == NULL) {
+        return NULL;
+    }
+
+    unsigned int head = *self->cq_head;
+    unsigned int tail = load_acquire(self->cq_tail);
+    while(head != tail) {
+        struct io_uring_cqe *cqe = &self->cqes[head & *self->cq_mask];
+        uint64_t user_data = cqe->user_data;
+        int res = cqe->res;
+        head++;
+
+        if(user_data == RING_REMOVE_USER_DATA) {
+            continue;
+        }
+        int fd = (int)(uint32_t)user_data;
+        if(fd >= self->fd_size || self->fd_modes[fd] == 0 || self->fd_gens[fd] != (uint32_t)(user_data >> 32)) {
+            continue;
+        }
+
+        unsigned int mode;
+        if(res < 0) {
+            /* the poll is gone, report an error and wait for the owner to remove or modify it */
+            mode = POLLERR;
+        } else {
+            mode = (unsigned int) res;
+            /* oneshot poll, arm it again so readiness stays level triggered */
+            if(Ring_queue_poll_add(self, fd) != 0) {
+                store_release(self->cq_head, head);
+                Py_DECREF(result);
+                return NULL;
+            }
+        }
+
+        PyObject *item = Py_BuildValue("(iI)", fd, mode);
+        if(item == NULL || PyList_Append(result, item) != 0) {
+            Py_XDECREF(item);
+            store_release(self->cq_head, head);
+            Py_DECREF(result);
+            return NULL;
+        }
+        Py_DECREF(item);
+    }
+    store_release(self->cq_head, head);
+    return result;
+}
+
+static PyObject *
+Ring_fileno(RingObject *self, PyObject *args) {
+    return PyInt_FromLong(self->ring_fd);
+}
+
+static PyObject *
+Ring_close(RingObject *self, PyObject *args) {
+    Ring_unmap(self);
+    if(self->ring_fd >= 0) {
+        close(self->ring_fd);
+        self->ring_fd = -1;
+    }
+    Py_RETURN_NONE;
+}
+
+static PyMemberDef Ring_members[] = {
+        {"features", T_UINT, offsetof(RingObject, features), READONLY, "features"},
+        {NULL}  /* Sentinel */
+};
+
+static PyMethodDef Ring_methods[] = {
+        {"register", (PyCFunction)Ring_register, METH_VARARGS, "ring register"},
+        {"unregister", (PyCFunction)Ring_unregister, METH_VARARGS, "ring unregister"},
+        {"modify", (PyCFunction)Ring_modify, METH_VARARGS, "ring modify"},
+        {"poll", (PyCFunction)Ring_poll, METH_VARARGS, "ring poll"},
+        {"fileno", (PyCFunction)Ring_fileno, METH_NOARGS, "ring fileno"},
+        {"close", (PyCFunction)Ring_close, METH_NOARGS, "ring close"},
+        {NULL}  /* Sentinel */
+};
+
+static PyTypeObject RingType = {
+        PyVarObject_HEAD_INIT(&PyType_Type, 0)    /*ob_size*/
+        "curing.Ring",                            /*tp_name*/
+        sizeof(RingObject),                       /*tp_basicsize*/
+        0,                                        /*tp_itemsize*/
+        (destructor)Ring_dealloc,                 /*tp_dealloc*/
+        0,                                        /*tp_print*/
+        0,                                        /*tp_getattr*/
+        0,                                        /*tp_setattr*/
+        0,                                        /*tp_compare*/
+        0,                                        /*tp_repr*/
+        0,                                        /*tp_as_number*/
+        0,                                        /*tp_as_sequence*/
+        0,                                        /*tp_as_mapping*/
+        0,                                        /*tp_hash */
+        0,                                        /*tp_call*/
+        0,                                        /*tp_str*/
+        0,                                        /*tp_getattro*/
+        0,                                        /*tp_setattro*/
+        0,                                        /*tp_as_buffer*/
+        Py_TPFLAGS_DEFAULT,                       /*tp_flags*/
+        "io_uring poll objects",                  /* tp_doc */
+        0,                                        /* tp_traverse */
+        0,                                        /* tp_clear */
+        0,                                        /* tp_richcompare */
+        0,                                        /* tp_weaklistoffset */
+        0,                                        /* tp_iter */
+        0,                                        /* tp_iternext */
+        Ring_methods,                             /* tp_methods */
+        Ring_members,                             /* tp_members */
+        0,                                        /* tp_getset */
+        &PyBaseObject_Type,                       /* tp_base */
+        0,                                        /* tp_dict */
+        0,                                        /* tp_descr_get */
+        0,                                        /* tp_descr_set */
+        0,                                        /* tp_dictoffset */
+        (initproc)Ring_init,                      /* tp_init */
+        0,                                        /* tp_alloc */
+        Ring_new,                                 /* tp_new */
+};
+
+static PyMethodDef module_methods[] =
+{
+        {NULL, NULL, 0, NULL}
+};
+
+#if PY_MAJOR_VERSION >= 3
+static struct PyModuleDef curingmodule = {
+        PyModuleDef_HEAD_INIT,
+        "curing",
+        "curing",
+        -1,
+        module_methods,
+        NULL,
+        NULL,
+        NULL,
+        NULL
+};
+
+PyMODINIT_FUNC
+PyInit_curing() {
+    PyObject *m;
+    if (PyType_Ready(&RingType) < 0) {
+        return NULL;
+    }
+
+    m = PyModule_Create(&curingmodule);
+    if (m == NULL)
+        return NULL;
+
+    Py_INCREF((PyObject *)&RingType);
+    if (PyModule_AddObject(m, "Ring", (PyObject *)&RingType) != 0)
+        return NULL;
+    return m;
+}
+#else
+PyMODINIT_FUNC
+initcuring() {
+    PyObject *m;
+    if (PyType_Ready(&RingType) < 0) {
+        return;
+    }
+
+    m = Py_InitModule3("curing", module_methods, "curing");
+    if (m == NULL) {
+        return;
+    }
+
+    Py_INCREF((PyObject *)&RingType);
+    PyModule_AddObject(m, "Ring", (PyObject *)&RingType);
+}
+#endif
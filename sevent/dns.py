@@ -69,6 +69,10 @@ class DNSCache(object):
             return str(rrc.rdata), hostname
         return None, hostname
 
+    def get_all(self, hostname):
+        now = time.time()
+        return [str(rrc.rdata) for rrc in self._cache.get(hostname, ()) if rrc.ttl_expried_time > now]
+
     def remove(self, hostname):
         if hostname in self._cache:
             self._cache.pop(hostname)
@@ -307,9 +311,12 @@ class DNSResolver(EventEmitter):
             try:
                 answer = dnslib.DNSRecord.parse(data)
                 hostname = b".".join(answer.q.qname.label)
+                rrs = [rr for rr in answer.rr if rr.rtype == answer.q.qtype]
                 if hostname not in self._queue:
+                    # later answers from the other servers still belong to the full address list
+                    if rrs and hostname in self._cache:
+                        self._cache.append(hostname, rrs)
                     continue
-                rrs = [rr for rr in answer.rr if rr.rtype == answer.q.qtype]
                 query_state = self._queue[hostname]
                 if answer.q.qtype == 28:
                     query_state.v6bv4_loading_count -= 1
@@ -335,9 +342,12 @@ class DNSResolver(EventEmitter):
             try:
                 answer = dnslib.DNSRecord.parse(data)
                 hostname = b".".join(answer.q.qname.label)
+                rrs = [rr for rr in answer.rr if rr.rtype == answer.q.qtype]
                 if hostname not in self._queue:
+                    # later answers from the other servers still belong to the full address list
+                    if rrs and hostname in self._cache:
+                        self._cache.append(hostname, rrs)
                     continue
-                rrs = [rr for rr in answer.rr if rr.rtype == answer.q.qtype]
                 query_state = self._queue[hostname]
                 if answer.q.qtype == 1:
                     query_state.v4bv6_loading_count -= 1
@@ -451,6 +461,17 @@ class DNSResolver(EventEmitter):
                 self.call_callback(hostname, None)
         return False
 
+    def resolve_all(self, hostname, callback, timeout=None):
+        def on_resolve(hostname, ip):
+            if not ip:
+                return callback(hostname, [])
+            ips = [ip]
+            for cache_ip in self._cache.get_all(ensure_bytes(hostname)):
+                if cache_ip != ip:
+                    ips.append(cache_ip)
+            return callback(hostname, ips)
+        return self.resolve(hostname, on_resolve, timeout)
+
     def flush(self):
         self._cache.clear()
 
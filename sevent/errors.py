@@ -38,4 +38,12 @@ class SSLConnectError(ConnectError):
 
 
 class SSLSocketError(SeventException):
+    pass
+
+
+class RecvLimitOverrun(SeventException):
+    pass
+
+
+class WaitTimeout(SeventException):
     pass
\ No newline at end of file
@@ -8,7 +8,9 @@ def null_emit_callback(*args, **kwargs):
     return None
 
 
-class EventEmitter(object):
+class SlotsEventEmitter(object):
+    __slots__ = ()
+
     def __init__(self):
         self._events = defaultdict(set)
         self._events_once = defaultdict(set)
@@ -227,4 +229,8 @@ class EventEmitter(object):
 
 if is_py3:
     from .coroutines.event import warp_coroutine
-    EventEmitter = warp_coroutine(EventEmitter)
+    SlotsEventEmitter = warp_coroutine(SlotsEventEmitter)
+
+
+class EventEmitter(SlotsEventEmitter):
+    pass
@@ -2,6 +2,7 @@
 # 2021/2/1
 # create by: snower
 
+import os
 import shlex
 import sys
 import multiprocessing
@@ -28,8 +29,9 @@ HEPERS = {
 }
 
 def show_help_message():
-    print('usage: -m [HELPER_NAME] [ARGS]\r\n')
+    print('usage: [-w WORKERS] -m [HELPER_NAME] [ARGS]\r\n')
     print('simple sevent helpers \r\n')
+    print('-w WORKERS  run helpers in WORKERS processes, servers listen with SO_REUSEPORT\r\n')
     print("can use helpers:\r\n\r\n" + '\r\n'.join(["sevent.helpers." + name for name in HEPERS]))
     print('\r\n\r\n' + '*' * 64 + '\r\n')
 
@@ -40,11 +42,21 @@ def show_help_message():
         p.join()
         print('\r\n\r\n' + '*' * 64 + '\r\n')
 
+def run_helpers(args_helpers):
+    for name, helper, argv in args_helpers:
+        logging.info("start helper %s by %s", name, argv)
+        helper.main(argv)
+
 if __name__ == "__main__":
     if "-h" in sys.argv:
         show_help_message()
         exit(0)
 
+    workers = 0
+    if len(sys.argv) >= 3 and sys.argv[1] == "-w":
+        workers = int(sys.argv[2])
+        del sys.argv[1:3]
+
     args_helpers = []
     if len(sys.argv) >= 2 and sys.argv[1] == "-f":
         if len(sys.argv) >= 3:
@@ -70,9 +82,13 @@ if __name__ == "__main__":
 
     logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)1.1s %(message)s',
                         datefmt='%Y-%m-%d %H:%M:%S', filemode='a+')
-    for name, helper, argv in args_helpers:
-        logging.info("start helper %s by %s", name, argv)
-        helper.main(argv)
+    if workers > 1:
+        os.environ["SEVENT_HELPERS_REUSEPORT"] = "1"
+        logging.info("start %d helper workers", workers)
+        sevent.cluster.Cluster(run_helpers, (args_helpers,), workers=workers).start()
+        exit(0)
+
+    run_helpers(args_helpers)
     try:
         sevent.instance().start()
     except KeyboardInterrupt:
@@ -10,7 +10,7 @@ import logging
 import traceback
 import threading
 import sevent
-from .utils import create_server, create_socket, config_signal
+from .utils import create_server, create_socket, connect_socket, config_signal
 from .simple_proxy import format_data_len, warp_write, http_protocol_parse, socks5_protocol_parse, socks4_protocol_parse
 from .tcp2proxy import http_build_protocol, socks5_build_protocol, socks5_read_protocol
 
@@ -27,8 +27,7 @@ def check_host(forward_host, allow_hosts):
 async def socks5_proxy(proxy_host, proxy_port, remote_host, remote_port):
     pconn = None
     try:
-        pconn = create_socket((proxy_host, proxy_port))
-        await pconn.connectof((proxy_host, proxy_port))
+        pconn = await connect_socket((proxy_host, proxy_port))
         await pconn.send(b"\x05\x01\x00")
         buffer = await pconn.recv()
         if buffer.read() != b'\x05\00':
@@ -54,8 +53,7 @@ async def socks5_proxy(proxy_host, proxy_port, remote_host, remote_port):
 async def socks5s_proxy(proxy_host, proxy_port, remote_host, remote_port):
     pconn = None
     try:
-        pconn = create_socket((proxy_host, proxy_port))
-        await pconn.connectof((proxy_host, proxy_port))
+        pconn = await connect_socket((proxy_host, proxy_port))
         await pconn.send(b"\x05\x01\x8e" + socks5_build_protocol(remote_host, remote_port))
     except sevent.errors.SocketClosed:
         pconn = None
@@ -67,8 +65,7 @@ async def socks5s_proxy(proxy_host, proxy_port, remote_host, remote_port):
 async def http_proxy(proxy_host, proxy_port, remote_host, remote_port):
     pconn = None
     try:
-        pconn = create_socket((proxy_host, proxy_port))
-        await pconn.connectof((proxy_host, proxy_port))
+        pconn = await connect_socket((proxy_host, proxy_port))
 
         protocol_data = http_build_protocol(remote_host, remote_port)
         await pconn.send(protocol_data)
@@ -350,8 +350,8 @@ class TcpTunnel(EventEmitter):
         self._recv_length = 2
         self._recv_waiting_length = True
         self._recv_timestamp = 0
-        self._ping_timestamp = time.time()
-        self._pong_timestamp = time.time()
+        self._ping_timestamp = self._loop.time()
+        self._pong_timestamp = self._loop.time()
         self._tunnels[id(self)] = self
 
     @property
@@ -378,12 +378,12 @@ class TcpTunnel(EventEmitter):
         socket.on_data(self.on_data)
         socket.on_close(self.on_close)
         socket.on_drain(self.on_drain)
-        self._ping_timestamp = time.time()
-        self._pong_timestamp = time.time()
+        self._ping_timestamp = self._loop.time()
+        self._pong_timestamp = self._loop.time()
         def do_ping_timeout():
             if self._socket is not socket:
                 return
-            now = time.time()
+            now = self._loop.time()
             if now - self._recv_timestamp <= 45:
                 self._ping_timestamp = self._send_timestamp
                 self._pong_timestamp = self._recv_timestamp
@@ -450,7 +450,7 @@ class TcpTunnel(EventEmitter):
             else:
                 self._socket.write(struct.pack(">HHBB", 4, stream_id, frame_type, frame_flag))
             self._send_waiting_drain = True
-            self._send_timestamp = time.time()
+            self._send_timestamp = self._loop.time()
             if frame_type == FRAME_TYPE_DATA:
                 stream = self._streams.get(stream_id)
                 if stream is not None:
@@ -460,9 +460,9 @@ class TcpTunnel(EventEmitter):
         while len(buffer) >= self._recv_length:
             if self._recv_waiting_length:
                 self._recv_waiting_length = False
-                self._recv_length, = struct.unpack(">H", buffer.read(2))
+                self._recv_length, = struct.unpack(">H", buffer.readview(2))
             else:
-                stream_id, frame_type, frame_flag = struct.unpack(">HBB", buffer.read(4))
+                stream_id, frame_type, frame_flag = struct.unpack(">HBB", buffer.readview(4))
                 data = buffer.read(self._recv_length - 4) if self._recv_length > 4 else None
                 self._recv_length = 2
                 self._recv_waiting_length = True
@@ -470,7 +470,7 @@ class TcpTunnel(EventEmitter):
                     self.on_system_frame(frame_type, frame_flag, data)
                 else:
                     self.on_frame(stream_id, frame_type, frame_flag, data)
-                self._recv_timestamp = time.time()
+                self._recv_timestamp = self._loop.time()
 
     def on_frame(self, stream_id, frame_type, frame_flag, data):
         if stream_id not in self._streams:
@@ -509,7 +509,7 @@ class TcpTunnel(EventEmitter):
     def on_system_frame(self, frame_type, frame_flag, data):
         if frame_type == FRAME_TYPE_PING:
             self.write_frame(0, FRAME_TYPE_PONG, 0, None)
-            self._pong_timestamp = time.time()
+            self._pong_timestamp = self._loop.time()
             return
 
     def on_drain(self, socket):
@@ -522,7 +522,7 @@ class TcpTunnel(EventEmitter):
                 self._socket.write(struct.pack(">HHBB", len(data) + 4, stream_id, frame_type, frame_flag) + data)
             else:
                 self._socket.write(struct.pack(">HHBB", 4, stream_id, frame_type, frame_flag))
-            self._send_timestamp = time.time()
+            self._send_timestamp = self._loop.time()
             if frame_type == FRAME_TYPE_DATA:
                 stream = self._streams.get(stream_id)
                 if stream is not None:
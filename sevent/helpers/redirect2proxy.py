@@ -11,15 +11,14 @@ import traceback
 import threading
 import socket
 import sevent
-from .utils import create_server, create_socket, config_signal
+from .utils import create_server, connect_socket, config_signal
 from .simple_proxy import format_data_len, warp_write
 from .tcp2proxy import http_build_protocol, socks5_build_protocol, socks5_read_protocol
 
 async def socks5_proxy(proxy_host, proxy_port, remote_host, remote_port):
     pconn = None
     try:
-        pconn = create_socket((proxy_host, proxy_port))
-        await pconn.connectof((proxy_host, proxy_port))
+        pconn = await connect_socket((proxy_host, proxy_port))
         await pconn.send(b"\x05\x01\x00")
         buffer = await pconn.recv()
         if buffer.read() != b'\x05\00':
@@ -45,8 +44,7 @@ async def socks5_proxy(proxy_host, proxy_port, remote_host, remote_port):
 async def socks5s_proxy(proxy_host, proxy_port, remote_host, remote_port):
     pconn = None
     try:
-        pconn = create_socket((proxy_host, proxy_port))
-        await pconn.connectof((proxy_host, proxy_port))
+        pconn = await connect_socket((proxy_host, proxy_port))
         await pconn.send(b"\x05\x01\x8e" + socks5_build_protocol(remote_host, remote_port))
     except sevent.errors.SocketClosed:
         pconn = None
@@ -58,8 +56,7 @@ async def socks5s_proxy(proxy_host, proxy_port, remote_host, remote_port):
 async def http_proxy(proxy_host, proxy_port, remote_host, remote_port):
     pconn = None
     try:
-        pconn = create_socket((proxy_host, proxy_port))
-        await pconn.connectof((proxy_host, proxy_port))
+        pconn = await connect_socket((proxy_host, proxy_port))
 
         protocol_data = http_build_protocol(remote_host, remote_port)
         await pconn.send(protocol_data)
@@ -57,6 +57,13 @@ def warp_write(conn, status, key):
         return origin_write(data)
     return _
 
+def warp_splice_write(conn, status, key):
+    def on_splice(s, data_len):
+        status[key] += data_len
+    conn.enable_splice()
+    conn.on_splice(on_splice)
+    return conn.write
+
 def http_protocol_parse_address(data, default_port=80):
     address = data.split(b":")
     if len(address) != 2:
@@ -242,6 +249,8 @@ async def tcp_accept(server, timeout, allow_host_names=None, deny_host_names=Non
         conns[id(conn)] = (conn, status)
 
 def main(argv):
+    global warp_write
+
     parser = argparse.ArgumentParser(description='simple http and socks5 proxy server')
     parser.add_argument('-b', dest='bind', default="0.0.0.0", help='local bind host (default: 0.0.0.0)')
     parser.add_argument('-p', dest='port', default=8088, type=int, help='local bind port (default: 8088)')
@@ -250,9 +259,14 @@ def main(argv):
     parser.add_argument('-d', dest='deny_hosts', default=[], action="append", type=str, help='deny forward host name')
     parser.add_argument('-A', dest='allow_filename', default="", type=str, help='allow forward host name config filename')
     parser.add_argument('-D', dest='deny_filename', default="", type=str, help='deny forward host name config filename')
+    parser.add_argument('--splice', dest='splice', nargs='?', const=True, default=False, type=bool,
+                        help='forward with zero-copy splice on linux')
     args = parser.parse_args(args=argv)
     config_signal()
 
+    if args.splice:
+        warp_write = warp_splice_write
+
     allow_host_names, deny_host_names = [], []
     if args.allow_hosts:
         for allow_host in args.allow_hosts:
@@ -11,7 +11,7 @@ import traceback
 import argparse
 import threading
 import sevent
-from .utils import create_server, create_socket, config_signal, format_data_len
+from .utils import create_server, create_socket, connect_socket, config_signal, format_data_len
 
 def warp_write(conn, status, key):
     origin_write = conn.write
@@ -51,8 +51,7 @@ async def socks5_proxy(conns, conn, proxy_host, proxy_port, remote_host, remote_
 
     try:
         conn.enable_nodelay()
-        pconn = create_socket((proxy_host, proxy_port))
-        await pconn.connectof((proxy_host, proxy_port))
+        pconn = await connect_socket((proxy_host, proxy_port))
         await pconn.send(b"\x05\x01\x00")
         buffer = await pconn.recv()
         if buffer.read() != b'\x05\00':
@@ -92,8 +91,7 @@ async def socks5s_proxy(conns, conn, proxy_host, proxy_port, remote_host, remote
 
     try:
         conn.enable_nodelay()
-        pconn = create_socket((proxy_host, proxy_port))
-        await pconn.connectof((proxy_host, proxy_port))
+        pconn = await connect_socket((proxy_host, proxy_port))
         await pconn.send(b"\x05\x01\x8e" + socks5_build_protocol(remote_host, remote_port))
         pconn.write = warp_write(pconn, status, "send_len")
         logging.info("socks5s proxy connected %s:%d -> %s:%d -> %s:%d", conn.address[0], conn.address[1], proxy_host, proxy_port,
@@ -123,8 +121,7 @@ async def http_proxy(conns, conn, proxy_host, proxy_port, remote_host, remote_po
 
     try:
         conn.enable_nodelay()
-        pconn = create_socket((proxy_host, proxy_port))
-        await pconn.connectof((proxy_host, proxy_port))
+        pconn = await connect_socket((proxy_host, proxy_port))
 
         protocol_data = http_build_protocol(remote_host, remote_port)
         await pconn.send(protocol_data)
@@ -86,6 +86,13 @@ def warp_write(conn, status, key):
         return origin_write(data)
     return _
 
+def warp_splice_write(conn, status, key):
+    def on_splice(s, data_len):
+        status[key] += data_len
+    conn.enable_splice()
+    conn.on_splice(on_splice)
+    return conn.write
+
 def warp_speed_limit_write(conn, status, key):
     conn_id = id(conn)
     origin_write = conn.write
@@ -513,6 +520,8 @@ def main(argv):
                         help='mirror host, accept format [[up_host:]up_port:[down_host]:down_port] (example: 0.0.0.0:80:127.0.0.1:8088 or :127.0.0.1:8088 or 127.0.0.1:8088: or 8088:8088)')
     parser.add_argument('-F', dest='mirror_header', default="", type=str,
                         help='mirror header, accept variables [from_host|from_port|to_host|to_port|conn_id] (example: "{conn_id}-{from_host}:{from_port}->{to_host}:{to_port}\\r\\n")')
+    parser.add_argument('--splice', dest='splice', nargs='?', const=True, default=False, type=bool,
+                        help='forward with zero-copy splice on linux, ignored when speed limit, delay or mirror is used')
     args = parser.parse_args(args=argv)
     config_signal()
     if not args.forwards:
@@ -527,6 +536,9 @@ def main(argv):
     if not forwards:
         exit(0)
 
+    if args.splice and not args.speed and not args.global_speed and not args.delay and not args.mirror_host:
+        warp_write = warp_splice_write
+
     if args.speed or args.global_speed:
         warp_write = warp_speed_limit_write
 
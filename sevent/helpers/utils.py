@@ -11,6 +11,7 @@ import sevent
 
 ascii_digits_letters = string.ascii_letters + string.digits
 __SSL_CONTEXT_CACHE__ = {}
+__CONNECTION_POOL__ = None
 
 def config_signal():
     signal.signal(signal.SIGINT, lambda signum, frame: sevent.current().stop())
@@ -94,6 +95,8 @@ def create_server(address, *args, **kwargs):
             else:
                 server = sevent.tcp.Server()
     server.enable_reuseaddr()
+    if get_address_environ(address, "SEVENT_HELPERS_REUSEPORT"):
+        server.enable_reuseport()
     server.listen(address, *args, **kwargs)
     setattr(server, "address", address)
     return server
@@ -157,8 +160,22 @@ def create_socket(address):
             else:
                 conn = sevent.tcp.Socket()
     conn.enable_nodelay()
+    if isinstance(conn, sevent.tcp.Socket):
+        conn.enable_happy_eyeballs()
     return conn
 
+async def connect_socket(address):
+    global __CONNECTION_POOL__
+    if not isinstance(address, (tuple, str)):
+        address = tuple(address)
+    if not sevent.pool.POOL_MIN_IDLE or "pipe" in address:
+        conn = create_socket(address)
+        await conn.connectof(address)
+        return conn
+    if __CONNECTION_POOL__ is None:
+        __CONNECTION_POOL__ = sevent.pool.ConnectionPool(factory=lambda address, context: create_socket(address))
+    return await __CONNECTION_POOL__.acquire(address)
+
 def format_data_len(date_len):
     if date_len < 1024:
         return "%dB" % date_len
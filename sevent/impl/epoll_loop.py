@@ -1,7 +1,15 @@
 # -*- coding: utf-8 -*-
 
+import os
 import select
-from ..loop import IOLoop
+from ..loop import IOLoop, MODE_IN, MODE_OUT
+
+EPOLLET = getattr(select, "EPOLLET", 1 << 31)
+
+try:
+    EDGE_TRIGGERED = bool(int(os.environ.get("SEVENT_EPOLL_EDGE_TRIGGERED", 0)))
+except:
+    EDGE_TRIGGERED = False
 
 
 class EpollLoop(IOLoop):
@@ -14,6 +22,9 @@ class EpollLoop(IOLoop):
         self._remove_fd = self._epoll.unregister
         self._modify_fd = self._epoll.modify
 
+        if EDGE_TRIGGERED:
+            self.enable_edge_triggered()
+
     def _poll(self, timeout):
         return self._epoll.poll(timeout)
 
@@ -25,3 +36,14 @@ class EpollLoop(IOLoop):
 
     def _modify_fd(self, fd, mode):
         self._epoll.modify(fd, mode)
+
+    def enable_edge_triggered(self):
+        self._edge_triggered = True
+
+    def add_edge_fd(self, fd, read_callback, write_callback):
+        '''register fd once for edge triggered IN|OUT, callbacks must track readiness until EAGAIN'''
+        self._reserve_fd_slots(fd)
+        self._fd_handlers.pop(fd, None)
+        self._update_fd_mode(fd, MODE_IN | MODE_OUT | EPOLLET)
+        self._fd_reads[fd], self._fd_writes[fd] = read_callback, write_callback
+        return True
@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+# 2026/10/17
+# create by: snower
+
+import os
+from ..loop import IOLoop
+from .. import curing
+
+try:
+    IOURING_ENTRIES = int(os.environ.get("SEVENT_IOURING_ENTRIES", 1024))
+except:
+    IOURING_ENTRIES = 1024
+
+
+class IoUringLoop(IOLoop):
+    ''' io_uring poll backend, fd changes are queued and submitted with the next wait in one io_uring_enter '''
+
+    def __init__(self):
+        super(IoUringLoop, self).__init__()
+        self._ring = curing.Ring(IOURING_ENTRIES)
+
+        self._poll = self._ring.poll
+        self._add_fd = self._ring.register
+        self._remove_fd = self._ring.unregister
+        self._modify_fd = self._ring.modify
+
+    def _poll(self, timeout):
+        return self._ring.poll(timeout)
+
+    def _add_fd(self, fd, mode):
+        self._ring.register(fd, mode)
+
+    def _remove_fd(self, fd):
+        self._ring.unregister(fd)
+
+    def _modify_fd(self, fd, mode):
+        self._ring.modify(fd, mode)
@@ -1,12 +1,14 @@
 # -*- coding: utf-8 -*-
 
+import os
 import select
-import time
+import math
 import heapq
+import functools
 import threading
-from collections import defaultdict
+from collections import deque
 from .waker import Waker
-from .utils import is_py3, get_logger
+from .utils import is_py3, get_logger, monotonic
 
 ''' You can only use instance(). Don't create a Loop() '''
 
@@ -17,6 +19,55 @@ _ioloop_cls = None
 _ioloop = None
 _mul_ioloop = False
 
+try:
+    TIMER_WHEEL_TICK = float(os.environ.get("SEVENT_TIMER_WHEEL_TICK", 0))
+except:
+    TIMER_WHEEL_TICK = 0
+
+try:
+    CALLBACK_BUDGET = int(os.environ.get("SEVENT_CALLBACK_BUDGET", 1024))
+except:
+    CALLBACK_BUDGET = 1024
+
+try:
+    STATS_INTERVAL = float(os.environ.get("SEVENT_LOOP_STATS_INTERVAL", 0))
+except:
+    STATS_INTERVAL = 0
+
+try:
+    SLOW_CALLBACK_THRESHOLD = float(os.environ.get("SEVENT_SLOW_CALLBACK_THRESHOLD", 0))
+except:
+    SLOW_CALLBACK_THRESHOLD = 0
+
+SLOW_CALLBACK_STACK = bool(os.environ.get("SEVENT_SLOW_CALLBACK_STACK", False))
+
+try:
+    FD_SLOTS_SIZE = int(os.environ.get("SEVENT_FD_SLOTS_SIZE", 1024))
+except:
+    FD_SLOTS_SIZE = 1024
+
+USE_IOURING = not os.environ.get("SEVENT_NOUSE_IOURING", False)
+_iouring_support = None
+
+
+def _iouring_supported():
+    global _iouring_support
+    if _iouring_support is not None:
+        return _iouring_support
+
+    _iouring_support = False
+    if not USE_IOURING or os.environ.get("SEVENT_EPOLL_EDGE_TRIGGERED", "0") not in ("", "0"):
+        return False
+    try:
+        from . import curing
+        curing.Ring(1).close()
+        _iouring_support = True
+    except ImportError:
+        pass
+    except Exception as e:
+        get_logger().debug("io_uring is not supported: %s", e)
+    return _iouring_support
+
 
 def instance():
     global _ioloop_cls, _ioloop, _mul_ioloop
@@ -33,7 +84,11 @@ def instance():
         except AttributeError:
             pass
 
-        if 'epoll' in select.__dict__:
+        if 'epoll' in select.__dict__ and _iouring_supported():
+            from .impl import iouring_loop
+            get_logger().debug('using io_uring')
+            _ioloop_cls = iouring_loop.IoUringLoop
+        elif 'epoll' in select.__dict__:
             from .impl import epoll_loop
             get_logger().debug('using epoll')
             _ioloop_cls = epoll_loop.EpollLoop
@@ -71,6 +126,9 @@ MODE_ERR = 0x08
 MODE_HUP = 0x10
 MODE_NVAL = 0x20
 
+MODE_READ_EVENTS = MODE_IN | MODE_ERR | MODE_HUP | MODE_NVAL
+MODE_WRITE_EVENTS = MODE_OUT | MODE_ERR | MODE_HUP | MODE_NVAL
+
 
 class TimeoutHandler(object):
     def __init__(self, callback, deadline, args, kwargs):
@@ -106,15 +164,155 @@ class TimeoutHandler(object):
         self.callback(*self.args, **self.kwargs)
 
 
+class TimerWheel(object):
+    ''' hierarchical timing wheel, timers fire at the first tick not earlier than deadline '''
+
+    def __init__(self, tick=0.01, slot_bits=8, levels=4, now=None):
+        self._tick = float(tick)
+        self._slot_bits = slot_bits
+        self._slot_mask = (1 << slot_bits) - 1
+        self._levels = levels
+        self._wheels = [[{} for _ in range(1 << slot_bits)] for _ in range(levels)]
+        self._counts = [0] * levels
+        self._count = 0
+        self._current = int((monotonic() if now is None else now) / self._tick)
+        self.stats = None
+
+    @property
+    def tick(self):
+        return self._tick
+
+    def __len__(self):
+        return self._count
+
+    def _place(self, handler, expire):
+        delta, level, shift = expire - self._current, 0, 0
+        while level < self._levels - 1 and delta >> (shift + self._slot_bits):
+            level += 1
+            shift += self._slot_bits
+        bucket = self._wheels[level][(expire >> shift) & self._slot_mask]
+        bucket[id(handler)] = handler
+        handler.wheel_bucket = bucket
+        handler.wheel_level = level
+        handler.wheel_expire = expire
+        self._counts[level] += 1
+
+    def add(self, handler, now):
+        if not self._count:
+            self._current = int(now / self._tick)
+        self._place(handler, max(int(math.ceil(handler.deadline / self._tick)), self._current + 1))
+        self._count += 1
+        return handler
+
+    def cancel(self, handler):
+        bucket = getattr(handler, "wheel_bucket", None)
+        if bucket is None:
+            return False
+        handler.wheel_bucket = None
+        if bucket.pop(id(handler), None) is None:
+            return False
+        self._counts[handler.wheel_level] -= 1
+        self._count -= 1
+        return True
+
+    def _cascade(self, level):
+        shift = self._slot_bits * level
+        index = (self._current >> shift) & self._slot_mask
+        if index == 0 and level + 1 < self._levels:
+            self._cascade(level + 1)
+        bucket = self._wheels[level][index]
+        if not bucket:
+            return
+        self._wheels[level][index] = {}
+        self._counts[level] -= len(bucket)
+        for handler in bucket.values():
+            self._place(handler, handler.wheel_expire)
+
+    def _expire(self, now):
+        index = self._current & self._slot_mask
+        bucket = self._wheels[0][index]
+        if not bucket:
+            return
+        self._wheels[0][index] = {}
+        for key in list(bucket):
+            handler = bucket.pop(key, None)
+            if handler is None:
+                continue
+            handler.wheel_bucket = None
+            self._counts[0] -= 1
+            self._count -= 1
+            try:
+                if self.stats is None:
+                    handler.callback(*handler.args, **handler.kwargs)
+                else:
+                    self.stats.call_timeout(handler, now)
+            except Exception as e:
+                if isinstance(e, (KeyboardInterrupt, SystemError)):
+                    raise e
+                get_logger().exception("loop callback timeout error:%s", e)
+
+    def run(self, now):
+        target = int(now / self._tick)
+        while self._current < target:
+            if not self._counts[0]:
+                if not self._count:
+                    self._current = target
+                    break
+                next_tick = (self._current | self._slot_mask) + 1
+                if next_tick > target:
+                    self._current = target
+                    break
+                self._current = next_tick
+            else:
+                self._current += 1
+            if self._current & self._slot_mask == 0 and self._levels > 1:
+                self._cascade(1)
+            self._expire(now)
+
+        if not self._count:
+            return 3600
+        next_tick = (self._current | self._slot_mask) + 1
+        if self._counts[0]:
+            limit = next_tick if self._count > self._counts[0] else self._current + self._slot_mask + 1
+            wheel = self._wheels[0]
+            for tick in range(self._current + 1, limit + 1):
+                if wheel[tick & self._slot_mask]:
+                    next_tick = tick
+                    break
+            else:
+                next_tick = limit
+        return max(next_tick * self._tick - now, 0)
+
+
 class IOLoop(object):
+    _edge_triggered = False
+
     def __init__(self):
-        self._handlers = []
-        self._run_handlers = []
+        # ready callbacks are queued flat as callback, args pairs
+        self._handlers = deque()
+        self._safe_handlers = deque()
+        self._callback_budget = CALLBACK_BUDGET
+        self._stats = None
+        self._stats_handler = None
         self._timeout_handlers = []
-        self._fd_handlers = defaultdict(list)
+        self._timer_wheel = None
+        # flat per fd read/write callback slots, fds with more callbacks fall back to _fd_handlers
+        self._fd_reads = [None] * FD_SLOTS_SIZE
+        self._fd_writes = [None] * FD_SLOTS_SIZE
+        self._fd_modes = [MODE_NULL] * FD_SLOTS_SIZE
+        self._fd_handlers = {}
         self._stopped = False
+        self._running = False
+        self._time = monotonic()
         self._waker = Waker()
 
+        if TIMER_WHEEL_TICK > 0:
+            self.enable_timer_wheel(TIMER_WHEEL_TICK)
+        if STATS_INTERVAL > 0:
+            self.enable_stats(STATS_INTERVAL)
+        if SLOW_CALLBACK_THRESHOLD > 0:
+            self.enable_slow_callback(SLOW_CALLBACK_THRESHOLD, SLOW_CALLBACK_STACK)
+
     def _poll(self, timeout):
         raise NotImplementedError()
 
@@ -127,77 +325,136 @@ class IOLoop(object):
     def _modify_fd(self, fd, mode):
         raise NotImplementedError()
 
-    def add_fd(self, fd, mode, callback):
-        handlers = self._fd_handlers[fd]
-        new_handlers = []
-        if not handlers:
-            new_handlers.append((callback, fd, mode))
-            self._add_fd(fd, mode)
+    def _reserve_fd_slots(self, fd):
+        size = len(self._fd_reads)
+        if fd >= size:
+            size = max(fd + 1, size * 2)
+            grow = size - len(self._fd_reads)
+            self._fd_reads.extend([None] * grow)
+            self._fd_writes.extend([None] * grow)
+            self._fd_modes.extend([MODE_NULL] * grow)
+
+    def _update_fd_mode(self, fd, new_mode):
+        mode = self._fd_modes[fd]
+        if new_mode == mode:
+            return
+        self._fd_modes[fd] = new_mode
+        if mode == MODE_NULL:
+            self._add_fd(fd, new_mode)
+        elif new_mode == MODE_NULL:
+            self._remove_fd(fd)
         else:
-            new_mode = MODE_NULL
-            for hcallback, hfd, hmode in handlers:
-                if hcallback != callback:
-                    new_mode |= hmode
-                    new_handlers.append((hcallback, hfd, hmode))
-            new_handlers.append((callback, fd, mode))
-            new_mode |= mode
             self._modify_fd(fd, new_mode)
-        self._fd_handlers[fd] = new_handlers
-        return True
 
-    def update_fd(self, fd, mode, callback):
-        handlers = self._fd_handlers[fd]
-        if not handlers:
-            return False
-        new_handlers = []
+    def _update_fd_handlers(self, fd, handlers):
         new_mode = MODE_NULL
         for hcallback, hfd, hmode in handlers:
-            if hcallback == callback:
-                new_mode |= mode
-                new_handlers.append((hcallback, hfd, mode))
+            new_mode |= hmode
+        if handlers:
+            self._fd_handlers[fd] = handlers
+        else:
+            self._fd_handlers.pop(fd, None)
+        self._update_fd_mode(fd, new_mode)
+
+    def add_fd(self, fd, mode, callback):
+        self._reserve_fd_slots(fd)
+        if fd not in self._fd_handlers:
+            reader, writer = self._fd_reads[fd], self._fd_writes[fd]
+            if not mode & MODE_OUT and (reader is None or reader == callback) and writer != callback:
+                self._fd_reads[fd] = callback
+                self._update_fd_mode(fd, ((self._fd_modes[fd] & ~MODE_IN) if writer is not None else MODE_NULL) | mode)
+                return True
+            if not mode & MODE_IN and (writer is None or writer == callback) and reader != callback:
+                self._fd_writes[fd] = callback
+                self._update_fd_mode(fd, ((self._fd_modes[fd] & ~MODE_OUT) if reader is not None else MODE_NULL) | mode)
+                return True
+
+            # more than one reader or writer, fall back to the handler list
+            handlers = []
+            if reader is not None:
+                handlers.append((reader, fd, MODE_IN))
+            if writer is not None:
+                handlers.append((writer, fd, MODE_OUT))
+            self._fd_reads[fd], self._fd_writes[fd] = None, None
+        else:
+            handlers = self._fd_handlers[fd]
+
+        new_handlers = [(hcallback, hfd, hmode) for hcallback, hfd, hmode in handlers if hcallback != callback]
+        new_handlers.append((callback, fd, mode))
+        self._update_fd_handlers(fd, new_handlers)
+        return True
+
+    def update_fd(self, fd, mode, callback):
+        if fd not in self._fd_handlers:
+            if fd >= len(self._fd_reads):
+                return False
+            if self._fd_reads[fd] == callback:
+                self._fd_reads[fd] = None
+            elif self._fd_writes[fd] == callback:
+                self._fd_writes[fd] = None
             else:
-                new_mode |= hmode
-                new_handlers.append((hcallback, hfd, hmode))
-        self._modify_fd(fd, new_mode)
-        self._fd_handlers[fd] = new_handlers
+                return False
+            return self.add_fd(fd, mode, callback)
+
+        new_handlers = [(hcallback, hfd, mode if hcallback == callback else hmode)
+                        for hcallback, hfd, hmode in self._fd_handlers[fd]]
+        self._update_fd_handlers(fd, new_handlers)
         return True
 
     def remove_fd(self, fd, callback):
-        handlers = self._fd_handlers[fd]
-        if not handlers:
-            return False
-        if len(handlers) == 1:
-            if handlers[0][0] == callback:
-                self._remove_fd(fd)
-                del self._fd_handlers[fd]
-        else:
-            new_handlers = []
-            new_mode = MODE_NULL
-            for hcallback, hfd, hmode in handlers:
-                if hcallback != callback:
-                    new_mode |= hmode
-                    new_handlers.append((hcallback, hfd, hmode))
-            self._modify_fd(fd, new_mode)
-            self._fd_handlers[fd] = new_handlers
+        if fd not in self._fd_handlers:
+            if fd >= len(self._fd_reads):
+                return False
+            reader, writer = self._fd_reads[fd], self._fd_writes[fd]
+            if reader is None and writer is None:
+                return False
+            if reader is not None and reader == callback:
+                self._fd_reads[fd] = None
+                self._update_fd_mode(fd, (self._fd_modes[fd] & ~MODE_IN) if writer is not None else MODE_NULL)
+            elif writer is not None and writer == callback:
+                self._fd_writes[fd] = None
+                self._update_fd_mode(fd, (self._fd_modes[fd] & ~MODE_OUT) if reader is not None else MODE_NULL)
+            return True
+
+        new_handlers = [(hcallback, hfd, hmode) for hcallback, hfd, hmode in self._fd_handlers[fd]
+                        if hcallback != callback]
+        self._update_fd_handlers(fd, new_handlers)
         return True
 
     def clear_fd(self, fd):
-        if fd in self._fd_handlers:
-            if self._fd_handlers[fd]:
-                del self._fd_handlers[fd]
-                self._remove_fd(fd)
-                return True
-            del self._fd_handlers[fd]
-        return False
+        if fd >= len(self._fd_reads):
+            return False
+        self._fd_handlers.pop(fd, None)
+        self._fd_reads[fd], self._fd_writes[fd] = None, None
+        if self._fd_modes[fd] == MODE_NULL:
+            return False
+        self._fd_modes[fd] = MODE_NULL
+        self._remove_fd(fd)
+        return True
+
+    @property
+    def edge_triggered(self):
+        return self._edge_triggered
+
+    def time(self):
+        return self._time if self._running else monotonic()
 
     def start(self):
         self.add_fd(self._waker.fileno(), MODE_IN, self._waker.consume)
+        self._time = monotonic()
+        self._running = True
 
         while not self._stopped:
             timeout = 3600
+            stats = self._stats
 
-            if self._timeout_handlers:
-                cur_time = time.time()
+            if self._timer_wheel is not None:
+                if self._timer_wheel._count:
+                    timeout = self._timer_wheel.run(self._time)
+                if self._handlers:
+                    timeout = 0
+            elif self._timeout_handlers:
+                cur_time = self._time
                 if self._timeout_handlers[0].deadline <= cur_time:
                     while self._timeout_handlers:
                         handler = self._timeout_handlers[0]
@@ -206,7 +463,10 @@ class IOLoop(object):
                         elif handler.deadline <= cur_time:
                             heapq.heappop(self._timeout_handlers)
                             try:
-                                handler.callback(*handler.args, **handler.kwargs)
+                                if stats is None:
+                                    handler.callback(*handler.args, **handler.kwargs)
+                                else:
+                                    stats.call_timeout(handler, cur_time)
                             except Exception as e:
                                 if isinstance(e, (KeyboardInterrupt, SystemError)):
                                     raise e
@@ -217,6 +477,9 @@ class IOLoop(object):
                         else:
                             timeout = self._timeout_handlers[0].deadline - cur_time
                             break
+                    else:
+                        if self._handlers:
+                            timeout = 0
                 elif self._handlers:
                     timeout = 0
                 else:
@@ -224,45 +487,112 @@ class IOLoop(object):
             elif self._handlers:
                 timeout = 0
 
-            fds_ready = self._poll(timeout)
+            if stats is None:
+                fds_ready = self._poll(timeout)
+                self._time = monotonic()
+            else:
+                poll_start_time = monotonic()
+                fds_ready = self._poll(timeout)
+                self._time = monotonic()
+                stats.poll(poll_start_time, self._time, len(fds_ready), len(self._handlers) >> 1,
+                           len(self._timeout_handlers) if self._timer_wheel is None else self._timer_wheel._count)
+            fd_reads, fd_writes, fd_handlers = self._fd_reads, self._fd_writes, self._fd_handlers
             for fd, mode in fds_ready:
-                for hcallback, hfd, hmode in self._fd_handlers[fd]:
-                    if hmode & mode != 0:
+                if mode & MODE_READ_EVENTS:
+                    hcallback = fd_reads[fd]
+                    if hcallback is not None:
                         try:
-                            hcallback()
+                            if stats is None:
+                                hcallback()
+                            else:
+                                stats.call(hcallback, ())
                         except Exception as e:
                             if isinstance(e, (KeyboardInterrupt, SystemError)):
                                 raise e
                             get_logger().exception("loop callback error:%s", e)
-
-            # call handlers without fd
-            self._handlers, self._run_handlers = self._run_handlers, self._handlers
-            for callback, args, kwargs in self._run_handlers:
+                if mode & MODE_WRITE_EVENTS:
+                    hcallback = fd_writes[fd]
+                    if hcallback is not None:
+                        try:
+                            if stats is None:
+                                hcallback()
+                            else:
+                                stats.call(hcallback, ())
+                        except Exception as e:
+                            if isinstance(e, (KeyboardInterrupt, SystemError)):
+                                raise e
+                            get_logger().exception("loop callback error:%s", e)
+                if fd_handlers and fd in fd_handlers:
+                    for hcallback, hfd, hmode in fd_handlers[fd]:
+                        if hmode & mode != 0:
+                            try:
+                                if stats is None:
+                                    hcallback()
+                                else:
+                                    stats.call(hcallback, ())
+                            except Exception as e:
+                                if isinstance(e, (KeyboardInterrupt, SystemError)):
+                                    raise e
+                                get_logger().exception("loop callback error:%s", e)
+
+            # call handlers without fd, queued by this loop before now and at most callback_budget of them
+            handlers, safe_handlers = self._handlers, self._safe_handlers
+            while safe_handlers:
+                callback, args = safe_handlers.popleft()
+                handlers.append(callback)
+                handlers.append(args)
+            count = len(handlers) >> 1
+            if 0 < self._callback_budget < count:
+                count = self._callback_budget
+            popleft = handlers.popleft
+            while count > 0:
+                count -= 1
+                callback = popleft()
+                args = popleft()
                 try:
-                    callback(*args, **kwargs)
+                    if stats is None:
+                        callback(*args)
+                    else:
+                        stats.call(callback, args)
                 except Exception as e:
                     if isinstance(e, (KeyboardInterrupt, SystemError)):
                         raise e
                     get_logger().exception("loop callback error:%s", e)
-            self._run_handlers = []
+        self._running = False
 
     def stop(self):
         self._stopped = True
         self._waker.wake()
 
     def add_async(self, callback, *args, **kwargs):
-        self._handlers.append((callback, args, kwargs))
+        if kwargs:
+            callback, args = functools.partial(callback, *args, **kwargs), ()
+        self._handlers.append(callback)
+        self._handlers.append(args)
 
     def add_async_safe(self, callback, *args, **kwargs):
-        self._handlers.append((callback, args, kwargs))
+        if kwargs:
+            callback, args = functools.partial(callback, *args, **kwargs), ()
+        self._safe_handlers.append((callback, args))
         self._waker.wake()
 
+    @property
+    def callback_budget(self):
+        return self._callback_budget
+
+    def set_callback_budget(self, budget):
+        self._callback_budget = max(int(budget), 0)
+
     def add_timeout(self, timeout, callback, *args, **kwargs):
-        handler = TimeoutHandler(callback, time.time() + timeout, args, kwargs)
+        if self._timer_wheel is not None:
+            return self._add_wheel_timeout(timeout, callback, *args, **kwargs)
+        handler = TimeoutHandler(callback, (self._time if self._running else monotonic()) + timeout, args, kwargs)
         heapq.heappush(self._timeout_handlers, handler)
         return handler
 
     def cancel_timeout(self, handler):
+        if self._timer_wheel is not None:
+            return self._cancel_wheel_timeout(handler)
         if handler.__class__ is TimeoutHandler:
             handler.callback = None
             handler.args = None
@@ -280,6 +610,100 @@ class IOLoop(object):
                 break
             heapq.heappop(self._timeout_handlers)
 
+    def enable_timer_wheel(self, tick=0.01, slot_bits=8, levels=4):
+        if self._timer_wheel is not None:
+            return self._timer_wheel
+
+        now = self.time()
+        self._timer_wheel = TimerWheel(tick, slot_bits, levels, now)
+        self._timer_wheel.stats = self._stats
+        while self._timeout_handlers:
+            handler = heapq.heappop(self._timeout_handlers)
+            if not handler.canceled:
+                self._timer_wheel.add(handler, now)
+        return self._timer_wheel
+
+    @property
+    def timer_wheel(self):
+        return self._timer_wheel
+
+    def _ensure_stats(self):
+        if self._stats is None:
+            from .stats import LoopStats
+            self._stats = LoopStats(False)
+            if self._timer_wheel is not None:
+                self._timer_wheel.stats = self._stats
+        return self._stats
+
+    def _release_stats(self):
+        if self._stats is None or self._stats.collect or self._stats.slow_callback_threshold > 0:
+            return
+        if self._timer_wheel is not None:
+            self._timer_wheel.stats = None
+        self._stats = None
+
+    def enable_stats(self, dump_interval=0, dump_callback=None):
+        if not self._ensure_stats().collect:
+            self._stats.collect = True
+            self._stats.reset()
+        if self._stats_handler is not None:
+            self.cancel_timeout(self._stats_handler)
+            self._stats_handler = None
+
+        if dump_interval > 0:
+            if dump_callback is None:
+                from .stats import log_stats
+                dump_callback = log_stats
+
+            def on_dump():
+                self._stats_handler = self.add_timeout(dump_interval, on_dump)
+                try:
+                    dump_callback(self, self._stats.snapshot())
+                finally:
+                    self._stats.reset()
+            self._stats_handler = self.add_timeout(dump_interval, on_dump)
+        return self._stats
+
+    def disable_stats(self):
+        if self._stats_handler is not None:
+            self.cancel_timeout(self._stats_handler)
+            self._stats_handler = None
+        if self._stats is not None:
+            self._stats.collect = False
+            self._release_stats()
+
+    def enable_slow_callback(self, threshold=0.1, capture_stack=False):
+        stats = self._ensure_stats()
+        stats.slow_callback_threshold = threshold
+        stats.slow_callback_stack = capture_stack
+        return stats
+
+    def disable_slow_callback(self):
+        if self._stats is not None:
+            self._stats.slow_callback_threshold = 0
+            self._release_stats()
+
+    def get_stats(self, reset=False):
+        if self._stats is None or not self._stats.collect:
+            return None
+        stats = self._stats.snapshot()
+        if reset:
+            self._stats.reset()
+        return stats
+
+    def _add_wheel_timeout(self, timeout, callback, *args, **kwargs):
+        now = self._time if self._running else monotonic()
+        handler = TimeoutHandler(callback, now + timeout, args, kwargs)
+        self._timer_wheel.add(handler, now)
+        return handler
+
+    def _cancel_wheel_timeout(self, handler):
+        handler.callback = None
+        handler.args = None
+        handler.kwargs = None
+        handler.canceled = True
+        self._timer_wheel.cancel(handler)
+
     def wakeup(self, *args, **kwargs):
         if args and callable(args[0]):
             self.add_async(args[0], *args[1:], **kwargs)
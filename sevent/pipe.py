@@ -348,6 +348,9 @@ class PipeServer(EventEmitter):
     def enable_reuseaddr(self):
         pass
 
+    def enable_reuseport(self):
+        pass
+
     def enable_nodelay(self):
         pass
 
@@ -359,6 +362,10 @@ class PipeServer(EventEmitter):
     def is_reuseaddr(self):
         return False
 
+    @property
+    def is_reuseport(self):
+        return False
+
     @property
     def is_enable_nodelay(self):
         return True
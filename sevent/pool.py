@@ -0,0 +1,204 @@
+# -*- coding: utf-8 -*-
+# 2026/10/17
+# create by: snower
+
+import os
+import weakref
+from collections import defaultdict, deque
+from .utils import get_logger
+from .loop import current
+from .tcp import Socket, STATE_STREAMING
+
+try:
+    POOL_MIN_IDLE = int(os.environ.get("SEVENT_POOL_MIN_IDLE", 0))
+except:
+    POOL_MIN_IDLE = 0
+
+try:
+    POOL_MAX_IDLE = int(os.environ.get("SEVENT_POOL_MAX_IDLE", 8))
+except:
+    POOL_MAX_IDLE = 8
+
+try:
+    POOL_IDLE_TIMEOUT = float(os.environ.get("SEVENT_POOL_IDLE_TIMEOUT", 60))
+except:
+    POOL_IDLE_TIMEOUT = 60
+
+try:
+    POOL_CHECK_INTERVAL = float(os.environ.get("SEVENT_POOL_CHECK_INTERVAL", 1))
+except:
+    POOL_CHECK_INTERVAL = 1
+
+
+def create_socket(address, context=None, loop=None):
+    if context is not None:
+        from .sslsocket import SSLSocket
+        conn = SSLSocket(context=context, server_hostname=address[0], loop=loop)
+    else:
+        conn = Socket(loop=loop)
+    conn.enable_nodelay()
+    conn.enable_happy_eyeballs()
+    return conn
+
+
+class ConnectionPool(object):
+    ''' keeps idle connected sockets keyed by address and ssl context, acquired sockets are owned by the caller
+    until release, idle sockets which receive data or are closed by the peer are dropped, preconnected keys and
+    keys acquired within idle_timeout are kept filled to min_idle '''
+
+    def __init__(self, min_idle=None, max_idle=None, idle_timeout=None, connect_timeout=5, factory=None,
+                 check_interval=None, loop=None):
+        self._loop = loop or current()
+        self.min_idle = POOL_MIN_IDLE if min_idle is None else min_idle
+        self.max_idle = POOL_MAX_IDLE if max_idle is None else max_idle
+        self.idle_timeout = POOL_IDLE_TIMEOUT if idle_timeout is None else idle_timeout
+        self.connect_timeout = connect_timeout
+        self.check_interval = POOL_CHECK_INTERVAL if check_interval is None else check_interval
+        self._factory = factory or (lambda address, context: create_socket(address, context, self._loop))
+        self._idles = defaultdict(deque)
+        self._idle_keys = {}
+        self._connecting = defaultdict(int)
+        self._keys = {}
+        self._preconnect_keys = set()
+        self._actives = weakref.WeakKeyDictionary()
+        self._check_timeout = None
+        self._closed = False
+
+    async def acquire(self, address, context=None, timeout=None):
+        if self._closed:
+            raise RuntimeError("connection pool is closed")
+        key = (address, context)
+        if self.min_idle:
+            self._keys[key] = self._loop.time()
+        idles = self._idles.get(key)
+        while idles:
+            conn, _ = idles.pop()
+            self._unwatch(conn)
+            if conn.state != STATE_STREAMING or conn.buffer[0]:
+                conn.close()
+                continue
+            self._actives[conn] = key
+            self.fill(key)
+            return conn
+
+        self.fill(key)
+        conn = self._factory(address, context)
+        await conn.connectof(address, timeout or self.connect_timeout)
+        self._actives[conn] = key
+        return conn
+
+    def release(self, conn, reusable=True):
+        key = self._actives.pop(conn, None)
+        if key is None:
+            return False
+        if not reusable or self._closed or conn.state != STATE_STREAMING or conn.buffer[0] or conn.buffer[1]:
+            conn.close()
+            return False
+        return self._put_idle(key, conn)
+
+    def preconnect(self, address, context=None, count=None):
+        key = (address, context)
+        self._preconnect_keys.add(key)
+        return self.fill(key, count)
+
+    def fill(self, key, min_idle=None):
+        if self._closed:
+            return 0
+        count = (self.min_idle if min_idle is None else min_idle) \
+                - len(self._idles.get(key, ())) - self._connecting.get(key, 0)
+        for _ in range(count):
+            self._connecting[key] += 1
+            self._loop.call_async(self._connect, key)
+        if self.min_idle:
+            self._start_check()
+        return max(count, 0)
+
+    async def _connect(self, key):
+        address, context = key
+        try:
+            conn = self._factory(address, context)
+            await conn.connectof(address, self.connect_timeout)
+        except Exception as e:
+            get_logger().warning("connection pool connect %s error:%s", address, e)
+            return
+        finally:
+            self._connecting[key] -= 1
+            if not self._connecting[key]:
+                self._connecting.pop(key, None)
+        if self._closed:
+            conn.close()
+            return
+        self._put_idle(key, conn)
+
+    def _put_idle(self, key, conn):
+        idles = self._idles[key]
+        if len(idles) >= self.max_idle:
+            conn.close()
+            return False
+        self._watch(conn, key)
+        idles.append((conn, self._loop.time()))
+        self._start_check()
+        return True
+
+    def _watch(self, conn, key):
+        self._idle_keys[conn] = key
+        conn.on("close", self._on_idle_close)
+        conn.on("data", self._on_idle_data)
+
+    def _unwatch(self, conn):
+        self._idle_keys.pop(conn, None)
+        conn.off("close", self._on_idle_close)
+        conn.off("data", self._on_idle_data)
+
+    def _on_idle_close(self, conn):
+        key = self._idle_keys.pop(conn, None)
+        if key is None:
+            return
+        idles = self._idles.get(key)
+        if idles:
+            self._idles[key] = deque((idle_conn, idle_time) for idle_conn, idle_time in idles if idle_conn is not conn)
+
+    def _on_idle_data(self, conn, buffer):
+        conn.close()
+
+    def _start_check(self):
+        if self._check_timeout is None and not self._closed:
+            self._check_timeout = self._loop.add_timeout(self.check_interval, self.check)
+
+    def check(self):
+        self._check_timeout = None
+        now = self._loop.time()
+        for key in list(self._idles):
+            idles = self._idles[key]
+            while idles and now - idles[0][1] >= self.idle_timeout:
+                conn, _ = idles.popleft()
+                self._unwatch(conn)
+                conn.close()
+            if not idles:
+                self._idles.pop(key)
+        for key, acquire_time in list(self._keys.items()):
+            if now - acquire_time >= self.idle_timeout:
+                self._keys.pop(key)
+        if self.min_idle:
+            for key in self._preconnect_keys.union(self._keys):
+                self.fill(key)
+        if self._idles or (self.min_idle and (self._keys or self._preconnect_keys)):
+            self._start_check()
+
+    def idle_count(self, address=None, context=None):
+        if address is None:
+            return sum(len(idles) for idles in self._idles.values())
+        return len(self._idles.get((address, context), ()))
+
+    def close(self):
+        self._closed = True
+        if self._check_timeout is not None:
+            self._loop.cancel_timeout(self._check_timeout)
+            self._check_timeout = None
+        idles, self._idles = self._idles, defaultdict(deque)
+        for key_idles in idles.values():
+            for conn, _ in key_idles:
+                self._unwatch(conn)
+                conn.close()
+        self._keys.clear()
+        self._preconnect_keys.clear()
@@ -0,0 +1,199 @@
+# -*- coding: utf-8 -*-
+# 2026/10/17
+# create by: snower
+
+import os
+import traceback
+from .utils import get_logger, monotonic
+
+try:
+    import greenlet
+except ImportError:
+    greenlet = None
+
+HISTOGRAM_BUCKETS = 48
+
+
+class Histogram(object):
+    ''' log2 bucketed histogram, values are scaled to integers before bucketing '''
+
+    def __init__(self, scale=1000000):
+        self._scale = scale
+        self.buckets = [0] * HISTOGRAM_BUCKETS
+        self.count = 0
+        self.sum = 0
+        self.max = 0
+
+    def record(self, value):
+        self.buckets[min(int(value * self._scale).bit_length(), HISTOGRAM_BUCKETS - 1)] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, percent):
+        if not self.count:
+            return 0
+        target, count = self.count * percent / 100.0, 0
+        for index, bucket_count in enumerate(self.buckets):
+            count += bucket_count
+            if count >= target:
+                return min(float((1 << index) - 1) / self._scale, self.max) if index else 0
+        return self.max
+
+    def reset(self):
+        self.buckets = [0] * HISTOGRAM_BUCKETS
+        self.count = 0
+        self.sum = 0
+        self.max = 0
+
+    def snapshot(self):
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "avg": float(self.sum) / self.count if self.count else 0,
+            "max": self.max,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+        }
+
+
+_package_path = os.path.dirname(os.path.abspath(__file__))
+
+
+def callback_name(callback):
+    if greenlet is not None and isinstance(getattr(callback, "__self__", None), greenlet.greenlet):
+        frame = callback.__self__.gr_frame
+        while frame is not None and frame.f_back is not None and frame.f_code.co_filename.startswith(_package_path):
+            frame = frame.f_back
+        if frame is not None:
+            return "greenlet %s:%s:%s" % (frame.f_code.co_filename, frame.f_lineno, frame.f_code.co_name)
+    func = getattr(callback, "func", None)
+    if func is not None and getattr(callback, "args", None) is not None:
+        return "partial(%s)" % callback_name(func)
+    name = getattr(callback, "__qualname__", None) or getattr(callback, "__name__", None)
+    if name is None:
+        return repr(callback)
+    module = getattr(callback, "__module__", None)
+    return "%s.%s" % (module, name) if module else name
+
+
+def callback_stack(callback):
+    if greenlet is None or not isinstance(getattr(callback, "__self__", None), greenlet.greenlet):
+        return None
+    frame = callback.__self__.gr_frame
+    if frame is None:
+        return None
+    return "".join(traceback.format_stack(frame))
+
+
+class LoopStats(object):
+    ''' IOLoop collector, times are in seconds, only called by the loop when stats or slow callback is enabled '''
+
+    def __init__(self, collect=True, slow_callback_threshold=0, slow_callback_stack=False):
+        self.collect = collect
+        self.slow_callback_threshold = slow_callback_threshold
+        self.slow_callback_stack = slow_callback_stack
+        self.slow_callbacks = 0
+        self.iteration = Histogram()
+        self.callback = Histogram()
+        self.poll_wait = Histogram()
+        self.poll_events = Histogram(1)
+        self.timer_lag = Histogram()
+        self.handlers = Histogram(1)
+        self.timeout_handlers = Histogram(1)
+        self.start_time = monotonic()
+        self._poll_end_time = None
+
+    def poll(self, poll_start_time, poll_end_time, events, handlers, timeout_handlers):
+        if not self.collect:
+            return
+        if self._poll_end_time is not None:
+            self.iteration.record(poll_start_time - self._poll_end_time)
+        self._poll_end_time = poll_end_time
+        self.poll_wait.record(poll_end_time - poll_start_time)
+        self.poll_events.record(events)
+        self.handlers.record(handlers)
+        self.timeout_handlers.record(timeout_handlers)
+
+    def call(self, callback, args):
+        start_time = monotonic()
+        try:
+            return callback(*args)
+        finally:
+            elapsed = monotonic() - start_time
+            if self.collect:
+                self.callback.record(elapsed)
+            if 0 < self.slow_callback_threshold <= elapsed:
+                self.slow_callback(callback, elapsed)
+
+    def call_timeout(self, handler, now):
+        callback = handler.callback
+        if self.collect:
+            self.timer_lag.record(max(now - handler.deadline, 0))
+        start_time = monotonic()
+        try:
+            return callback(*handler.args, **handler.kwargs)
+        finally:
+            elapsed = monotonic() - start_time
+            if self.collect:
+                self.callback.record(elapsed)
+            if 0 < self.slow_callback_threshold <= elapsed:
+                self.slow_callback(callback, elapsed)
+
+    def slow_callback(self, callback, elapsed):
+        self.slow_callbacks += 1
+        try:
+            stack = callback_stack(callback) if self.slow_callback_stack else None
+            if stack:
+                get_logger().warning("loop slow callback %s took %.3fs, resumed greenlet stack:\n%s",
+                                     callback_name(callback), elapsed, stack)
+            else:
+                get_logger().warning("loop slow callback %s took %.3fs", callback_name(callback), elapsed)
+        except Exception as e:
+            get_logger().error("loop slow callback log error:%s", e)
+
+    def reset(self):
+        for histogram in (self.iteration, self.callback, self.poll_wait, self.poll_events,
+                          self.timer_lag, self.handlers, self.timeout_handlers):
+            histogram.reset()
+        self.slow_callbacks = 0
+        self._poll_end_time = None
+        self.start_time = monotonic()
+
+    def snapshot(self):
+        now = monotonic()
+        elapsed = now - self.start_time
+        return {
+            "elapsed": elapsed,
+            "utilization": min(self.iteration.sum / elapsed, 1) if elapsed > 0 else 0,
+            "slow_callbacks": self.slow_callbacks,
+            "iteration": self.iteration.snapshot(),
+            "callback": self.callback.snapshot(),
+            "poll_wait": self.poll_wait.snapshot(),
+            "poll_events": self.poll_events.snapshot(),
+            "timer_lag": self.timer_lag.snapshot(),
+            "handlers": self.handlers.snapshot(),
+            "timeout_handlers": self.timeout_handlers.snapshot(),
+        }
+
+
+def format_stats(stats):
+    lines = ["loop stats elapsed %.3fs utilization %.2f%% slow callbacks %d" % (
+        stats["elapsed"], stats["utilization"] * 100, stats["slow_callbacks"])]
+    for name in ("iteration", "callback", "poll_wait", "timer_lag"):
+        histogram = stats[name]
+        lines.append("%s count %d avg %.6fs p50 %.6fs p90 %.6fs p99 %.6fs max %.6fs" % (
+            name, histogram["count"], histogram["avg"], histogram["p50"], histogram["p90"],
+            histogram["p99"], histogram["max"]))
+    for name in ("poll_events", "handlers", "timeout_handlers"):
+        histogram = stats[name]
+        lines.append("%s count %d avg %.2f p50 %d p90 %d p99 %d max %d" % (
+            name, histogram["count"], histogram["avg"], histogram["p50"], histogram["p90"],
+            histogram["p99"], histogram["max"]))
+    return "\n".join(lines)
+
+
+def log_stats(loop, stats):
+    get_logger().info(format_stats(stats))
@@ -1,15 +1,46 @@
 # -*- coding: utf-8 -*-
 
+import os
+import sys
 import socket
 import errno
+from itertools import islice
 from .utils import is_py3, get_logger
 from .event import EventEmitter, null_emit_callback
 from .loop import instance, MODE_IN, MODE_OUT
-from .buffer import Buffer, BaseBuffer, cbuffer, RECV_BUFFER_SIZE
+from .buffer import Buffer, BaseBuffer, cbuffer, RECV_BUFFER_SIZE, RECV_MAX_CHUNKS
 from .dns import DNSResolver
 from .errors import SocketClosed, ResolveError, ConnectTimeout, AddressError, ConnectError
 
 MSG_FASTOPEN = 0x20000000
+SO_REUSEPORT = getattr(socket, "SO_REUSEPORT", 15)
+
+try:
+    SPLICE = bool(int(os.environ.get("SEVENT_TCP_SPLICE", 0)))
+except:
+    SPLICE = False
+
+try:
+    SPLICE_PIPE_SIZE = int(os.environ.get("SEVENT_TCP_SPLICE_PIPE_SIZE", 256 * 1024))
+except:
+    SPLICE_PIPE_SIZE = 256 * 1024
+
+SPLICE_SUPPORTED = hasattr(os, "splice") and sys.platform.startswith("linux")
+SPLICE_FLAGS = getattr(os, "SPLICE_F_MOVE", 1) | getattr(os, "SPLICE_F_NONBLOCK", 2)
+F_SETPIPE_SZ = 1031
+F_GETPIPE_SZ = 1032
+
+try:
+    CONNECT_ATTEMPT_DELAY = float(os.environ.get("SEVENT_CONNECT_ATTEMPT_DELAY", 0.25))
+except:
+    CONNECT_ATTEMPT_DELAY = 0.25
+
+SENDMSG_SUPPORTED = hasattr(socket.socket, "sendmsg")
+try:
+    SEND_IOV_MAX = os.sysconf("SC_IOV_MAX")
+    SEND_IOV_MAX = min(SEND_IOV_MAX, 1024) if SEND_IOV_MAX > 1 else 1024
+except:
+    SEND_IOV_MAX = 1024
 
 STATE_INITIALIZED = 0x01
 STATE_CONNECTING = 0x02
@@ -39,16 +70,32 @@ class Socket(EventEmitter):
         self._connect_handler = False
         self._connect_timeout = 5
         self._connect_timeout_handler = None
+        self._connect_attempts = None
+        self._connect_attempt_ips = None
+        self._connect_attempt_handler = None
+        self._connect_attempt_error = None
         self._read_handler = False
         self._write_handler = False
+        self._recv_chunks = 1
+        self._edge_triggered = False
+        self._readable = False
+        self._writable = True
+        self._edge_data_pending = False
         self._max_buffer_size = max_buffer_size or self.MAX_BUFFER_SIZE
         self._rbuffers = Buffer(max_buffer_size=self._max_buffer_size)
         self._wbuffers = Buffer(max_buffer_size=self._max_buffer_size)
         self._state = STATE_INITIALIZED
         self._is_enable_fast_open = False
         self._is_enable_nodelay = False
+        self._is_enable_happy_eyeballs = False
+        self._connect_attempt_delay = CONNECT_ATTEMPT_DELAY
         self._is_resolve = False
         self._has_drain_event = False
+        self._is_enable_splice = SPLICE
+        self._splice_peer = None
+        self._splice_pipe = None
+        self._splice_pipe_len = 0
+        self._splice_pipe_size = 0
         self.ignore_write_closed_error = False
 
         if self._socket:
@@ -56,7 +103,11 @@ class Socket(EventEmitter):
             try:
                 self._fileno = self._socket.fileno()
                 self._socket.setblocking(False)
-                self._read_handler = self._loop.add_fd(self._fileno, MODE_IN, self._read_cb)
+                if self._loop._edge_triggered:
+                    self._edge_triggered = True
+                    self._read_handler = self._loop.add_edge_fd(self._fileno, self._edge_read_cb, self._edge_write_cb)
+                else:
+                    self._read_handler = self._loop.add_fd(self._fileno, MODE_IN, self._read_cb)
 
                 self._rbuffers.on("drain", lambda _: self.drain())
                 self._rbuffers.on("regain", lambda _: self.regain())
@@ -133,6 +184,9 @@ class Socket(EventEmitter):
     def on_drain(self, callback):
         self.on("drain", callback)
 
+    def on_splice(self, callback):
+        self.on("splice", callback)
+
     def off_connect(self, callback):
         self.on("connect", callback)
 
@@ -208,6 +262,22 @@ class Socket(EventEmitter):
     def is_enable_nodelay(self):
         return self._is_enable_nodelay
 
+    def enable_happy_eyeballs(self, connect_attempt_delay=None):
+        self._is_enable_happy_eyeballs = True
+        if connect_attempt_delay is not None:
+            self._connect_attempt_delay = connect_attempt_delay
+
+    @property
+    def is_enable_happy_eyeballs(self):
+        return self._is_enable_happy_eyeballs
+
+    def enable_splice(self):
+        self._is_enable_splice = True
+
+    @property
+    def is_enable_splice(self):
+        return self._is_enable_splice
+
     def end(self):
         if self._state not in (STATE_INITIALIZED, STATE_CONNECTING, STATE_STREAMING):
             return
@@ -233,6 +303,18 @@ class Socket(EventEmitter):
             if self._connect_timeout_handler:
                 self._loop.cancel_timeout(self._connect_timeout_handler)
                 self._connect_timeout_handler = None
+        elif self._state == STATE_CONNECTING and self._connect_attempts is not None:
+            self._close_connect_attempts()
+            if self._connect_timeout_handler:
+                self._loop.cancel_timeout(self._connect_timeout_handler)
+                self._connect_timeout_handler = None
+        elif self._state in (STATE_STREAMING, STATE_CLOSING) and (self._edge_triggered or self._splice_pipe is not None):
+            try:
+                self._loop.clear_fd(self._fileno)
+            except Exception as e:
+                get_logger().error("socket close clear_fd error:%s", e)
+            self._read_handler = False
+            self._write_handler = False
         elif self._state in (STATE_STREAMING, STATE_CLOSING):
             if self._read_handler:
                 try:
@@ -258,6 +340,13 @@ class Socket(EventEmitter):
                     self._socket.close()
                 except Exception as e:
                     get_logger().error("socket close socket error: %s", e)
+            if self._splice_pipe is not None:
+                for fd in self._splice_pipe:
+                    try:
+                        os.close(fd)
+                    except Exception as e:
+                        get_logger().error("socket close splice pipe error: %s", e)
+                self._splice_pipe, self._splice_peer = None, None
 
             try:
                 self.emit_close(self)
@@ -291,7 +380,11 @@ class Socket(EventEmitter):
 
         self._state = STATE_STREAMING
         try:
-            self._read_handler = self._loop.add_fd(self._fileno, MODE_IN, self._read_cb)
+            if self._loop._edge_triggered:
+                self._edge_triggered = True
+                self._read_handler = self._loop.add_edge_fd(self._fileno, self._edge_read_cb, self._edge_write_cb)
+            else:
+                self._read_handler = self._loop.add_fd(self._fileno, MODE_IN, self._read_cb)
         except Exception as e:
             return self._error(e)
 
@@ -299,6 +392,11 @@ class Socket(EventEmitter):
         self._rbuffers.on("regain", lambda _: self.regain())
         self._loop.add_async(self.emit_connect, self)
 
+        if self._edge_triggered:
+            if self._wbuffers:
+                self._write_handler = True
+            return
+
         if self._wbuffers and not self._write_handler:
             try:
                 self._write_handler = self._loop.add_fd(self._fileno, MODE_OUT, self._write_cb)
@@ -373,13 +471,143 @@ class Socket(EventEmitter):
             except Exception as e:
                 return self._loop.add_async(self._error, e)
 
-        self._dns_resolver.resolve(address[0], do_connect)
+        def do_connect_all(hostname, ips):
+            if self._state == STATE_CLOSED:
+                return
+            if len(ips) <= 1 or (self._is_enable_fast_open and self._wbuffers):
+                return do_connect(hostname, ips[0] if ips else None)
+
+            self._connect_attempts = []
+            self._connect_attempt_ips = self.sort_connect_ips(ips)
+            self._start_connect_attempt(address)
+
+        if self._is_enable_happy_eyeballs:
+            self._dns_resolver.resolve_all(address[0], do_connect_all)
+        else:
+            self._dns_resolver.resolve(address[0], do_connect)
         self._connect_timeout_handler = self._loop.add_timeout(timeout, on_timeout_cb)
         self._state = STATE_CONNECTING
 
+    @staticmethod
+    def sort_connect_ips(ips):
+        families = ([], [])
+        for ip in ips:
+            families[0 if (":" in ip) == (":" in ips[0]) else 1].append(ip)
+        sorted_ips = []
+        for index in range(max(len(families[0]), len(families[1]))):
+            sorted_ips.extend(family_ips[index] for family_ips in families if index < len(family_ips))
+        return sorted_ips
+
+    def _start_connect_attempt(self, address):
+        self._connect_attempt_handler = None
+        if self._state == STATE_CLOSED or self._connect_attempts is None:
+            return
+
+        while self._connect_attempt_ips:
+            ip = self._connect_attempt_ips.pop(0)
+            connect_socket = None
+            try:
+                addrinfo = socket.getaddrinfo(ip, address[1], 0, 0, socket.SOL_TCP)
+                if not addrinfo:
+                    self._connect_attempt_error = AddressError('address info unknown %s' % str(address))
+                    continue
+                addr = addrinfo[0]
+                connect_socket = socket.socket(addr[0], addr[1], addr[2])
+                connect_socket.setblocking(False)
+                attempt = [connect_socket, addr, None]
+                attempt[2] = lambda: self._connect_attempt_cb(attempt, address)
+                self._loop.add_fd(connect_socket.fileno(), MODE_OUT, attempt[2])
+                self._connect_attempts.append(attempt)
+                connect_socket.connect(addr[4])
+            except socket.error as e:
+                if e.args[0] not in (errno.EINPROGRESS, errno.EWOULDBLOCK):
+                    if connect_socket is not None:
+                        self._remove_connect_attempt(connect_socket)
+                    self._connect_attempt_error = e
+                    continue
+            except Exception as e:
+                if connect_socket is not None:
+                    self._remove_connect_attempt(connect_socket)
+                self._connect_attempt_error = e
+                continue
+
+            if self._connect_attempt_ips:
+                self._connect_attempt_handler = self._loop.add_timeout(self._connect_attempt_delay,
+                                                                       self._start_connect_attempt, address)
+            return
+
+        if not self._connect_attempts:
+            self._connect_attempts = None
+            e = self._connect_attempt_error
+            self._loop.add_async(self._error, ConnectError(address, e, "connect error %s %s" % (str(address), e)))
+
+    def _connect_attempt_cb(self, attempt, address):
+        if self._state != STATE_CONNECTING or self._connect_attempts is None:
+            return
+        connect_socket, addr, _ = attempt
+        try:
+            error = connect_socket.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+        except Exception as e:
+            error = e
+        if error:
+            self._remove_connect_attempt(connect_socket)
+            self._connect_attempt_error = error if isinstance(error, Exception) \
+                else socket.error(error, os.strerror(error))
+            if self._connect_attempt_handler:
+                self._loop.cancel_timeout(self._connect_attempt_handler)
+            return self._start_connect_attempt(address)
+
+        self._connect_attempts = [connect_attempt for connect_attempt in self._connect_attempts
+                                  if connect_attempt is not attempt]
+        try:
+            self._loop.clear_fd(connect_socket.fileno())
+        except Exception as e:
+            get_logger().error("socket connect attempt clear_fd error:%s", e)
+        self._close_connect_attempts()
+        self._socket = connect_socket
+        self._fileno = connect_socket.fileno()
+        self._socket_family = addr[0]
+        self._address = addr[4]
+        self._is_resolve = True
+
+        if self._is_enable_nodelay:
+            try:
+                self._socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            except Exception as e:
+                get_logger().warning('nodela error: %s', e)
+                self._is_enable_nodelay = False
+
+        try:
+            self._connect_handler = self._loop.add_fd(self._fileno, MODE_OUT, self._connect_cb)
+        except Exception as e:
+            return self._error(e)
+
+    def _remove_connect_attempt(self, connect_socket):
+        self._connect_attempts = [connect_attempt for connect_attempt in self._connect_attempts
+                                  if connect_attempt[0] is not connect_socket]
+        try:
+            self._loop.clear_fd(connect_socket.fileno())
+        except Exception as e:
+            get_logger().error("socket connect attempt clear_fd error:%s", e)
+        try:
+            connect_socket.close()
+        except Exception as e:
+            get_logger().error("socket connect attempt close error:%s", e)
+
+    def _close_connect_attempts(self):
+        if self._connect_attempt_handler:
+            self._loop.cancel_timeout(self._connect_attempt_handler)
+            self._connect_attempt_handler = None
+        while self._connect_attempts:
+            self._remove_connect_attempt(self._connect_attempts[0][0])
+        self._connect_attempts, self._connect_attempt_ips = None, None
+
     def drain(self):
         if self._state in (STATE_STREAMING, STATE_CLOSING):
             if self._read_handler:
+                if self._edge_triggered:
+                    self._read_handler = False
+                    return
                 try:
                     self._loop.remove_fd(self._fileno, self._read_cb)
                 except Exception as e:
@@ -389,6 +617,11 @@ class Socket(EventEmitter):
     def regain(self):
         if self._state in (STATE_STREAMING, STATE_CLOSING):
             if not self._read_handler:
+                if self._edge_triggered:
+                    self._read_handler = True
+                    if self._readable:
+                        self._loop.add_async(self._edge_read_cb)
+                    return
                 try:
                     self._read_handler = self._loop.add_fd(self._fileno, MODE_IN, self._read_cb)
                 except Exception as e:
@@ -419,9 +652,10 @@ class Socket(EventEmitter):
     if cbuffer is None:
         def _read(self):
             last_data_len = self._rbuffers._len
+            recv_size = self.RECV_BUFFER_SIZE * self._recv_chunks
             while self._read_handler:
                 try:
-                    data = self._socket.recv(self.RECV_BUFFER_SIZE)
+                    data = self._socket.recv(recv_size)
                     if not data:
                         break
                     BaseBuffer.write(self._rbuffers, data)
@@ -437,10 +671,11 @@ class Socket(EventEmitter):
                     self._error(e)
                     return False
                 else:
-                    if self._rbuffers._len > self._rbuffers._len:
+                    if self._rbuffers._len > self._rbuffers._drain_size:
                         break
 
             if last_data_len < self._rbuffers._len:
+                self._adjust_recv_chunks(self._rbuffers._len - last_data_len)
                 if self._rbuffers._len > self._rbuffers._drain_size and not self._rbuffers._full:
                     self._rbuffers.do_drain()
                 return True
@@ -448,17 +683,120 @@ class Socket(EventEmitter):
     else:
         def _read(self):
             try:
-                r = self._rbuffers.socket_recv(self._fileno, self._rbuffers._drain_size)
+                r = self._rbuffers.socket_recv(self._fileno, self._rbuffers._drain_size, 0, self._recv_chunks)
             except Exception as e:
                 self._error(e)
                 if self._rbuffers._len > self._rbuffers._drain_size and not self._rbuffers._full:
                     self._rbuffers.do_drain()
                 return False
 
+            self._adjust_recv_chunks(r)
             if self._rbuffers._len > self._rbuffers._drain_size and not self._rbuffers._full:
                 self._rbuffers.do_drain()
             return r
 
+    def _adjust_recv_chunks(self, recv_len):
+        recv_size = self.RECV_BUFFER_SIZE * self._recv_chunks
+        if recv_len >= recv_size:
+            if self._recv_chunks < RECV_MAX_CHUNKS:
+                self._recv_chunks <<= 1
+        elif 0 < recv_len < recv_size >> 2 and self._recv_chunks > 1:
+            self._recv_chunks >>= 1
+
+    def _edge_read_cb(self):
+        self._readable = True
+        if not self._read_handler or not self._edge_triggered or self._state not in (STATE_STREAMING, STATE_CLOSING):
+            return
+
+        last_data_len = self._rbuffers._len
+        r = self._edge_read()
+        if r is None:
+            return
+        if self._rbuffers._len > last_data_len and not self._edge_data_pending:
+            self._edge_data_pending = True
+            self._loop.add_async(self._edge_emit_data)
+        if r < 0:
+            self._readable = False
+            return
+        if r > 0:
+            self._loop.add_async(self._edge_read_cb)
+            return
+
+        self._loop.add_async(self.emit_end, self)
+        self.close()
+
+    def _edge_emit_data(self):
+        self._edge_data_pending = False
+        if self._rbuffers is not None and self._rbuffers._len:
+            self.emit_data(self, self._rbuffers)
+
+    if cbuffer is None:
+        def _edge_read(self):
+            recv_len = 0
+            recv_size = self.RECV_BUFFER_SIZE * self._recv_chunks
+            while True:
+                try:
+                    data = self._socket.recv(recv_size)
+                    if not data:
+                        break
+                    BaseBuffer.write(self._rbuffers, data)
+                    recv_len += len(data)
+                except socket.error as e:
+                    if e.args[0] in (errno.EWOULDBLOCK, errno.EAGAIN):
+                        recv_len = ~recv_len
+                        break
+                    self._error(e)
+                    if self._rbuffers._len > self._rbuffers._drain_size and not self._rbuffers._full:
+                        self._rbuffers.do_drain()
+                    return None
+                except Exception as e:
+                    self._error(e)
+                    return None
+                else:
+                    if self._rbuffers._len > self._rbuffers._drain_size:
+                        break
+
+            self._adjust_recv_chunks(~recv_len if recv_len < 0 else recv_len)
+            if self._rbuffers._len > self._rbuffers._drain_size and not self._rbuffers._full:
+                self._rbuffers.do_drain()
+            return recv_len
+    else:
+        def _edge_read(self):
+            try:
+                r = self._rbuffers.socket_recv(self._fileno, self._rbuffers._drain_size, 1, self._recv_chunks)
+            except Exception as e:
+                self._error(e)
+                if self._rbuffers._len > self._rbuffers._drain_size and not self._rbuffers._full:
+                    self._rbuffers.do_drain()
+                return None
+
+            self._adjust_recv_chunks(~r if r < 0 else r)
+            if self._rbuffers._len > self._rbuffers._drain_size and not self._rbuffers._full:
+                self._rbuffers.do_drain()
+            return r
+
+    def _edge_write_cb(self):
+        self._writable = True
+        if not self._write_handler or not self._edge_triggered or self._state not in (STATE_STREAMING, STATE_CLOSING):
+            return
+
+        if self._edge_write():
+            self._write_handler = False
+            if self._has_drain_event:
+                self._loop.add_async(self.emit_drain, self)
+            if self._state == STATE_CLOSING:
+                self.close()
+
+    def _edge_write(self):
+        wbuffer_len = self._wbuffers._len
+        if self._write():
+            return True
+        if self._wbuffers is not None and self._wbuffers._len < wbuffer_len:
+            self._loop.add_async(self._edge_write_cb)
+        else:
+            self._writable = False
+        return False
+
     def _write_cb(self):
         if self._state == STATE_CONNECTING:
             self._connect_cb()
@@ -493,6 +831,31 @@ class Socket(EventEmitter):
             while self._wbuffers:
                 data = self._wbuffers
                 try:
+                    if data._buffers and SENDMSG_SUPPORTED:
+                        iov = [memoryview(data._buffer)[data._buffer_index:] if data._buffer_index > 0 else data._buffer]
+                        iov.extend(islice(data._buffers, SEND_IOV_MAX - 1))
+                        r = self._socket.sendmsg(iov)
+                        data._len -= r
+                        if data._len > 0:
+                            sent_all = r >= sum(len(buffer) for buffer in iov)
+                            while r >= data._buffer_len - data._buffer_index:
+                                r -= data._buffer_len - data._buffer_index
+                                data._buffer = data._buffers.popleft()
+                                data._buffer_odata = data._buffers_odata.popleft() if data._buffers_odata else None
+                                data._buffer_index, data._buffer_len = 0, len(data._buffer)
+                            data._buffer_index += r
+                        else:
+                            sent_all = True
+                            data._buffers.clear()
+                            if data._buffers_odata:
+                                data._buffers_odata.clear()
+                            data._buffer_index, data._buffer_len, data._buffer, data._buffer_odata = 0, 0, b'', None
+                        if data._full and data._len < data._regain_size:
+                            data.do_regain()
+                        if not sent_all:
+                            return False
+                        continue
+
                     if data._buffer_index > 0:
                         r = self._socket.send(memoryview(data._buffer)[data._buffer_index:])
                     else:
@@ -503,7 +866,7 @@ class Socket(EventEmitter):
                     if data._buffer_index >= data._buffer_len:
                         if data._len > 0:
                             data._buffer = data._buffers.popleft()
-                            data._buffer_odata = data._buffers_odata.popleft()
+                            data._buffer_odata = data._buffers_odata.popleft() if data._buffers_odata else None
                             data._buffer_index, data._buffer_len = 0, len(data._buffer)
                         else:
                             data._buffer_index, data._buffer_len, data._buffer, data._buffer_odata = 0, 0, b'', None
@@ -565,6 +928,16 @@ class Socket(EventEmitter):
         else:
             BaseBuffer.write(self._wbuffers, data)
 
+        if not self._write_handler and self._edge_triggered:
+            if self._writable and self._edge_write():
+                if self._has_drain_event:
+                    self._loop.add_async(self.emit_drain, self)
+                return True
+            self._write_handler = True
+            if self._wbuffers._len > self._wbuffers._drain_size and not self._wbuffers._full:
+                self._wbuffers.do_drain()
+            return False
+
         if not self._write_handler:
             if self._write():
                 if self._has_drain_event:
@@ -590,6 +963,12 @@ class Socket(EventEmitter):
 
         self.ignore_write_closed_error = True
         socket.ignore_write_closed_error = True
+        if self._state == STATE_STREAMING and socket._state == STATE_STREAMING \
+                and self._can_splice(socket) and self._link_splice(socket):
+            self.on_close(lambda s: socket.end())
+            socket.on_close(lambda s: self.end())
+            return
+
         rbuffer, wbuffer = socket.buffer
         if self._state != STATE_STREAMING:
             if self._is_enable_fast_open and rbuffer:
@@ -627,6 +1006,153 @@ class Socket(EventEmitter):
         self.on_close(lambda s: socket.end())
         socket.on_close(lambda s: self.end())
 
+    def _can_splice(self, socket):
+        if not SPLICE_SUPPORTED:
+            return False
+        # wrapped sockets never run Socket.__init__, check the type before any attribute
+        for s in (self, socket):
+            if not isinstance(s, Socket) or isinstance(s, WarpSocket) or not s._is_enable_splice:
+                return False
+            # a replaced write inspects or limits data, it must keep seeing it
+            if getattr(s.write, "__func__", None) is not getattr(s.__class__.write, "__func__", s.__class__.write):
+                return False
+        return True
+
+    def _open_splice_pipe(self):
+        r, w = os.pipe2(os.O_NONBLOCK | os.O_CLOEXEC)
+        self._splice_pipe, self._splice_pipe_len = (r, w), 0
+        try:
+            import fcntl
+            try:
+                fcntl.fcntl(w, F_SETPIPE_SZ, SPLICE_PIPE_SIZE)
+            except (IOError, OSError):
+                pass
+            self._splice_pipe_size = fcntl.fcntl(w, F_GETPIPE_SZ)
+        except (IOError, OSError):
+            self._splice_pipe_size = 65536
+
+    def _link_splice(self, socket):
+        try:
+            self._open_splice_pipe()
+            socket._open_splice_pipe()
+        except Exception as e:
+            get_logger().warning("splice pipe error: %s", e)
+            for s in (self, socket):
+                if s._splice_pipe is not None:
+                    for fd in s._splice_pipe:
+                        os.close(fd)
+                    s._splice_pipe = None
+            return False
+
+        self._splice_peer, socket._splice_peer = socket, self
+        for s in (self, socket):
+            try:
+                if s._edge_triggered:
+                    self._loop.clear_fd(s._fileno)
+                    s._edge_triggered = False
+                else:
+                    if s._read_handler:
+                        self._loop.remove_fd(s._fileno, s._read_cb)
+                    if s._write_handler:
+                        self._loop.remove_fd(s._fileno, s._write_cb)
+                s._read_handler, s._write_handler = False, False
+                s._read_handler = self._loop.add_fd(s._fileno, MODE_IN, s._splice_read_cb)
+            except Exception as e:
+                s._error(e)
+
+        # data already read is forwarded ahead of the spliced stream
+        for s, peer in ((self, socket), (socket, self)):
+            if s._rbuffers:
+                BaseBuffer.extend(peer._wbuffers, s._rbuffers)
+            if s._rbuffers._full:
+                s._rbuffers.do_regain()
+        for s in (self, socket):
+            if s._wbuffers:
+                s._splice_write_cb()
+        return True
+
+    def _splice_read_cb(self):
+        if not self._read_handler or self._state not in (STATE_STREAMING, STATE_CLOSING):
+            return
+        peer = self._splice_peer
+        if peer is None or peer._state not in (STATE_STREAMING, STATE_CLOSING):
+            return self._splice_pause()
+
+        room = peer._splice_pipe_size - peer._splice_pipe_len
+        if room <= 0:
+            return self._splice_pause()
+        try:
+            r = os.splice(self._fileno, peer._splice_pipe[1], room, flags=SPLICE_FLAGS)
+        except (IOError, OSError) as e:
+            if e.args[0] in (errno.EWOULDBLOCK, errno.EAGAIN):
+                return
+            return self._error(e)
+
+        if not r:
+            self._loop.add_async(self.emit_end, self)
+            return self.close()
+        peer._splice_pipe_len += r
+        if not peer._write_handler:
+            peer._splice_write_cb()
+        if peer._splice_pipe_len >= peer._splice_pipe_size:
+            self._splice_pause()
+
+    def _splice_pause(self):
+        if self._read_handler:
+            try:
+                self._loop.remove_fd(self._fileno, self._splice_read_cb)
+            except Exception as e:
+                return self._error(e)
+            self._read_handler = False
+
+    def _splice_resume(self):
+        if not self._read_handler and self._state in (STATE_STREAMING, STATE_CLOSING):
+            try:
+                self._read_handler = self._loop.add_fd(self._fileno, MODE_IN, self._splice_read_cb)
+            except Exception as e:
+                self._error(e)
+
+    def _splice_write(self):
+        if self._wbuffers:
+            wbuffer_len = self._wbuffers._len
+            done = self._write()
+            if self._wbuffers is not None and self._wbuffers._len < wbuffer_len:
+                self.emit_splice(self, wbuffer_len - self._wbuffers._len)
+            if not done:
+                return False
+
+        while self._splice_pipe_len > 0:
+            try:
+                r = os.splice(self._splice_pipe[0], self._fileno, self._splice_pipe_len, flags=SPLICE_FLAGS)
+            except (IOError, OSError) as e:
+                if e.args[0] not in (errno.EWOULDBLOCK, errno.EAGAIN):
+                    self._error(e)
+                return False
+            self._splice_pipe_len -= r
+            self.emit_splice(self, r)
+        return True
+
+    def _splice_write_cb(self):
+        if self._state not in (STATE_STREAMING, STATE_CLOSING):
+            return
+
+        if self._splice_write():
+            if self._write_handler:
+                try:
+                    self._loop.remove_fd(self._fileno, self._splice_write_cb)
+                except Exception as e:
+                    return self._error(e)
+                self._write_handler = False
+            if self._splice_peer is not None:
+                self._splice_peer._splice_resume()
+            if self._state == STATE_CLOSING:
+                self.close()
+        elif not self._write_handler and self._state in (STATE_STREAMING, STATE_CLOSING):
+            try:
+                self._write_handler = self._loop.add_fd(self._fileno, MODE_OUT, self._splice_write_cb)
+            except Exception as e:
+                self._error(e)
+
 
 class Server(EventEmitter):
     def __init__(self, loop=None, dns_resolver=None):
@@ -639,6 +1165,7 @@ class Server(EventEmitter):
         self._accept_handler = False
         self._is_enable_fast_open = False
         self._is_reuseaddr = False
+        self._is_reuseport = False
         self._is_enable_nodelay = False
         self._is_resolve = False
 
@@ -675,6 +1202,9 @@ class Server(EventEmitter):
     def enable_reuseaddr(self):
         self._is_reuseaddr = True
 
+    def enable_reuseport(self):
+        self._is_reuseport = True
+
     def enable_nodelay(self):
         self._is_enable_nodelay = True
 
@@ -694,6 +1224,10 @@ class Server(EventEmitter):
     def is_reuseaddr(self):
         return self._is_reuseaddr
 
+    @property
+    def is_reuseport(self):
+        return self._is_reuseport
+
     @property
     def is_enable_nodelay(self):
         return self._is_enable_nodelay
@@ -726,6 +1260,13 @@ class Server(EventEmitter):
                         get_logger().warning('reuseaddr error: %s', e)
                         self._is_reuseaddr = False
 
+                if self._is_reuseport:
+                    try:
+                        self._socket.setsockopt(socket.SOL_SOCKET, SO_REUSEPORT, 1)
+                    except Exception as e:
+                        get_logger().warning('reuseport error: %s', e)
+                        self._is_reuseport = False
+
                 if self._is_enable_fast_open:
                     try:
                         self._socket.setsockopt(socket.SOL_TCP, 23, 5)
@@ -840,6 +1381,13 @@ class WarpSocket(Socket):
     def is_enable_nodelay(self):
         return self._socket.is_enable_nodelay
 
+    def enable_happy_eyeballs(self, connect_attempt_delay=None):
+        self._socket.enable_happy_eyeballs(connect_attempt_delay)
+
+    @property
+    def is_enable_happy_eyeballs(self):
+        return self._socket.is_enable_happy_eyeballs
+
     def on(self, event_name, callback):
         if event_name == "drain" and not self._has_on_drain_event:
             self._socket.on_drain(self._do_drain)
@@ -946,6 +1494,9 @@ class WarpServer(Server):
     def enable_reuseaddr(self):
         self._socket.enable_reuseaddr()
 
+    def enable_reuseport(self):
+        self._socket.enable_reuseport()
+
     def enable_nodelay(self):
         self._socket.enable_nodelay()
 
@@ -965,6 +1516,10 @@ class WarpServer(Server):
     def is_reuseaddr(self):
         return self._socket.is_reuseaddr
 
+    @property
+    def is_reuseport(self):
+        return self._socket.is_reuseport
+
     @property
     def is_enable_nodelay(self):
         return self._socket.is_enable_nodelay
@@ -2,7 +2,10 @@
 # 2014/12/28
 # create by: snower
 
+import os
+import sys
 import time
+import struct
 import socket
 import errno
 from .utils import is_py3, get_logger
@@ -12,6 +15,28 @@ from .dns import DNSResolver
 from .buffer import Buffer, BaseBuffer, cbuffer, RECV_BUFFER_SIZE
 from .errors import SocketClosed, ResolveError, AddressError, ConnectError
 
+MMSG = not os.environ.get("SEVENT_UDP_NOUSE_MMSG", False) and cbuffer is not None \
+       and hasattr(cbuffer.Buffer, "socket_recvmmsg")
+
+try:
+    GSO = bool(int(os.environ.get("SEVENT_UDP_GSO", 0)))
+except:
+    GSO = False
+
+try:
+    GRO = bool(int(os.environ.get("SEVENT_UDP_GRO", 0)))
+except:
+    GRO = False
+
+UDP_OFFLOAD_SUPPORTED = sys.platform.startswith("linux") and hasattr(socket.socket, "sendmsg") \
+                        and (cbuffer is None or hasattr(cbuffer.Buffer, "socket_sendgso"))
+SOL_UDP = getattr(socket, "SOL_UDP", 17)
+UDP_SEGMENT = getattr(socket, "UDP_SEGMENT", 103)
+UDP_GRO = getattr(socket, "UDP_GRO", 104)
+GSO_MAX_SEGMENTS = 64
+GSO_MAX_SIZE = 65000
+GRO_BUFFER_SIZE = 65536
+
 STATE_INITIALIZED = 0x01
 STATE_CONNECTING = 0x02
 STATE_STREAMING = 0x04
@@ -41,6 +66,8 @@ class Socket(EventEmitter):
         self._write_handler = None
         self._has_drain_event = False
         self._is_enable_broadcast = False
+        self._is_enable_gso = False
+        self._is_enable_gro = False
 
         self._max_buffer_size = max_buffer_size or self.MAX_BUFFER_SIZE
         self._rbuffers = Buffer(max_buffer_size=self._max_buffer_size)
@@ -48,6 +75,10 @@ class Socket(EventEmitter):
         self._address_cache = {}
         self._state = STATE_INITIALIZED
         self.ignore_write_closed_error = False
+        if GSO:
+            self.enable_gso()
+        if GRO:
+            self.enable_gro()
 
     @property
     def state(self):
@@ -79,6 +110,8 @@ class Socket(EventEmitter):
                 self._socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
                 if self._is_enable_broadcast:
                     self.enable_broadcast()
+                if self._is_enable_gro:
+                    self.enable_gro()
                 self._state = STATE_STREAMING
 
                 self._read_handler = self._loop.add_fd(self._fileno, MODE_IN, self._read_cb)
@@ -197,6 +230,44 @@ class Socket(EventEmitter):
     def is_enable_broadcast(self):
         return self._is_enable_broadcast
 
+    def enable_gso(self):
+        if not UDP_OFFLOAD_SUPPORTED:
+            get_logger().warning('gso error: UDP_SEGMENT is not supported')
+            return
+        self._is_enable_gso = True
+
+    def disable_gso(self):
+        self._is_enable_gso = False
+
+    @property
+    def is_enable_gso(self):
+        return self._is_enable_gso
+
+    def enable_gro(self):
+        if not UDP_OFFLOAD_SUPPORTED:
+            get_logger().warning('gro error: UDP_GRO is not supported')
+            return
+        if self._socket:
+            try:
+                self._socket.setsockopt(SOL_UDP, UDP_GRO, 1)
+            except Exception as e:
+                get_logger().warning('gro error: %s', e)
+                self._is_enable_gro = False
+                return
+        self._is_enable_gro = True
+
+    def disable_gro(self):
+        if self._socket and self._is_enable_gro:
+            try:
+                self._socket.setsockopt(SOL_UDP, UDP_GRO, 0)
+            except Exception as e:
+                get_logger().warning('gro error: %s', e)
+        self._is_enable_gro = False
+
+    @property
+    def is_enable_gro(self):
+        return self._is_enable_gro
+
     def end(self):
         if self._state in (STATE_STREAMING, STATE_BINDING):
             if not self._write_handler:
@@ -269,7 +340,7 @@ class Socket(EventEmitter):
 
     def _read_cb(self):
         if self._state in (STATE_STREAMING, STATE_BINDING):
-            if self._read():
+            if self._read_gro() if self._is_enable_gro else self._read():
                 self._loop.add_async(self.emit_data, self, self._rbuffers)
 
     if cbuffer is None:
@@ -291,7 +362,7 @@ class Socket(EventEmitter):
                     self._error(e)
                     return
                 else:
-                    if self._rbuffers._len > self._rbuffers._len:
+                    if self._rbuffers._len > self._rbuffers._drain_size:
                         break
 
             if last_data_len < self._rbuffers._len:
@@ -299,6 +370,19 @@ class Socket(EventEmitter):
                     self._rbuffers.do_drain()
                 return True
             return False
+    elif MMSG:
+        def _read(self):
+            try:
+                r = self._rbuffers.socket_recvmmsg(self._fileno, self._socket_family, self._rbuffers._drain_size)
+            except Exception as e:
+                self._error(e)
+                if self._rbuffers._len > self._rbuffers._drain_size and not self._rbuffers._full:
+                    self._rbuffers.do_drain()
+                return False
+
+            if self._rbuffers._len > self._rbuffers._drain_size and not self._rbuffers._full:
+                self._rbuffers.do_drain()
+            return r
     else:
         def _read(self):
             try:
@@ -313,9 +397,58 @@ class Socket(EventEmitter):
                 self._rbuffers.do_drain()
             return r
 
+    if cbuffer is None:
+        def _read_gro(self):
+            last_data_len = self._rbuffers._len
+            while self._read_handler:
+                try:
+                    data, ancdata, _, address = self._socket.recvmsg(GRO_BUFFER_SIZE, socket.CMSG_SPACE(4))
+                    segment_size = 0
+                    for cmsg_level, cmsg_type, cmsg_data in ancdata:
+                        if cmsg_level == SOL_UDP and cmsg_type == UDP_GRO:
+                            segment_size = struct.unpack("=i", cmsg_data[:4])[0]
+                    if 0 < segment_size < len(data):
+                        for i in range(0, len(data), segment_size):
+                            BaseBuffer.write(self._rbuffers, data[i: i + segment_size], address)
+                    else:
+                        BaseBuffer.write(self._rbuffers, data, address)
+                except socket.error as e:
+                    if e.args[0] in (errno.EWOULDBLOCK, errno.EAGAIN):
+                        break
+                    else:
+                        self._error(e)
+                        if self._rbuffers._len > self._rbuffers._drain_size and not self._rbuffers._full:
+                            self._rbuffers.do_drain()
+                        return False
+                except Exception as e:
+                    self._error(e)
+                    return
+                else:
+                    if self._rbuffers._len > self._rbuffers._drain_size:
+                        break
+
+            if last_data_len < self._rbuffers._len:
+                if self._rbuffers._len > self._rbuffers._drain_size and not self._rbuffers._full:
+                    self._rbuffers.do_drain()
+                return True
+            return False
+    else:
+        def _read_gro(self):
+            try:
+                r = self._rbuffers.socket_recvgro(self._fileno, self._socket_family, self._rbuffers._drain_size)
+            except Exception as e:
+                self._error(e)
+                if self._rbuffers._len > self._rbuffers._drain_size and not self._rbuffers._full:
+                    self._rbuffers.do_drain()
+                return False
+
+            if self._rbuffers._len > self._rbuffers._drain_size and not self._rbuffers._full:
+                self._rbuffers.do_drain()
+            return r
+
     def _write_cb(self):
         if self._state != STATE_CLOSED:
-            if self._write():
+            if self._write_gso() if self._is_enable_gso else self._write():
                 if self._has_drain_event:
                     self._loop.add_async(self.emit_drain, self)
                 if self._write_handler:
@@ -343,7 +476,7 @@ class Socket(EventEmitter):
                     if data._buffer_index >= data._buffer_len:
                         if data._len > 0:
                             data._buffer = data._buffers.popleft()
-                            data._buffer_odata = data._buffers_odata.popleft()
+                            data._buffer_odata = data._buffers_odata.popleft() if data._buffers_odata else None
                             data._buffer_index, data._buffer_len = 0, len(data._buffer)
                         else:
                             data._buffer_index, data._buffer_len, data._buffer, data._buffer_odata = 0, 0, b'', None
@@ -364,6 +497,23 @@ class Socket(EventEmitter):
                     self._error(e)
                     return
             return True
+    elif MMSG:
+        def _write(self):
+            try:
+                self._wbuffers.socket_sendmmsg(self._fileno, self._socket_family)
+                if self._wbuffers:
+                    if self._wbuffers._full and self._wbuffers._len < self._wbuffers._regain_size:
+                        self._wbuffers.do_regain()
+                    return False
+            except Exception as e:
+                self._error(e)
+                if self._wbuffers._full and self._wbuffers._len < self._wbuffers._regain_size:
+                    self._wbuffers.do_regain()
+                return False
+
+            if self._wbuffers._full and self._wbuffers._len < self._wbuffers._regain_size:
+                self._wbuffers.do_regain()
+            return True
     else:
         def _write(self):
             try:
@@ -382,6 +532,86 @@ class Socket(EventEmitter):
                 self._wbuffers.do_regain()
             return True
 
+    def _gso_error(self, e):
+        if e.args and e.args[0] in (errno.EINVAL, errno.EIO):
+            get_logger().warning('gso error: %s, fallback to sendto', e)
+            self.disable_gso()
+            return True
+        return False
+
+    if cbuffer is None:
+        def _write_gso(self):
+            while self._wbuffers:
+                data = self._wbuffers
+                try:
+                    address, segment_size = data._buffer_odata, data._buffer_len - data._buffer_index
+                    iov = [memoryview(data._buffer)[data._buffer_index:] if data._buffer_index > 0 else data._buffer]
+                    total_len = segment_size
+                    if segment_size > 0:
+                        for i in range(min(len(data._buffers), GSO_MAX_SEGMENTS - 1)):
+                            buffer = data._buffers[i]
+                            if not buffer or len(buffer) > segment_size or total_len + len(buffer) > GSO_MAX_SIZE \
+                                    or (data._buffers_odata[i] if data._buffers_odata else None) != address:
+                                break
+                            iov.append(buffer)
+                            total_len += len(buffer)
+                            if len(buffer) < segment_size:
+                                break
+                    if len(iov) > 1:
+                        self._socket.sendmsg(iov, [(SOL_UDP, UDP_SEGMENT, struct.pack("=H", segment_size))], 0, address)
+                    else:
+                        self._socket.sendto(iov[0], address)
+
+                    data._len -= total_len
+                    if data._len > 0:
+                        for _ in range(len(iov) - 1):
+                            data._buffers.popleft()
+                            if data._buffers_odata:
+                                data._buffers_odata.popleft()
+                        data._buffer = data._buffers.popleft()
+                        data._buffer_odata = data._buffers_odata.popleft() if data._buffers_odata else None
+                        data._buffer_index, data._buffer_len = 0, len(data._buffer)
+                    else:
+                        data._buffers.clear()
+                        if data._buffers_odata:
+                            data._buffers_odata.clear()
+                        data._buffer_index, data._buffer_len, data._buffer, data._buffer_odata = 0, 0, b'', None
+                        if data._full and data._len < data._regain_size:
+                            data.do_regain()
+                except socket.error as e:
+                    if self._gso_error(e):
+                        return self._write()
+                    if e.args[0] not in (errno.EWOULDBLOCK, errno.EAGAIN):
+                        self._error(e)
+                    if data._full and data._len < data._regain_size:
+                        data.do_regain()
+                    return False
+                except Exception as e:
+                    self._error(e)
+                    if data._full and data._len < data._regain_size:
+                        data.do_regain()
+                    return False
+            return True
+    else:
+        def _write_gso(self):
+            try:
+                self._wbuffers.socket_sendgso(self._fileno, self._socket_family)
+                if self._wbuffers:
+                    if self._wbuffers._full and self._wbuffers._len < self._wbuffers._regain_size:
+                        self._wbuffers.do_regain()
+                    return False
+            except Exception as e:
+                if self._gso_error(e):
+                    return self._write()
+                self._error(e)
+                if self._wbuffers._full and self._wbuffers._len < self._wbuffers._regain_size:
+                    self._wbuffers.do_regain()
+                return False
+
+            if self._wbuffers._full and self._wbuffers._len < self._wbuffers._regain_size:
+                self._wbuffers.do_regain()
+            return True
+
     def write(self, data):
         if self._state == STATE_CLOSED:
             if self.ignore_write_closed_error:
@@ -395,7 +625,7 @@ class Socket(EventEmitter):
                 return False
 
             if not self._write_handler:
-                if self._write():
+                if self._write_gso() if self._is_enable_gso else self._write():
                     if self._has_drain_event:
                         self._loop.add_async(self.emit_drain, self)
                     return True
@@ -5,6 +5,11 @@
 import sys
 import logging
 
+try:
+    from time import monotonic
+except ImportError:
+    from time import time as monotonic
+
 if sys.version_info[0] >= 3:
     is_py3 = True
     unicode_type = str
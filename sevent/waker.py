@@ -4,7 +4,6 @@
 
 import os
 import socket
-import threading
 
 
 def set_close_exec(fd):
@@ -19,6 +18,40 @@ def _set_nonblocking(fd):
     fcntl.fcntl(fd, fcntl.F_SETFL, flags | os.O_NONBLOCK)
 
 
+class EventfdWaker(object):
+    ''' wake only writes when no wake is pending, consume clears pending after reading, the loop runs safe
+    handlers after fd callbacks so handlers queued while pending was still set are not lost '''
+
+    def __init__(self):
+        self.fd = os.eventfd(0, os.EFD_NONBLOCK | os.EFD_CLOEXEC)
+        self.pending = False
+
+    def fileno(self):
+        return self.fd
+
+    def wake(self):
+        if self.pending:
+            return
+        self.pending = True
+        try:
+            os.eventfd_write(self.fd, 1)
+        except (OSError, ValueError):
+            pass
+
+    def consume(self):
+        try:
+            os.eventfd_read(self.fd)
+        except OSError:
+            pass
+        self.pending = False
+
+    def close(self):
+        try:
+            os.close(self.fd)
+        except OSError:
+            pass
+
+
 class PipeWaker(object):
     def __init__(self):
         r, w = os.pipe()
@@ -28,17 +61,19 @@ class PipeWaker(object):
         set_close_exec(w)
         self.reader = os.fdopen(r, "rb", 0)
         self.writer = os.fdopen(w, "wb", 0)
-        self.lock = threading.Lock()
+        self.pending = False
 
     def fileno(self):
         return self.reader.fileno()
 
     def wake(self):
-        with self.lock:
-            try:
-                self.writer.write(b"x")
-            except (IOError, ValueError):
-                pass
+        if self.pending:
+            return
+        self.pending = True
+        try:
+            self.writer.write(b"x")
+        except (IOError, ValueError):
+            pass
 
     def consume(self):
         try:
@@ -48,6 +83,7 @@ class PipeWaker(object):
                     break
         except IOError:
             pass
+        self.pending = False
 
     def close(self):
         self.reader.close()
@@ -83,17 +119,19 @@ class SocketWaker(object):
         self.reader.setblocking(0)
         self.writer.setblocking(0)
         a.close()
-        self.lock = threading.Lock()
+        self.pending = False
 
     def fileno(self):
         return self.reader.fileno()
 
     def wake(self):
-        with self.lock:
-            try:
-                self.writer.send(b"x")
-            except (IOError, socket.error, ValueError):
-                pass
+        if self.pending:
+            return
+        self.pending = True
+        try:
+            self.writer.send(b"x")
+        except (IOError, socket.error, ValueError):
+            pass
 
     def consume(self):
         try:
@@ -103,6 +141,7 @@ class SocketWaker(object):
                     break
         except (IOError, socket.error):
             pass
+        self.pending = False
 
     def close(self):
         self.reader.close()
@@ -115,6 +154,11 @@ class SocketWaker(object):
 def Waker():
     if os.name == 'nt':
         return SocketWaker()
+    if hasattr(os, "eventfd"):
+        try:
+            return EventfdWaker()
+        except:
+            pass
     try:
         return PipeWaker()
     except:
@@ -0,0 +1,3 @@
+# -*- coding: utf-8 -*-
+# 2026/10/17
+# create by: snower
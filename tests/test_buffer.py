@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+# 2026/10/17
+# create by: snower
+
+import socket
+import struct
+import unittest
+import sevent
+from sevent import loop as _loop
+from sevent import buffer
+from sevent.buffer import Buffer, cbuffer
+
+
+class RecvPoolTestCase(unittest.TestCase):
+    @unittest.skipIf(cbuffer is None, "cbuffer is not used")
+    def test_recv_pool_size(self):
+        pool_size = cbuffer.socket_get_recv_pool_size()
+        rsock, wsock = socket.socketpair()
+        try:
+            cbuffer.socket_set_recv_pool_size(600)
+            self.assertEqual(cbuffer.socket_get_recv_pool_size(), 600)
+
+            rsock.setblocking(False)
+            data = b"x" * (2 * 1024 * 1024)
+            wsock.setblocking(False)
+            recv_buffer, sent = Buffer(), 0
+            while sent < len(data):
+                try:
+                    sent += wsock.send(data[sent:])
+                except socket.error:
+                    pass
+                recv_buffer.socket_recv(rsock.fileno())
+            while len(recv_buffer) < len(data):
+                recv_buffer.socket_recv(rsock.fileno())
+            self.assertEqual(recv_buffer.read(), data)
+            self.assertGreater(cbuffer.socket_get_recv_pool_count(), 128)
+            self.assertLessEqual(cbuffer.socket_get_recv_pool_count(), 600)
+
+            cbuffer.socket_set_recv_pool_size(16)
+            self.assertLessEqual(cbuffer.socket_get_recv_pool_count(), 16)
+            cbuffer.socket_set_recv_pool_size(-1)
+            self.assertEqual(cbuffer.socket_get_recv_pool_count(), 0)
+            cbuffer.socket_set_recv_pool_size(100000)
+            self.assertEqual(cbuffer.socket_get_recv_pool_size(), 8192)
+        finally:
+            cbuffer.socket_set_recv_pool_size(pool_size)
+            rsock.close()
+            wsock.close()
+
+
+class BufferViewTestCase(unittest.TestCase):
+    def test_peek(self):
+        buffer = Buffer()
+        for data in (b"abc", b"defg", b"hi"):
+            buffer.write(data)
+        self.assertEqual(bytes(buffer.peek(2)), b"ab")
+        self.assertEqual(bytes(buffer.peek(5)), b"abcde")
+        self.assertEqual(bytes(buffer.peek()), b"abcdefghi")
+        self.assertEqual(bytes(buffer.peek(10)), b"")
+        self.assertEqual(len(buffer), 9)
+        self.assertEqual(buffer.read(), b"abcdefghi")
+
+    def test_peek_keeps_chunks(self):
+        buffer = Buffer()
+        for i, data in enumerate((b"abc", b"defg", b"hi")):
+            buffer.write(data, ("127.0.0.1", i))
+        buffer.read(1)
+        self.assertEqual(bytes(buffer.peek(6)), b"bcdefg")
+        self.assertEqual(buffer.next(), (b"bc", ("127.0.0.1", 0)))
+        self.assertEqual(buffer.next(), (b"defg", ("127.0.0.1", 1)))
+        self.assertEqual(buffer.next(), (b"hi", ("127.0.0.1", 2)))
+
+    def test_readview(self):
+        buffer = Buffer()
+        for data in (b"abc", b"defg", b"hi"):
+            buffer.write(data)
+        self.assertEqual(bytes(buffer.readview(2)), b"ab")
+        self.assertEqual(bytes(buffer.readview(5)), b"cdefg")
+        self.assertEqual(len(buffer), 2)
+        self.assertEqual(bytes(buffer.readview()), b"hi")
+        self.assertEqual(len(buffer), 0)
+
+
+class ReadFrameTestCase(unittest.TestCase):
+    def test_read_frame(self):
+        buffer = Buffer()
+        buffer.write(b"\x00\x03ab")
+        self.assertIsNone(buffer.read_frame())
+        buffer.write(b"c\x00")
+        self.assertEqual(buffer.read_frame(), b"abc")
+        buffer.write(b"\x00")
+        self.assertEqual(buffer.read_frame(">H"), b"")
+        self.assertEqual(len(buffer), 0)
+
+    def test_formats(self):
+        for fmt, header in (("<I", b"\x02\x00\x00\x00"), ("!i", b"\x00\x00\x00\x02"), ("B", b"\x02"),
+                            ("l", struct.pack("=l", 2)), ("@L", struct.pack("=L", 2)), (">q", b"\x00" * 7 + b"\x02"),
+                            ("=Q", struct.pack("=Q", 2)), ("<h", b"\x02\x00"), ("b", b"\x02")):
+            buffer = Buffer()
+            # split the header across chunks
+            buffer.write(header[:1])
+            buffer.write(header[1:] + b"xyz")
+            self.assertEqual(buffer.read_frame(fmt), b"xy", fmt)
+            self.assertEqual(buffer.read(), b"z")
+
+    def test_invalid_formats(self):
+        buffer = Buffer()
+        buffer.write(b"\x00" * 16)
+        for fmt in ("", ">", ">HH", "2H", "H ", "<x", "e", "<<H", "P", "n"):
+            with self.assertRaises(ValueError) as context:
+                buffer.read_frame(fmt)
+            self.assertEqual(str(context.exception), "frame format must be one integer code")
+        self.assertEqual(len(buffer), 16)
+
+    def test_negative_size(self):
+        buffer = Buffer()
+        buffer.write(b"\xff\xfe" + b"\x00" * 8)
+        with self.assertRaises(ValueError) as context:
+            buffer.read_frame(">h")
+        self.assertEqual(str(context.exception), "frame size must not be negative")
+        self.assertEqual(len(buffer), 10)
+        self.assertEqual(buffer.read_frame(">H"), None)
+
+
+class BufferMemoryTestCase(unittest.TestCase):
+    def setUp(self):
+        _loop._thread_local._sevent_ioloop = None
+        _loop._ioloop = None
+        _loop._mul_ioloop = False
+        self.loop = sevent.instance()
+        self.buffer_memory = buffer.buffer_memory
+        self.memory = buffer.buffer_memory = buffer.BufferMemory()
+
+    def tearDown(self):
+        self.memory.set_limit(0)
+        buffer.buffer_memory = self.buffer_memory
+
+    def test_usage_without_limit(self):
+        buffers = [Buffer() for _ in range(3)]
+        buffers[0].write(b"x" * 1000)
+        buffers[2].write(b"x" * 500)
+        self.assertEqual(self.memory.get_usage(), 1500)
+        buffers[0].read()
+        snapshot = self.memory.snapshot()
+        self.assertEqual((snapshot["usage"], snapshot["peak"], snapshot["buffers"]), (500, 1500, 3))
+        self.assertIsNone(self.memory._check_loop)
+
+        del buffers[:]
+        self.assertEqual(self.memory.snapshot()["buffers"], 0)
+        for _ in range(5000):
+            Buffer()
+        self.assertLessEqual(len(self.memory._buffers), 1024)
+
+    def test_set_limit_after_buffers(self):
+        large, small = Buffer(), Buffer()
+        large.write(b"x" * 100000)
+        small.write(b"x" * 10000)
+        events = []
+        large.on_drain(lambda b: events.append("large"))
+        small.on_drain(lambda b: events.append("small"))
+
+        _loop._ioloop = None
+        self.memory.set_limit(50000, 0.01)
+        self.assertIs(self.memory._check_loop, self.loop)
+        _loop._ioloop = self.loop
+        self.loop.add_timeout(0.05, self.loop.stop)
+        self.loop.start()
+
+        self.assertEqual(events, ["large"])
+        self.assertTrue(large.full)
+        self.assertFalse(small.full)
+        self.assertEqual(self.memory.snapshot()["throttled"], 1)
+
+        self.memory.set_limit(0)
+        self.assertIsNone(self.memory._check_loop)
+        self.assertEqual(self.memory.snapshot()["throttled"], 0)
+        large.read()
+        self.assertFalse(large.full)
+
+
+if __name__ == '__main__':
+    unittest.main()
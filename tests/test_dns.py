@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+# 2026/10/17
+# create by: snower
+
+import unittest
+import dnslib
+import sevent
+from sevent import loop as _loop
+from sevent.dns import DNSResolver, DnsQueryState
+
+
+class Answers(list):
+    def next(self):
+        return self.pop(0)
+
+
+def pack_answer(hostname, *ips):
+    answer = dnslib.DNSRecord.question(hostname).reply()
+    for ip in ips:
+        answer.add_answer(dnslib.RR(hostname, rdata=dnslib.A(ip), ttl=60))
+    return bytes(answer.pack())
+
+
+class DNSResolverTestCase(unittest.TestCase):
+    def setUp(self):
+        _loop._thread_local._sevent_ioloop = None
+        _loop._ioloop = None
+        _loop._mul_ioloop = False
+        self.loop = sevent.instance()
+        self.resolver = DNSResolver(self.loop, servers=["127.0.0.1", "127.0.0.2"], hosts={b"localhost": "127.0.0.1"})
+
+    def tearDown(self):
+        self.resolver.close()
+
+    def query(self, hostname):
+        results = []
+        query_state = DnsQueryState(hostname, 2, 0)
+        query_state.append(lambda hostname, ip: results.append(ip))
+        self.resolver._queue[hostname] = query_state
+        return results
+
+    def test_resolve_all_cache_hit(self):
+        results = self.query(b"example.test")
+        self.resolver.on_data(None, Answers([
+            (pack_answer("example.test", "10.0.0.1", "10.0.0.2"), ("127.0.0.1", 53)),
+            (pack_answer("example.test", "10.0.0.2", "10.0.0.3"), ("127.0.0.2", 53)),
+        ]))
+        self.assertNotIn(b"example.test", self.resolver._queue)
+
+        ips = []
+        self.resolver.resolve_all("example.test", lambda hostname, result: ips.append(result))
+        self.assertEqual(ips, [["10.0.0.1", "10.0.0.2", "10.0.0.3"]])
+
+        self.loop.add_async(self.loop.stop)
+        self.loop.start()
+        self.assertEqual(results, ["10.0.0.1"])
+
+    def test_ignore_unknown_answers(self):
+        self.resolver.on_data(None, Answers([(pack_answer("other.test", "10.0.0.9"), ("127.0.0.1", 53))]))
+        self.assertEqual(self.resolver._cache.get_all(b"other.test"), [])
+
+    def test_resolve_all_hosts(self):
+        ips = []
+        self.resolver.resolve_all("localhost", lambda hostname, result: ips.append(result))
+        self.assertEqual(ips, [["127.0.0.1"]])
+
+
+if __name__ == '__main__':
+    unittest.main()
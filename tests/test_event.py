@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+# 2026/10/17
+# create by: snower
+
+import unittest
+import sevent
+from sevent import loop as _loop
+from sevent.buffer import Buffer
+from sevent.event import EventEmitter, SlotsEventEmitter
+
+
+class EventEmitterTestCase(unittest.TestCase):
+    def setUp(self):
+        _loop._thread_local._sevent_ioloop = None
+        _loop._ioloop = None
+        _loop._mul_ioloop = False
+        self.loop = sevent.instance()
+
+    def test_emitter(self):
+        events = []
+        emitter = sevent.EventEmitter()
+        emitter.on("data", lambda value: events.append(value))
+        emitter.emit_data(1)
+        emitter.once("data", lambda value: events.append(-value))
+        emitter.emit_data(2)
+        emitter.emit_data(3)
+        self.assertEqual(sorted(events), [-2, 1, 2, 3])
+
+    def test_buffer_slots(self):
+        buffer = Buffer()
+        self.assertFalse(hasattr(buffer, "__dict__"))
+
+        events = []
+        buffer.on("drain", lambda b: events.append("drain"))
+        buffer.do_drain()
+        self.assertEqual(events, ["drain"])
+
+    def test_bases(self):
+        self.assertTrue(issubclass(EventEmitter, SlotsEventEmitter))
+        self.assertEqual(SlotsEventEmitter.__slots__, ())
+        self.assertTrue(hasattr(EventEmitter(), "__dict__"))
+        for cls in (sevent.tcp.Socket, sevent.tcp.Server, sevent.udp.Socket, sevent.pipe.PipeSocket):
+            self.assertTrue(issubclass(cls, EventEmitter), cls)
+        self.assertFalse(issubclass(Buffer, EventEmitter))
+
+    def test_coroutine_callback(self):
+        events = []
+        buffer = Buffer()
+
+        async def on_drain(b):
+            events.append(b)
+            self.loop.stop()
+
+        buffer.on("drain", on_drain)
+        self.loop.add_async(buffer.do_drain)
+        self.loop.add_timeout(5, self.loop.stop)
+        self.loop.start()
+        self.assertEqual(events, [buffer])
+
+
+if __name__ == '__main__':
+    unittest.main()
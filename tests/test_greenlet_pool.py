@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+# 2026/10/17
+# create by: snower
+
+import unittest
+import greenlet
+import sevent
+from sevent import loop as _loop
+from sevent.coroutines import loop as coroutines_loop
+
+
+class GreenletPoolTestCase(unittest.TestCase):
+    def setUp(self):
+        _loop._thread_local._sevent_ioloop = None
+        _loop._ioloop = None
+        _loop._mul_ioloop = False
+        coroutines_loop._thread_local.greenlets = []
+        self.loop = sevent.instance()
+
+    def tearDown(self):
+        coroutines_loop._thread_local.greenlets = []
+
+    def run_loop(self, callback, timeout=5):
+        result = {}
+
+        async def main():
+            try:
+                result["value"] = await callback()
+            finally:
+                self.loop.stop()
+
+        self.loop.call_async(main)
+        self.loop.add_timeout(timeout, self.loop.stop)
+        self.loop.start()
+        return result.get("value")
+
+    def test_reuse(self):
+        greenlets = []
+
+        async def run():
+            greenlets.append(greenlet.getcurrent())
+
+        for _ in range(3):
+            self.loop.call_async(run)
+        self.loop.add_timeout(0.05, self.loop.stop)
+        self.loop.start()
+
+        self.assertEqual(len(greenlets), 3)
+        self.assertIs(greenlets[0], greenlets[1])
+        self.assertIs(greenlets[1], greenlets[2])
+        self.assertIn(greenlets[0], coroutines_loop._thread_local.greenlets)
+
+    def test_stray_switch(self):
+        greenlets = []
+
+        async def run(value):
+            greenlets.append((greenlet.getcurrent(), value))
+
+        self.loop.call_async(run, 1)
+        self.loop.add_timeout(0.05, self.loop.stop)
+        self.loop.start()
+
+        idle_gr = greenlets[0][0]
+        self.assertFalse(idle_gr.dead)
+        self.assertEqual(idle_gr.switch("stray"), "stray")
+        self.assertEqual(idle_gr.switch("stray", 2), ("stray", 2))
+
+        coroutines_loop.spawn(run, 2)
+        self.assertEqual(greenlets[1], (idle_gr, 2))
+
+    def test_stray_throw(self):
+        greenlets = []
+
+        async def run(value):
+            greenlets.append((greenlet.getcurrent(), value))
+
+        self.loop.call_async(run, 1)
+        self.loop.add_timeout(0.05, self.loop.stop)
+        self.loop.start()
+
+        idle_gr = greenlets[0][0]
+        self.assertRaises(RuntimeError, idle_gr.throw, RuntimeError("stray"))
+        self.assertTrue(idle_gr.dead)
+
+        coroutines_loop.spawn(run, 2)
+        self.assertEqual(len(greenlets), 2)
+        self.assertIsNot(greenlets[1][0], idle_gr)
+        self.assertEqual(greenlets[1][1], 2)
+        self.assertNotIn(idle_gr, coroutines_loop._thread_local.greenlets)
+
+    def test_cancelled_not_reused(self):
+        greenlets = []
+
+        async def sleeper():
+            greenlets.append(greenlet.getcurrent())
+            await sevent.sleep(10)
+
+        async def run():
+            task = sevent.create_task(sleeper)
+            await sevent.sleep(0.01)
+            task.cancel()
+            await sevent.sleep(0.01)
+            return task.cancelled()
+
+        self.assertTrue(self.run_loop(run))
+        self.assertEqual(len(greenlets), 1)
+        self.assertFalse(greenlets[0].reusable)
+        self.assertNotIn(greenlets[0], coroutines_loop._thread_local.greenlets)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+# 2026/10/17
+# create by: snower
+
+import socket
+import unittest
+import sevent
+from sevent import loop as _loop
+
+try:
+    from sevent import curing
+    curing.Ring(1).close()
+    from sevent.impl.iouring_loop import IoUringLoop
+except Exception:
+    IoUringLoop = None
+
+
+@unittest.skipIf(IoUringLoop is None, "io_uring is not supported")
+class IoUringLoopTestCase(unittest.TestCase):
+    def setUp(self):
+        self.loop = IoUringLoop()
+        _loop._thread_local._sevent_ioloop = self.loop
+        _loop._ioloop = self.loop
+        _loop._mul_ioloop = False
+
+    def tearDown(self):
+        _loop._thread_local._sevent_ioloop = None
+        _loop._ioloop = None
+
+    @unittest.skipUnless(_loop.USE_IOURING, "io_uring disabled by SEVENT_NOUSE_IOURING")
+    def test_instance_default(self):
+        _loop._thread_local._sevent_ioloop = None
+        _loop._ioloop = None
+        if not _loop._iouring_supported():
+            self.skipTest("edge triggered epoll enabled")
+        self.assertIsInstance(sevent.instance(), IoUringLoop)
+
+    def test_timer(self):
+        fired = []
+        self.loop.add_timeout(0.02, lambda: fired.append(2))
+        self.loop.add_timeout(0.01, lambda: fired.append(1))
+        handler = self.loop.add_timeout(0.015, lambda: fired.append(0))
+        self.loop.cancel_timeout(handler)
+        self.loop.add_timeout(0.05, self.loop.stop)
+        start = self.loop.time()
+        self.loop.start()
+        self.assertEqual(fired, [1, 2])
+        self.assertGreaterEqual(self.loop.time() - start, 0.04)
+
+    def test_echo(self):
+        result = {}
+
+        async def main():
+            server = sevent.tcp.Server()
+            server.enable_reuseaddr()
+            await server.listenof(("127.0.0.1", 0))
+
+            async def echo(conn):
+                while True:
+                    try:
+                        buffer = await conn.recv()
+                    except sevent.errors.SocketClosed:
+                        return
+                    await conn.send(buffer)
+
+            async def serve():
+                while True:
+                    try:
+                        conn = await server.accept()
+                    except sevent.errors.SocketClosed:
+                        return
+                    sevent.go(echo, conn)
+
+            sevent.go(serve)
+            await sevent.sleep(0.01)
+            conn = sevent.tcp.Socket()
+            await conn.connectof(server.socket.getsockname())
+            data = b"x" * 256 * 1024
+            await conn.send(data)
+            buffer = await conn.recv(len(data))
+            result["data"] = buffer.read(len(data))
+            conn.close()
+            server.close()
+            self.loop.stop()
+
+        self.loop.call_async(main)
+        self.loop.add_timeout(5, self.loop.stop)
+        self.loop.start()
+        self.assertEqual(result.get("data"), b"x" * 256 * 1024)
+
+    def test_modify_remove_fd(self):
+        rsock, wsock = socket.socketpair()
+        events = []
+
+        def on_write():
+            events.append("w")
+            self.loop.remove_fd(wsock.fileno(), on_write)
+            wsock.send(b"a")
+
+        def on_read():
+            events.append("r")
+            rsock.recv(1)
+            self.loop.remove_fd(rsock.fileno(), on_read)
+            self.loop.add_timeout(0.02, self.loop.stop)
+
+        self.loop.add_fd(wsock.fileno(), sevent.loop.MODE_OUT, on_write)
+        self.loop.add_fd(rsock.fileno(), sevent.loop.MODE_IN, on_read)
+        self.loop.add_timeout(5, self.loop.stop)
+        self.loop.start()
+        rsock.close()
+        wsock.close()
+        self.assertEqual(events, ["w", "r"])
+
+    def test_remove_fd_releases_socket(self):
+        server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        server.bind(("127.0.0.1", 0))
+        server.listen(8)
+        address = server.getsockname()
+        result = []
+
+        def rebind():
+            self.loop.remove_fd(server.fileno(), on_accept)
+            server.close()
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            try:
+                sock.bind(address)
+                sock.listen(8)
+                result.append(True)
+            except socket.error as e:
+                result.append(e)
+            finally:
+                sock.close()
+                self.loop.stop()
+
+        def on_accept():
+            pass
+
+        self.loop.add_fd(server.fileno(), sevent.loop.MODE_IN, on_accept)
+        self.loop.add_timeout(0.01, rebind)
+        self.loop.add_timeout(5, self.loop.stop)
+        self.loop.start()
+        self.assertEqual(result, [True])
+
+
+if __name__ == '__main__':
+    unittest.main()
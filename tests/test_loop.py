@@ -0,0 +1,347 @@
+# -*- coding: utf-8 -*-
+# 2026/10/17
+# create by: snower
+
+import time
+import socket
+import unittest
+import sevent
+from sevent import loop as _loop
+from sevent.loop import IOLoop, TimerWheel, TimeoutHandler, MODE_IN, MODE_OUT
+from sevent.utils import monotonic
+
+
+class TimerWheelTestCase(unittest.TestCase):
+    def add(self, wheel, fired, deadline, now):
+        handler = TimeoutHandler(lambda: fired.append((deadline, self.now)), deadline, (), {})
+        return wheel.add(handler, now)
+
+    def run_until(self, wheel, end, step=0.001):
+        while self.now < end:
+            self.now = round(self.now + step, 6)
+            wheel.run(self.now)
+
+    def test_expire_order(self):
+        self.now, fired = 100.0, []
+        wheel = TimerWheel(0.01, 4, 3, self.now)
+        for deadline in (100.05, 100.015, 100.3, 103.0, 100.015):
+            self.add(wheel, fired, deadline, self.now)
+        self.assertEqual(len(wheel), 5)
+
+        self.run_until(wheel, 104)
+        self.assertEqual([deadline for deadline, _ in fired], [100.015, 100.015, 100.05, 100.3, 103.0])
+        for deadline, fired_time in fired:
+            self.assertGreaterEqual(fired_time, deadline)
+            self.assertLess(fired_time - deadline, 0.01 + 1e-6)
+        self.assertEqual(len(wheel), 0)
+
+    def test_cancel(self):
+        self.now, fired = 100.0, []
+        wheel = TimerWheel(0.01, 4, 3, self.now)
+        handler = self.add(wheel, fired, 100.05, self.now)
+        far_handler = self.add(wheel, fired, 105.0, self.now)
+        self.add(wheel, fired, 100.08, self.now)
+        self.assertTrue(wheel.cancel(handler))
+        self.assertFalse(wheel.cancel(handler))
+        self.assertTrue(wheel.cancel(far_handler))
+        self.assertEqual(len(wheel), 1)
+
+        self.run_until(wheel, 106)
+        self.assertEqual([deadline for deadline, _ in fired], [100.08])
+
+    def test_run_timeout(self):
+        self.now, fired = 100.0, []
+        wheel = TimerWheel(0.01, 4, 3, self.now)
+        self.assertEqual(wheel.run(self.now), 3600)
+
+        self.add(wheel, fired, 100.05, self.now)
+        self.assertAlmostEqual(wheel.run(self.now), 0.05, 6)
+        self.add(wheel, fired, 100.02, self.now)
+        self.assertAlmostEqual(wheel.run(self.now), 0.02, 6)
+        self.assertAlmostEqual(wheel.run(100.03), 0.02, 6)
+        self.assertEqual(len(fired), 1)
+
+    def test_run_timeout_higher_level(self):
+        self.now, fired = 100.0, []
+        wheel = TimerWheel(0.01, 4, 3, self.now)
+        # only a level 1 timer, the loop wakes up at the next cascade boundary
+        self.add(wheel, fired, 101.0, self.now)
+        timeout = wheel.run(self.now)
+        self.assertGreater(timeout, 0)
+        self.assertLessEqual(timeout, 0.16 + 1e-6)
+        self.run_until(wheel, 101.02)
+        self.assertEqual([deadline for deadline, _ in fired], [101.0])
+
+
+class LoopTimerWheelTestCase(unittest.TestCase):
+    def setUp(self):
+        _loop._thread_local._sevent_ioloop = None
+        _loop._ioloop = None
+        _loop._mul_ioloop = False
+        self.loop = sevent.instance()
+
+    def test_timeouts(self):
+        self.loop.enable_timer_wheel(0.005)
+        fired = []
+        start = self.loop.time()
+        self.loop.add_timeout(0.03, lambda: fired.append((3, self.loop.time() - start)))
+        self.loop.add_timeout(0.01, lambda: fired.append((1, self.loop.time() - start)))
+        handler = self.loop.add_timeout(0.02, lambda: fired.append((2, self.loop.time() - start)))
+        self.loop.cancel_timeout(handler)
+        self.loop.add_timeout(0.05, self.loop.stop)
+        self.loop.start()
+
+        self.assertEqual([index for index, _ in fired], [1, 3])
+        self.assertGreaterEqual(fired[0][1], 0.01)
+        self.assertGreaterEqual(fired[1][1], 0.03)
+        self.assertIsNone(self.loop._timeout_handlers or None)
+
+    def test_enable_moves_pending_timeouts(self):
+        fired = []
+        self.loop.add_timeout(0.01, lambda: fired.append(1))
+        self.loop.enable_timer_wheel(0.005)
+        self.assertEqual(len(self.loop.timer_wheel), 1)
+        self.loop.add_timeout(0.03, self.loop.stop)
+        self.loop.start()
+        self.assertEqual(fired, [1])
+
+
+class LoopTimeTestCase(unittest.TestCase):
+    def setUp(self):
+        _loop._thread_local._sevent_ioloop = None
+        _loop._ioloop = None
+        _loop._mul_ioloop = False
+        self.loop = sevent.instance()
+
+    def test_cached_time(self):
+        times = []
+
+        def on_callback():
+            first = self.loop.time()
+            time.sleep(0.005)
+            times.append((first, self.loop.time()))
+            self.loop.add_async(on_next)
+
+        def on_next():
+            times.append((self.loop.time(), monotonic()))
+            self.loop.stop()
+
+        before = monotonic()
+        self.assertGreaterEqual(self.loop.time(), before)
+        self.loop.add_async(on_callback)
+        self.loop.add_timeout(5, self.loop.stop)
+        self.loop.start()
+
+        self.assertEqual(times[0][0], times[0][1])
+        self.assertGreaterEqual(times[1][0], times[0][0] + 0.005)
+        self.assertLessEqual(times[1][0], times[1][1])
+
+    def test_wall_clock_step(self):
+        fired = []
+        origin_time = time.time
+
+        def step_clock():
+            time.time = lambda: origin_time() + 3600
+
+        try:
+            start = monotonic()
+            self.loop.add_timeout(0.02, lambda: fired.append(monotonic() - start))
+            self.loop.add_async(step_clock)
+            self.loop.add_timeout(0.05, self.loop.stop)
+            self.loop.start()
+        finally:
+            time.time = origin_time
+        self.assertEqual(len(fired), 1)
+        self.assertGreaterEqual(fired[0], 0.02)
+        self.assertLess(fired[0], 0.05)
+
+    def test_buffer_times(self):
+        from sevent.buffer import Buffer
+        result = []
+
+        def on_callback():
+            buffer = Buffer(max_buffer_size=4)
+            buffer.write(b"12345")
+            buffer.do_drain()
+            buffer.read()
+            buffer.do_regain()
+            result.append((self.loop.time(), buffer._drain_time, buffer._regain_time))
+            self.loop.stop()
+
+        self.loop.add_async(on_callback)
+        self.loop.add_timeout(5, self.loop.stop)
+        self.loop.start()
+        self.assertEqual(result[0][0], result[0][1])
+        self.assertEqual(result[0][0], result[0][2])
+
+
+class RecordLoop(IOLoop):
+    def __init__(self):
+        super(RecordLoop, self).__init__()
+        self.calls = []
+
+    def _add_fd(self, fd, mode):
+        self.calls.append(("add", fd, mode))
+
+    def _remove_fd(self, fd):
+        self.calls.append(("remove", fd))
+
+    def _modify_fd(self, fd, mode):
+        self.calls.append(("modify", fd, mode))
+
+
+class FdSlotsTestCase(unittest.TestCase):
+    def test_read_write_slots(self):
+        loop = RecordLoop()
+        on_read, on_write = lambda: None, lambda: None
+        loop.add_fd(10, MODE_IN, on_read)
+        loop.add_fd(10, MODE_OUT, on_write)
+        self.assertIs(loop._fd_reads[10], on_read)
+        self.assertIs(loop._fd_writes[10], on_write)
+        self.assertNotIn(10, loop._fd_handlers)
+
+        loop.remove_fd(10, on_write)
+        self.assertIsNone(loop._fd_writes[10])
+        loop.remove_fd(10, on_read)
+        self.assertFalse(loop.remove_fd(10, on_read))
+        self.assertEqual(loop.calls, [("add", 10, MODE_IN), ("modify", 10, MODE_IN | MODE_OUT),
+                                      ("modify", 10, MODE_IN), ("remove", 10)])
+
+    def test_update_fd(self):
+        loop = RecordLoop()
+        on_read = lambda: None
+        loop.add_fd(10, MODE_IN, on_read)
+        self.assertTrue(loop.update_fd(10, MODE_OUT, on_read))
+        self.assertIsNone(loop._fd_reads[10])
+        self.assertIs(loop._fd_writes[10], on_read)
+        self.assertFalse(loop.update_fd(11, MODE_OUT, on_read))
+        self.assertEqual(loop.calls[-1], ("modify", 10, MODE_OUT))
+
+    def test_handlers_fallback(self):
+        loop = RecordLoop()
+        first, second = lambda: None, lambda: None
+        loop.add_fd(10, MODE_IN, first)
+        loop.add_fd(10, MODE_IN, second)
+        self.assertIsNone(loop._fd_reads[10])
+        self.assertEqual([callback for callback, _, _ in loop._fd_handlers[10]], [first, second])
+
+        loop.remove_fd(10, first)
+        loop.remove_fd(10, second)
+        self.assertNotIn(10, loop._fd_handlers)
+        self.assertEqual(loop.calls, [("add", 10, MODE_IN), ("remove", 10)])
+
+    def test_grow_slots(self):
+        loop = RecordLoop()
+        size = len(loop._fd_reads)
+        on_read = lambda: None
+        loop.add_fd(size + 10, MODE_IN, on_read)
+        self.assertGreater(len(loop._fd_reads), size + 10)
+        self.assertEqual(len(loop._fd_reads), len(loop._fd_writes))
+        self.assertEqual(len(loop._fd_reads), len(loop._fd_modes))
+        self.assertIs(loop._fd_reads[size + 10], on_read)
+        self.assertTrue(loop.clear_fd(size + 10))
+        self.assertIsNone(loop._fd_reads[size + 10])
+
+    def test_dispatch(self):
+        _loop._thread_local._sevent_ioloop = None
+        _loop._ioloop = None
+        _loop._mul_ioloop = False
+        loop = sevent.instance()
+        rsock, wsock = socket.socketpair()
+        events = []
+
+        def on_write():
+            events.append("w")
+            loop.remove_fd(rsock.fileno(), on_write)
+            wsock.send(b"a")
+
+        def on_read():
+            events.append("r1")
+            loop.remove_fd(rsock.fileno(), on_read)
+
+        def on_read_other():
+            events.append("r2")
+            rsock.recv(1)
+            loop.remove_fd(rsock.fileno(), on_read_other)
+            loop.add_timeout(0.01, loop.stop)
+
+        loop.add_fd(rsock.fileno(), MODE_OUT, on_write)
+        loop.add_fd(rsock.fileno(), MODE_IN, on_read)
+        loop.add_fd(rsock.fileno(), MODE_IN, on_read_other)
+        self.assertIn(rsock.fileno(), loop._fd_handlers)
+        loop.add_timeout(5, loop.stop)
+        loop.start()
+        rsock.close()
+        wsock.close()
+        self.assertEqual(events, ["w", "r1", "r2"])
+
+
+class CallbackBudgetTestCase(unittest.TestCase):
+    def setUp(self):
+        _loop._thread_local._sevent_ioloop = None
+        _loop._ioloop = None
+        _loop._mul_ioloop = False
+        self.loop = sevent.instance()
+        self.polls = []
+        poll = self.loop._poll
+
+        def count_poll(timeout):
+            self.polls.append(timeout)
+            return poll(timeout)
+        self.loop._poll = count_poll
+
+    def test_budget(self):
+        self.loop.set_callback_budget(3)
+        self.assertEqual(self.loop.callback_budget, 3)
+        calls = []
+        for i in range(8):
+            self.loop.add_async(lambda i=i: calls.append((i, len(self.polls))))
+        self.loop.add_async(self.loop.stop)
+        self.loop.add_timeout(5, self.loop.stop)
+        self.loop.start()
+
+        self.assertEqual([i for i, _ in calls], list(range(8)))
+        self.assertEqual([polls for _, polls in calls], [1, 1, 1, 2, 2, 2, 3, 3])
+        # callbacks left over keep the poll from blocking
+        self.assertEqual(self.polls[1:3], [0, 0])
+
+    def test_unlimited_budget(self):
+        self.loop.set_callback_budget(-1)
+        self.assertEqual(self.loop.callback_budget, 0)
+        calls = []
+        for i in range(100):
+            self.loop.add_async(lambda i=i: calls.append(len(self.polls)))
+        self.loop.add_async(self.loop.stop)
+        self.loop.add_timeout(5, self.loop.stop)
+        self.loop.start()
+        self.assertEqual(calls, [1] * 100)
+
+    def test_defer_queued_callbacks(self):
+        self.loop.set_callback_budget(0)
+        calls = []
+
+        def on_callback():
+            calls.append(("first", len(self.polls)))
+            self.loop.add_async(on_next, 1)
+
+        def on_next(value):
+            calls.append(("next", len(self.polls)))
+            self.loop.stop()
+
+        self.loop.add_async(on_callback)
+        self.loop.add_timeout(5, self.loop.stop)
+        self.loop.start()
+        self.assertEqual(calls, [("first", 1), ("next", 2)])
+
+    def test_safe_handlers(self):
+        calls = []
+        self.loop.add_async_safe(lambda: calls.append(("safe", len(self.polls))))
+        self.loop.add_async(lambda: calls.append(("async", len(self.polls))))
+        self.loop.add_async(self.loop.stop)
+        self.loop.add_timeout(5, self.loop.stop)
+        self.loop.start()
+        self.assertEqual(sorted(calls), [("async", 1), ("safe", 1)])
+
+
+if __name__ == '__main__':
+    unittest.main()
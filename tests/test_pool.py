@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+# 2026/10/17
+# create by: snower
+
+import unittest
+import sevent
+from sevent import loop as _loop
+from sevent.pool import ConnectionPool
+
+
+class ConnectionPoolTestCase(unittest.TestCase):
+    def setUp(self):
+        _loop._thread_local._sevent_ioloop = None
+        _loop._ioloop = None
+        _loop._mul_ioloop = False
+        self.loop = sevent.instance()
+
+    def run_loop(self, callback, port, timeout=5):
+        result = {}
+        connections = []
+
+        async def main():
+            server = sevent.tcp.Server()
+            server.enable_reuseaddr()
+            server.on("connection", lambda server, conn: connections.append(conn))
+            try:
+                await server.listenof(("127.0.0.1", port))
+                result["value"] = await callback(("127.0.0.1", port))
+            except Exception as e:
+                result["error"] = e
+            finally:
+                server.close()
+                for conn in connections:
+                    conn.close()
+                self.loop.stop()
+
+        self.loop.call_async(main)
+        self.loop.add_timeout(timeout, self.loop.stop)
+        self.loop.start()
+        if "error" in result:
+            raise result["error"]
+        return result.get("value")
+
+    def test_idle_expire(self):
+        async def run(address):
+            pool = ConnectionPool(min_idle=0, idle_timeout=0.05, check_interval=0.02)
+            conn = await pool.acquire(address)
+            self.assertTrue(pool.release(conn))
+            self.assertEqual(pool.idle_count(address), 1)
+            await sevent.sleep(0.15)
+            self.assertEqual(pool.idle_count(address), 0)
+            self.assertIsNone(pool._check_timeout)
+            pool.close()
+            return True
+
+        self.assertTrue(self.run_loop(run, 23895))
+
+    def test_preconnect_refill(self):
+        async def run(address):
+            pool = ConnectionPool(min_idle=2, idle_timeout=10, check_interval=0.02)
+            self.assertEqual(pool.preconnect(address), 2)
+            await sevent.sleep(0.1)
+            self.assertEqual(pool.idle_count(address), 2)
+
+            closed_conns = [conn for conn, _ in pool._idles[(address, None)]]
+            for conn in closed_conns:
+                conn.close()
+            await sevent.sleep(0.1)
+            self.assertEqual(pool.idle_count(address), 2)
+            for conn, _ in pool._idles[(address, None)]:
+                self.assertNotIn(conn, closed_conns)
+            pool.close()
+            return True
+
+        self.assertTrue(self.run_loop(run, 23896))
+
+    def test_prune_keys(self):
+        async def run(address):
+            pool = ConnectionPool(min_idle=1, idle_timeout=0.05, check_interval=0.02)
+            conn = await pool.acquire(address)
+            conn.close()
+            self.assertIn((address, None), pool._keys)
+            await sevent.sleep(0.3)
+            self.assertNotIn((address, None), pool._keys)
+            self.assertEqual(pool.idle_count(address), 0)
+            self.assertIsNone(pool._check_timeout)
+            pool.close()
+            return True
+
+        self.assertTrue(self.run_loop(run, 23897))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,25 @@
+# -*- coding: utf-8 -*-
+# 2026/10/17
+# create by: snower
+
+import os
+import sys
+import subprocess
+import unittest
+from sevent import buffer
+
+
+@unittest.skipIf(buffer.cbuffer is None, "already running without cbuffer")
+class PurePythonTestCase(unittest.TestCase):
+    def test_suite(self):
+        tests_path = os.path.dirname(os.path.abspath(__file__))
+        root_path = os.path.dirname(tests_path)
+        env = dict(os.environ, SEVENT_NOUSE_CBUFFER="1")
+        env["PYTHONPATH"] = os.pathsep.join([root_path, env["PYTHONPATH"]]) if env.get("PYTHONPATH") else root_path
+        process = subprocess.run([sys.executable, "-m", "unittest", "discover", "-s", tests_path, "-t", root_path],
+                                 cwd=root_path, env=env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+        self.assertEqual(process.returncode, 0, process.stdout.decode("utf-8", "replace"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+# 2026/10/17
+# create by: snower
+
+import socket
+import unittest
+import sevent
+from sevent import loop as _loop
+from sevent.errors import WaitTimeout
+
+
+class WaitForCleanupTestCase(unittest.TestCase):
+    def setUp(self):
+        _loop._thread_local._sevent_ioloop = None
+        _loop._ioloop = None
+        _loop._mul_ioloop = False
+        self.loop = sevent.instance()
+
+    def run_loop(self, callback, timeout=5):
+        result = {}
+
+        async def main():
+            try:
+                result["value"] = await callback()
+            except Exception as e:
+                result["error"] = e
+            finally:
+                self.loop.stop()
+
+        self.loop.call_async(main)
+        self.loop.add_timeout(timeout, self.loop.stop)
+        self.loop.start()
+        if "error" in result:
+            raise result["error"]
+        return result.get("value")
+
+    def test_tcp_accept_after_timeout(self):
+        async def run():
+            server = sevent.tcp.Server()
+            server.enable_reuseaddr()
+            await server.listenof(("127.0.0.1", 23891))
+            with self.assertRaises(WaitTimeout):
+                await sevent.wait_for(server.accept(), 0.05)
+
+            async def connect():
+                await sevent.sleep(0.01)
+                conn = sevent.tcp.Socket()
+                await conn.connectof(("127.0.0.1", 23891))
+                conn.close()
+            sevent.go(connect)
+            conn = await sevent.wait_for(server.accept(), 1)
+            conn.close()
+            server.close()
+            return conn is not None
+
+        self.assertTrue(self.run_loop(run))
+
+    def test_tcp_join_after_timeout(self):
+        async def run():
+            server = sevent.tcp.Server()
+            server.enable_reuseaddr()
+            await server.listenof(("127.0.0.1", 23892))
+            close_listeners = len(server._events["close"])
+            with self.assertRaises(WaitTimeout):
+                await sevent.wait_for(server.join(), 0.05)
+            server.close()
+            return len(server._events["close"]) == close_listeners
+
+        self.assertTrue(self.run_loop(run))
+
+    def test_udp_recvfrom_after_timeout(self):
+        async def run():
+            server = sevent.udp.Server()
+            await server.bindof(("127.0.0.1", 23893))
+            with self.assertRaises(WaitTimeout):
+                await sevent.wait_for(server.recvfrom(), 0.05)
+
+            client = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            client.sendto(b"ping", ("127.0.0.1", 23893))
+            client.close()
+            buffer = await sevent.wait_for(server.recvfrom(), 1)
+            data = buffer.next()
+            server.close()
+            return data
+
+        result = self.run_loop(run)
+        self.assertEqual(result[0] if isinstance(result, tuple) else result, b"ping")
+
+    def test_pipe_accept_and_recv_after_timeout(self):
+        async def run():
+            server = sevent.pipe.PipeServer()
+            server.listen(("pipe", 23894))
+            with self.assertRaises(WaitTimeout):
+                await sevent.wait_for(server.accept(), 0.05)
+
+            client = sevent.pipe.PipeSocket()
+
+            async def connect():
+                await sevent.sleep(0.01)
+                await client.connectof(("pipe", 23894))
+            sevent.go(connect)
+            conn = await sevent.wait_for(server.accept(), 1)
+            with self.assertRaises(WaitTimeout):
+                await sevent.wait_for(conn.recv(), 0.05)
+
+            await client.send(b"ping")
+            buffer = await sevent.wait_for(conn.recv(), 1)
+            data = buffer.read()
+            client.close()
+            server.close()
+            return data
+
+        self.assertEqual(self.run_loop(run), b"ping")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,312 @@
+# -*- coding: utf-8 -*-
+# 2026/10/17
+# create by: snower
+
+import select
+import socket
+import threading
+import unittest
+import sevent
+from sevent import loop as _loop
+from sevent.tcp import Socket, WarpSocket, SPLICE_SUPPORTED
+from sevent.buffer import RECV_MAX_CHUNKS
+
+
+@unittest.skipUnless(hasattr(select, "epoll"), "edge triggered mode requires epoll")
+class EdgeTriggeredReadTestCase(unittest.TestCase):
+    def setUp(self):
+        from sevent.impl.epoll_loop import EpollLoop
+        self.loop = EpollLoop()
+        self.loop.enable_edge_triggered()
+
+    def test_no_empty_data_events(self):
+        rsock, wsock = socket.socketpair()
+        conn = Socket(loop=self.loop, socket=rsock)
+        data_lens, received = [], []
+
+        def on_data(conn, buffer):
+            data_lens.append(len(buffer))
+            received.append(buffer.read())
+
+        def on_ready():
+            # readiness reported again before the queued data event ran
+            wsock.sendall(b"a" * 1024)
+            conn._edge_read_cb()
+            wsock.sendall(b"b" * 1024)
+            conn._edge_read_cb()
+            wsock.close()
+
+        conn.on("data", on_data)
+        conn.on("close", lambda conn: self.loop.stop())
+        self.loop.add_async(on_ready)
+        self.loop.add_timeout(5, self.loop.stop)
+        self.loop.start()
+
+        self.assertEqual(data_lens, [2048])
+        self.assertEqual(b"".join(received), b"a" * 1024 + b"b" * 1024)
+
+    def test_read_until_eof(self):
+        rsock, wsock = socket.socketpair()
+        conn = Socket(loop=self.loop, socket=rsock)
+        self.assertTrue(conn._edge_triggered)
+        data = b"x" * 4 * 1024 * 1024
+        received = []
+
+        def send():
+            wsock.sendall(data)
+            wsock.close()
+
+        conn.on("data", lambda conn, buffer: received.append(buffer.read()))
+        conn.on("close", lambda conn: self.loop.stop())
+        thread = threading.Thread(target=send)
+        thread.start()
+        self.loop.add_timeout(5, self.loop.stop)
+        self.loop.start()
+        thread.join()
+        self.assertEqual(b"".join(received), data)
+
+    def test_write_drain(self):
+        rsock, wsock = socket.socketpair()
+        conn = Socket(loop=self.loop, socket=wsock)
+        data = b"x" * 4 * 1024 * 1024
+        received, events = [], []
+
+        def recv():
+            while True:
+                chunk = rsock.recv(65536)
+                if not chunk:
+                    break
+                received.append(chunk)
+            rsock.close()
+
+        def on_drain(conn):
+            events.append("drain")
+            conn.end()
+
+        conn.on("drain", on_drain)
+        conn.on("close", lambda conn: self.loop.stop())
+        thread = threading.Thread(target=recv)
+        thread.start()
+        self.loop.add_async(conn.write, data)
+        self.loop.add_timeout(5, self.loop.stop)
+        self.loop.start()
+        thread.join(5)
+        self.assertEqual(events, ["drain"])
+        self.assertEqual(b"".join(received), data)
+
+
+class LinkTestCase(unittest.TestCase):
+    def setUp(self):
+        _loop._thread_local._sevent_ioloop = None
+        _loop._ioloop = None
+        _loop._mul_ioloop = False
+        self.loop = sevent.instance()
+
+    def run_link(self, wrap_left=False, wrap_right=False, splice=False):
+        a, b = socket.socketpair()
+        c, d = socket.socketpair()
+        client, server = Socket(loop=self.loop, socket=a), Socket(loop=self.loop, socket=d)
+        left, right = Socket(loop=self.loop, socket=b), Socket(loop=self.loop, socket=c)
+        if splice:
+            left.enable_splice()
+            right.enable_splice()
+        if wrap_left:
+            left = WarpSocket(socket=left, loop=self.loop)
+        if wrap_right:
+            right = WarpSocket(socket=right, loop=self.loop)
+        received = []
+
+        def on_data(s, buffer):
+            received.append(buffer.read())
+            if len(b"".join(received)) >= 6:
+                self.loop.stop()
+
+        server.on("data", on_data)
+        left.link(right)
+        client.write(b"foobar")
+        self.loop.add_timeout(5, self.loop.stop)
+        self.loop.start()
+        spliced = getattr(left, "_splice_peer", None) is not None
+        for s in (client, server, left, right):
+            s.close()
+        return b"".join(received), spliced
+
+    def test_link(self):
+        self.assertEqual(self.run_link(), (b"foobar", False))
+
+    def test_link_warp_socket(self):
+        self.assertEqual(self.run_link(wrap_left=True, splice=True), (b"foobar", False))
+        self.setUp()
+        self.assertEqual(self.run_link(wrap_right=True, splice=True), (b"foobar", False))
+
+    @unittest.skipUnless(SPLICE_SUPPORTED, "splice requires linux")
+    def test_link_splice(self):
+        self.assertEqual(self.run_link(splice=True), (b"foobar", True))
+
+
+class RecvChunksTestCase(unittest.TestCase):
+    def setUp(self):
+        _loop._thread_local._sevent_ioloop = None
+        _loop._ioloop = None
+        _loop._mul_ioloop = False
+        self.loop = sevent.instance()
+        self.rsock, self.wsock = socket.socketpair()
+        self.conn = Socket(loop=self.loop, socket=self.rsock)
+
+    def tearDown(self):
+        self.conn.close()
+        self.rsock.close()
+        self.wsock.close()
+
+    def test_adjust_recv_chunks(self):
+        conn = self.conn
+        self.assertEqual(conn._recv_chunks, 1)
+        conn._adjust_recv_chunks(0)
+        self.assertEqual(conn._recv_chunks, 1)
+        while conn._recv_chunks < RECV_MAX_CHUNKS:
+            chunks = conn._recv_chunks
+            conn._adjust_recv_chunks(conn.RECV_BUFFER_SIZE * chunks)
+            self.assertEqual(conn._recv_chunks, chunks * 2)
+        conn._adjust_recv_chunks(conn.RECV_BUFFER_SIZE * RECV_MAX_CHUNKS * 2)
+        self.assertEqual(conn._recv_chunks, RECV_MAX_CHUNKS)
+
+        # reads between a quarter and the whole receive size keep it
+        conn._adjust_recv_chunks(conn.RECV_BUFFER_SIZE * RECV_MAX_CHUNKS // 2)
+        self.assertEqual(conn._recv_chunks, RECV_MAX_CHUNKS)
+        while conn._recv_chunks > 1:
+            chunks = conn._recv_chunks
+            conn._adjust_recv_chunks(1)
+            self.assertEqual(conn._recv_chunks, chunks // 2)
+        conn._adjust_recv_chunks(1)
+        self.assertEqual(conn._recv_chunks, 1)
+
+    def test_read_adapts(self):
+        conn = self.conn
+        data = b"x" * (conn.RECV_BUFFER_SIZE * 4)
+        for _ in range(3):
+            self.wsock.sendall(data)
+            self.assertTrue(conn._read())
+        self.assertGreater(conn._recv_chunks, 1)
+
+        for _ in range(RECV_MAX_CHUNKS.bit_length()):
+            self.wsock.sendall(b"y" * 10)
+            self.assertTrue(conn._read())
+        self.assertEqual(conn._recv_chunks, 1)
+        self.assertEqual(conn.buffer[0].read(), data * 3 + b"y" * 10 * RECV_MAX_CHUNKS.bit_length())
+
+
+class StaticResolver(object):
+    def __init__(self, ips):
+        self.ips = ips
+
+    def resolve(self, hostname, callback, timeout=None):
+        return callback(hostname, self.ips[0] if self.ips else None)
+
+    def resolve_all(self, hostname, callback, timeout=None):
+        return callback(hostname, list(self.ips))
+
+
+class HappyEyeballsTestCase(unittest.TestCase):
+    def setUp(self):
+        _loop._thread_local._sevent_ioloop = None
+        _loop._ioloop = None
+        _loop._mul_ioloop = False
+        self.loop = sevent.instance()
+        self.sockets = []
+        self.server = self.listen("127.0.0.1", 0)
+        self.port = self.server.getsockname()[1]
+
+    def tearDown(self):
+        for sock in self.sockets:
+            sock.close()
+
+    def listen(self, ip, port, backlog=8):
+        server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        server.bind((ip, port))
+        server.listen(backlog)
+        self.sockets.append(server)
+        return server
+
+    def blackhole(self, ip):
+        # a full accept queue drops the syn, so connecting there hangs
+        self.listen(ip, self.port, 0)
+        for _ in range(8):
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            sock.settimeout(0.2)
+            self.sockets.append(sock)
+            try:
+                sock.connect((ip, self.port))
+            except socket.timeout:
+                return
+        self.skipTest("can not fill the accept queue")
+
+    def connect(self, ips, delay=1):
+        result = {}
+        conn = Socket(loop=self.loop, dns_resolver=StaticResolver(ips))
+        conn.enable_happy_eyeballs(delay)
+
+        def on_connect(conn):
+            result["time"] = self.loop.time() - start
+            result["peer"] = conn.socket.getpeername()[0]
+            result["attempts"] = conn._connect_attempts
+            conn.close()
+
+        def on_error(conn, e):
+            result["error"] = e
+
+        conn.on("connect", on_connect)
+        conn.on("error", on_error)
+        conn.on("close", lambda conn: self.loop.stop())
+        start = self.loop.time()
+        self.loop.add_async(conn.connect, ("localhost.test", self.port))
+        self.loop.add_timeout(5, self.loop.stop)
+        self.loop.start()
+        return result
+
+    def test_sort_connect_ips(self):
+        self.assertEqual(Socket.sort_connect_ips(["10.0.0.1", "10.0.0.2", "::1", "::2", "::3"]),
+                         ["10.0.0.1", "::1", "10.0.0.2", "::2", "::3"])
+        self.assertEqual(Socket.sort_connect_ips(["::1", "10.0.0.1", "10.0.0.2"]), ["::1", "10.0.0.1", "10.0.0.2"])
+
+    def test_refused_starts_next(self):
+        result = self.connect(["127.0.0.2", "127.0.0.4", "127.0.0.1"])
+        self.assertNotIn("error", result)
+        self.assertEqual(result["peer"], "127.0.0.1")
+        self.assertLess(result["time"], 0.5)
+        self.assertIsNone(result["attempts"])
+
+    def test_blackhole_staggered(self):
+        self.blackhole("127.0.0.3")
+        result = self.connect(["127.0.0.3", "127.0.0.1"], 0.05)
+        self.assertNotIn("error", result)
+        self.assertEqual(result["peer"], "127.0.0.1")
+        self.assertGreaterEqual(result["time"], 0.05)
+        self.assertLess(result["time"], 1)
+
+    def test_all_fail(self):
+        result = self.connect(["127.0.0.2", "127.0.0.4"])
+        self.assertIsInstance(result.get("error"), sevent.errors.ConnectError)
+
+    def test_close_pending_attempts(self):
+        self.blackhole("127.0.0.3")
+        conn = Socket(loop=self.loop, dns_resolver=StaticResolver(["127.0.0.3", "127.0.0.5"]))
+        conn.enable_happy_eyeballs(5)
+        attempts = []
+
+        def on_connecting():
+            attempts.extend(attempt[0] for attempt in conn._connect_attempts)
+            conn.close()
+
+        conn.on("close", lambda conn: self.loop.stop())
+        self.loop.add_async(conn.connect, ("localhost.test", self.port))
+        self.loop.add_timeout(0.05, on_connecting)
+        self.loop.add_timeout(5, self.loop.stop)
+        self.loop.start()
+        self.assertEqual(len(attempts), 1)
+        self.assertEqual(attempts[0].fileno(), -1)
+        self.assertIsNone(conn._connect_attempts)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,243 @@
+# -*- coding: utf-8 -*-
+# 2026/10/17
+# create by: snower
+
+import socket
+import struct
+import unittest
+import sevent
+from sevent import loop as _loop
+from sevent import udp
+from sevent.buffer import Buffer, cbuffer
+
+
+class BaseUdpTestCase(unittest.TestCase):
+    def setUp(self):
+        _loop._thread_local._sevent_ioloop = None
+        _loop._ioloop = None
+        _loop._mul_ioloop = False
+        self.loop = sevent.instance()
+        self.servers = []
+
+    def tearDown(self):
+        # the stopped loop never runs the queued closes
+        for server in self.servers:
+            server.close()
+            if server.socket:
+                server.socket.close()
+
+    def bind(self):
+        server = udp.Server()
+        server.bind(("127.0.0.1", 0))
+        self.servers.append(server)
+        return server
+
+    def recv_all(self, server, count, timeout=5):
+        datas = []
+
+        def on_data(s, buffer):
+            while buffer:
+                datas.append(buffer.next())
+            if len(datas) >= count:
+                self.loop.stop()
+
+        server.on_data(on_data)
+        self.loop.add_timeout(timeout, self.loop.stop)
+        self.loop.start()
+        return datas
+
+
+class UdpTestCase(BaseUdpTestCase):
+    @unittest.skipUnless(udp.MMSG, "recvmmsg/sendmmsg disabled")
+    def test_mmsg_buffer(self):
+        rsock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        rsock.bind(("127.0.0.1", 0))
+        rsock.setblocking(False)
+        wsock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        wsock.bind(("127.0.0.1", 0))
+        datas = [("%d" % i).encode("utf-8") * 3 for i in range(100)]
+
+        buffer = Buffer()
+        for data in datas:
+            buffer.write(data, rsock.getsockname())
+        buffer.socket_sendmmsg(wsock.fileno(), socket.AF_INET)
+        self.assertEqual(len(buffer), 0)
+
+        buffer = Buffer()
+        total = 0
+        while True:
+            r = buffer.socket_recvmmsg(rsock.fileno(), socket.AF_INET)
+            if not r:
+                break
+            total += r
+        self.assertEqual(total, sum(len(data) for data in datas))
+        result = []
+        while buffer:
+            result.append(buffer.next())
+        self.assertEqual(result, [(data, wsock.getsockname()) for data in datas])
+        rsock.close()
+        wsock.close()
+
+    def test_recv_batch(self):
+        server = self.bind()
+        clients = []
+        for _ in range(2):
+            client = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            client.bind(("127.0.0.1", 0))
+            clients.append(client)
+
+        def send():
+            address = server.socket.getsockname()
+            for i in range(200):
+                clients[i % 2].sendto(("%d:" % i).encode("utf-8") * (i % 7 + 1), address)
+        self.loop.add_async(send)
+        datas = self.recv_all(server, 200)
+        server.close()
+
+        self.assertEqual(len(datas), 200)
+        for i, (data, address) in enumerate(datas):
+            self.assertEqual(data, ("%d:" % i).encode("utf-8") * (i % 7 + 1))
+            self.assertEqual(address, clients[i % 2].getsockname())
+        for client in clients:
+            client.close()
+
+    def test_send_batch(self):
+        receivers = []
+        for _ in range(2):
+            receiver = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            receiver.bind(("127.0.0.1", 0))
+            receiver.setblocking(False)
+            receivers.append(receiver)
+        server = self.bind()
+
+        def send():
+            buffer = Buffer()
+            for i in range(150):
+                buffer.write(("%d" % i).encode("utf-8"), receivers[i % 2].getsockname())
+            server.write(buffer)
+            self.loop.add_timeout(0.05, self.loop.stop)
+        self.loop.add_async(send)
+        self.loop.add_timeout(5, self.loop.stop)
+        self.loop.start()
+
+        for index, receiver in enumerate(receivers):
+            datas = []
+            while True:
+                try:
+                    data, address = receiver.recvfrom(65536)
+                except socket.error:
+                    break
+                datas.append(data)
+                self.assertEqual(address, server.socket.getsockname())
+            self.assertEqual(datas, [("%d" % i).encode("utf-8") for i in range(index, 150, 2)])
+            receiver.close()
+        self.assertEqual(len(server.buffer[1]), 0)
+        server.close()
+
+    def test_echo(self):
+        server = self.bind()
+        server.on_data(lambda s, buffer: s.write(buffer))
+        client = self.bind()
+        datas = [("%d" % i).encode("utf-8") * 10 for i in range(100)]
+
+        def send():
+            buffer = Buffer()
+            for data in datas:
+                buffer.write(data, server.socket.getsockname())
+            client.write(buffer)
+        self.loop.add_async(send)
+        result = self.recv_all(client, len(datas))
+        self.assertEqual([data for data, _ in result], datas)
+        client.close()
+        server.close()
+
+
+def udp_offload_supported():
+    if not udp.UDP_OFFLOAD_SUPPORTED:
+        return False
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    try:
+        sock.setsockopt(udp.SOL_UDP, udp.UDP_SEGMENT, 1000)
+        sock.setsockopt(udp.SOL_UDP, udp.UDP_GRO, 1)
+        return True
+    except socket.error:
+        return False
+    finally:
+        sock.close()
+
+
+@unittest.skipUnless(udp_offload_supported(), "udp gso/gro is not supported")
+class UdpOffloadTestCase(BaseUdpTestCase):
+    def test_gso(self):
+        receiver = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        receiver.bind(("127.0.0.1", 0))
+        receiver.setblocking(False)
+        server = self.bind()
+        server.enable_gso()
+        self.assertTrue(server.is_enable_gso)
+        datas = [("%04d" % i).encode("utf-8") * 25 for i in range(100)] + [b"tail"]
+
+        def send():
+            buffer = Buffer()
+            for data in datas:
+                buffer.write(data, receiver.getsockname())
+            server.write(buffer)
+            self.loop.add_timeout(0.05, self.loop.stop)
+        self.loop.add_async(send)
+        self.loop.add_timeout(5, self.loop.stop)
+        self.loop.start()
+
+        result = []
+        while True:
+            try:
+                result.append(receiver.recv(65536))
+            except socket.error:
+                break
+        receiver.close()
+        self.assertEqual(result, datas)
+        self.assertTrue(server.is_enable_gso)
+
+    def test_gso_error(self):
+        server = self.bind()
+        server.enable_gso()
+        server._wbuffers.write(b"data", ("127.0.0.1", 9))
+        sock, fileno = server._socket, server._fileno
+        server._socket, server._fileno = None, -1
+        self.assertIs(server._write_gso(), False)
+        server._socket, server._fileno = sock, fileno
+
+    def test_gro(self):
+        server = self.bind()
+        server.enable_gro()
+        self.assertTrue(server.is_enable_gro)
+        client = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        datas = [("%04d" % i).encode("utf-8") * 25 for i in range(40)]
+
+        def send():
+            address = server.socket.getsockname()
+            # one gso send arrives as a single coalesced datagram on a gro socket
+            client.sendmsg([b"".join(datas)], [(udp.SOL_UDP, udp.UDP_SEGMENT, struct.pack("=H", 100))], 0, address)
+            client.sendto(b"tail", address)
+        self.loop.add_async(send)
+        result = self.recv_all(server, len(datas) + 1)
+        client.close()
+        self.assertEqual([data for data, _ in result], datas + [b"tail"])
+
+    def test_disable_gro(self):
+        server = self.bind()
+        server.enable_gro()
+        server.disable_gro()
+        self.assertFalse(server.is_enable_gro)
+        self.assertNotIn("_read", server.__dict__)
+        client = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+        def send():
+            client.sendto(b"ping", server.socket.getsockname())
+        self.loop.add_async(send)
+        result = self.recv_all(server, 1)
+        client.close()
+        self.assertEqual([data for data, _ in result], [b"ping"])
+
+
+if __name__ == '__main__':
+    unittest.main()
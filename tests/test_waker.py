@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+# 2026/10/17
+# create by: snower
+
+import os
+import time
+import select
+import threading
+import unittest
+import sevent
+from sevent import loop as _loop
+from sevent.waker import Waker, EventfdWaker, PipeWaker, SocketWaker
+from sevent.utils import monotonic
+
+
+def readable(waker):
+    return bool(select.select([waker.fileno()], [], [], 0)[0])
+
+
+class WakerTestCase(unittest.TestCase):
+    def check_waker(self, waker):
+        try:
+            self.assertFalse(readable(waker))
+            waker.wake()
+            waker.wake()
+            self.assertTrue(waker.pending)
+            self.assertTrue(readable(waker))
+            waker.consume()
+            self.assertFalse(waker.pending)
+            self.assertFalse(readable(waker))
+
+            waker.wake()
+            self.assertTrue(readable(waker))
+            waker.consume()
+            self.assertFalse(readable(waker))
+        finally:
+            waker.close()
+
+    @unittest.skipUnless(hasattr(os, "eventfd"), "eventfd is not supported")
+    def test_eventfd_waker(self):
+        self.assertIsInstance(Waker(), EventfdWaker)
+        self.check_waker(EventfdWaker())
+
+    @unittest.skipIf(os.name == "nt", "pipe waker is not used on windows")
+    def test_pipe_waker(self):
+        self.check_waker(PipeWaker())
+
+    def test_socket_waker(self):
+        self.check_waker(SocketWaker())
+
+
+class LoopWakeTestCase(unittest.TestCase):
+    def setUp(self):
+        _loop._thread_local._sevent_ioloop = None
+        _loop._ioloop = None
+        _loop._mul_ioloop = False
+        self.loop = sevent.instance()
+
+    def test_add_async_safe(self):
+        calls = []
+
+        def on_call(index):
+            calls.append((index, monotonic()))
+            if len(calls) == 100:
+                self.loop.stop()
+
+        def run():
+            time.sleep(0.05)
+            for i in range(100):
+                self.loop.add_async_safe(on_call, i)
+
+        thread = threading.Thread(target=run)
+        self.loop.add_async(thread.start)
+        self.loop.add_timeout(5, self.loop.stop)
+        start = monotonic()
+        self.loop.start()
+        thread.join()
+
+        self.assertEqual([index for index, _ in calls], list(range(100)))
+        self.assertLess(calls[-1][1] - start, 1)
+
+    def test_stop(self):
+        thread = threading.Thread(target=lambda: (time.sleep(0.05), self.loop.stop()))
+        self.loop.add_async(thread.start)
+        self.loop.add_timeout(5, self.loop.stop)
+        start = monotonic()
+        self.loop.start()
+        thread.join()
+        self.assertLess(monotonic() - start, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()